@@ -1,16 +1,16 @@
 from django.contrib import admin, messages
-import requests
 from django.urls import path
 from django.shortcuts import redirect
-from django.conf import settings
-from rest_framework.authtoken.models import Token
 
+from stocks.jobs import enqueue_job
 from stocks.models import Stock, DailyStockData, WeeklyRecommendation, WeeklyRecommendationStock, \
-    WeeklyRecommendationStockTestResult, WeeklyRecommendationStockPredictResult
+    WeeklyRecommendationStockTestResult, WeeklyRecommendationStockPredictResult, Job, MarketHoliday, \
+    WeeklyRecommendationSnapshot, DailyIndicator
 
 
 class StockAdmin(admin.ModelAdmin):
-    search_fields = ['itms_name']
+    # itms_name / srtn_code 는 trigram 인덱스, isin_code 는 unique 인덱스로 조회 (초성은 'ㅅㅅㅈㅈ' 처럼 입력)
+    search_fields = ['itms_name', 'srtn_code', '=isin_code', '^itms_name_chosung']
     change_list_template = "admin/stocks/stock/change_list.html"  # 커스텀 템플릿 사용
 
     def get_urls(self):
@@ -21,19 +21,9 @@ class StockAdmin(admin.ModelAdmin):
         return custom_urls + urls
 
     def fetch_all_stocks_info(self, request):
-        # url = f"{settings.AWS_LAMBDA_URL}/stocks/info/"
-        url = "http://127.0.0.1:8000/stocks/info/"
-        token, created = Token.objects.get_or_create(user=request.user)  # 토큰이 없으면 새로 생성
-        headers = {'Authorization': f'Token {token.key}'}
-
-        try:
-            response = requests.post(url, headers=headers)
-            if response.status_code == 200:
-                self.message_user(request, "주식 정보가 성공적으로 불러와졌습니다.", messages.SUCCESS)
-            else:
-                self.message_user(request, "주식 정보를 불러오는 중 문제가 발생했습니다.", messages.ERROR)
-        except requests.exceptions.RequestException as e:
-            self.message_user(request, f"요청 실패: {str(e)}", messages.ERROR)
+        # 서버 자신을 HTTP 로 호출하지 않고 작업 큐에 바로 등록
+        job = enqueue_job('fetch_all_stocks_info')
+        self.message_user(request, f"주식 정보 불러오기 작업이 등록되었습니다. (작업 #{job.id})", messages.SUCCESS)
         return redirect("..")
 
 
@@ -49,19 +39,9 @@ class DailyStockDataAdmin(admin.ModelAdmin):
         return custom_urls + urls
 
     def fetch_all_stocks_daily_info(self, request):
-        # url = f"{settings.AWS_LAMBDA_URL}/stocks/info/"
-        url = "http://127.0.0.1:8000/stocks/weekly/daily-data/"
-        token, created = Token.objects.get_or_create(user=request.user)  # 토큰이 없으면 새로 생성
-        headers = {'Authorization': f'Token {token.key}'}
-
-        try:
-            response = requests.post(url, headers=headers)
-            if response.status_code == 200:
-                self.message_user(request, "주식 일자별 정보가 성공적으로 불러와졌습니다.", messages.SUCCESS)
-            else:
-                self.message_user(request, "주식 일자별 정보를 불러오는 중 문제가 발생했습니다.", messages.ERROR)
-        except requests.exceptions.RequestException as e:
-            self.message_user(request, f"요청 실패: {str(e)}", messages.ERROR)
+        # 서버 자신을 HTTP 로 호출하지 않고 작업 큐에 바로 등록
+        job = enqueue_job('fetch_weekly_stock_daily_data')
+        self.message_user(request, f"주식 일자별 정보 불러오기 작업이 등록되었습니다. (작업 #{job.id})", messages.SUCCESS)
         return redirect("..")
 
 
@@ -69,9 +49,25 @@ class WeeklyRecommendationStockAdmin(admin.ModelAdmin):
     autocomplete_fields = ['stock']  # Stock 필드를 검색 가능하게 설정
 
 
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'status', 'progress', 'progress_total', 'message', 'created_at', 'finished_at']
+    list_filter = ['kind', 'status']
+    readonly_fields = ['created_at', 'started_at', 'finished_at']
+
+
+class WeeklyRecommendationSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['weekly_recommendation', 'stock_count', 'data_version', 'built_at']
+    exclude = ['payload', 'columnar_payload']
+    readonly_fields = ['weekly_recommendation', 'start_date', 'stock_count', 'etag', 'data_version', 'built_at']
+
+
 admin.site.register(Stock, StockAdmin)
 admin.site.register(DailyStockData, DailyStockDataAdmin)
 admin.site.register(WeeklyRecommendation)
 admin.site.register(WeeklyRecommendationStock, WeeklyRecommendationStockAdmin)
 admin.site.register(WeeklyRecommendationStockTestResult)
-admin.site.register(WeeklyRecommendationStockPredictResult)
\ No newline at end of file
+admin.site.register(WeeklyRecommendationStockPredictResult)
+admin.site.register(Job, JobAdmin)
+admin.site.register(MarketHoliday)
+admin.site.register(WeeklyRecommendationSnapshot, WeeklyRecommendationSnapshotAdmin)
+admin.site.register(DailyIndicator)
@@ -0,0 +1,201 @@
+"""
+공개 조회 API 와 AI 작업 등록 API 의 async (ASGI) 버전
+DRF 의 APIView 는 async 핸들러를 지원하지 않으므로 Django async class-based view 로 구현하고,
+DB 조회는 Django async ORM (aget / afirst) 을 사용한다.
+ASGI 서버 (uvicorn 등) 로 배포하면 요청이 스레드를 점유하지 않고 하나의 event loop 에서 처리된다.
+응답 본문 / 상태 코드와 조건부 요청 처리 (ETag / Last-Modified / 304, 응답 캐시) 는 sync view 와 같다.
+"""
+import gzip
+import logging
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse
+from django.urls import reverse
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date, quote_etag
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.utils.encoders import JSONEncoder
+
+from stocks.cache import cache_response, get_data_version, is_not_modified, lookup_cached_response
+from stocks.jobs import enqueue_job
+from stocks.models import Stock, WeeklyRecommendation, \
+    WeeklyRecommendationStockTestResult, WeeklyRecommendationStockPredictResult
+from stocks.renderers import ORJSONRenderer, ColumnarJSONRenderer
+from stocks.snapshots import SNAPSHOT_PAYLOAD_FIELDS, is_snapshot_stale, \
+    latest_weekly_recommendation_snapshot_queryset, rebuild_weekly_recommendation_snapshot
+from stocks.views import ACCEPTS_GZIP_RE
+
+logger = logging.getLogger(__name__)
+
+
+def json_response(data, status=200):
+    # Decimal / date 인코딩을 sync view (DRF JSONRenderer) 와 맞춤
+    return JsonResponse(data, status=status, encoder=JSONEncoder, json_dumps_params={'ensure_ascii': False})
+
+
+class AsyncJobEnqueueView(View):
+    """
+    JobEnqueueMixin 의 async 버전 (POST 시 작업 등록 후 202)
+    """
+    job_kind = None
+    message = None
+
+    @method_decorator(csrf_exempt)
+    def dispatch(self, request, *args, **kwargs):
+        return super().dispatch(request, *args, **kwargs)
+
+    async def post(self, request):
+        job = await sync_to_async(enqueue_job)(self.job_kind, idempotency_key=request.headers.get('Idempotency-Key'))
+        return json_response({
+            "message": self.message,
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": reverse('job_status', args=[job.id]),
+        }, status=202)
+
+
+class AsyncStockAITestView(AsyncJobEnqueueView):
+    job_kind = 'stock_ai_test'
+    message = "주식 테스트 작업이 등록되었습니다."
+
+
+class AsyncStockAIPredictView(AsyncJobEnqueueView):
+    job_kind = 'stock_ai_predict'
+    message = "주식 예측 작업이 등록되었습니다."
+
+
+class AsyncLatestWeeklyStocksDataView(View):
+    """
+    LatestWeeklyStocksDataView 의 async 버전 (스냅샷 한 건을 afirst 로 읽어 gzip 본문을 그대로 응답)
+    포맷은 ?format=columnar 또는 Accept 헤더로 선택한다. (Browsable API 는 제공하지 않음)
+    """
+
+    async def get(self, request):
+        columnar = request.GET.get('format') == ColumnarJSONRenderer.format \
+            or ColumnarJSONRenderer.media_type in request.headers.get('Accept', '')
+        media_type = ColumnarJSONRenderer.media_type if columnar else ORJSONRenderer.media_type
+        include_indicators = 'indicators' in request.GET.get('include', '').split(',')
+        payload_field = SNAPSHOT_PAYLOAD_FIELDS[(columnar, include_indicators)]
+
+        try:
+            snapshot = await self.get_snapshot(payload_field)
+        except Exception as e:
+            logger.error(f"Error retrieving weekly stocks: {str(e)}")
+            return json_response({"error": str(e)}, status=500)
+
+        if not snapshot.stock_count:
+            return json_response({"message": "No content"}, status=204)
+
+        etag = quote_etag('-'.join([snapshot.etag, payload_field]))
+        last_modified = int(snapshot.built_at.timestamp())
+        content = bytes(getattr(snapshot, payload_field))
+
+        if is_not_modified(request, etag, last_modified):
+            response = HttpResponseNotModified()
+        elif ACCEPTS_GZIP_RE.search(request.headers.get('Accept-Encoding', '')):
+            response = HttpResponse(content, content_type=media_type)
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(gzip.decompress(content), content_type=media_type)
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ['Accept', 'Accept-Encoding'])
+        return response
+
+    async def get_snapshot(self, payload_field):
+        """
+        get_latest_weekly_recommendation_snapshot 과 같은 규칙 (재생성은 드물기 때문에 sync 함수를 스레드에서 실행)
+        """
+        version, _ = await sync_to_async(get_data_version)()
+        snapshot = await latest_weekly_recommendation_snapshot_queryset(payload_field).afirst()
+        if is_snapshot_stale(snapshot, version, payload_field):
+            snapshot = await sync_to_async(rebuild_weekly_recommendation_snapshot)()
+        return snapshot
+
+
+class AsyncCachedResultView(View):
+    """
+    CachedResponseMixin 의 async 버전 (캐시 조회 / 저장은 스레드에서 실행)
+    get_result() 의 200 응답을 캐시하고 ETag / Last-Modified 조건부 요청에 304 를 반환한다.
+    """
+    cache_scope = None
+
+    async def get(self, request, isin_code):
+        cache_key, last_modified, cached_response = await sync_to_async(lookup_cached_response)(
+            request, self.cache_scope, 'json')
+        if cached_response is not None:
+            return cached_response
+
+        response = await self.get_result(isin_code)
+        if response.status_code != 200:
+            return response
+        return await sync_to_async(cache_response)(request, response, cache_key, last_modified)
+
+    async def get_result(self, isin_code):
+        raise NotImplementedError
+
+
+class AsyncStockAITestResultView(AsyncCachedResultView):
+    """
+    StockAITestResultView 의 async 버전
+    """
+    cache_scope = 'async_latest_weekly_stocks_test_data'
+
+    async def get_result(self, isin_code):
+        try:
+            stock = await Stock.objects.aget(isin_code=isin_code)
+        except Stock.DoesNotExist:
+            return json_response({'error': 'No stock found for the given isin code.'}, status=404)
+
+        latest_weekly_recommendation = await WeeklyRecommendation.objects.filter(
+            weeklyrecommendationstock__stock=stock
+        ).order_by('-start_date').afirst()
+        if latest_weekly_recommendation is None:
+            return json_response({'error': 'No weekly recommendation found for the given stock.'}, status=404)
+
+        latest_test_result = await WeeklyRecommendationStockTestResult.objects.filter(
+            stock=stock,
+            weekly_recommendation=latest_weekly_recommendation
+        ).order_by('-id').afirst()
+        if latest_test_result is None:
+            return json_response({'error': 'No test result found for the given stock.'}, status=404)
+
+        return json_response({
+            'stock': stock.isin_code,
+            'weekly_recommendation': f"{latest_weekly_recommendation.start_date} - {latest_weekly_recommendation.end_date}",
+            'average_profit': latest_test_result.profit,
+            'profit_std': latest_test_result.profit_std,
+            'test_runs': latest_test_result.test_runs,
+            'max_drawdown': latest_test_result.max_drawdown,
+            'backend': latest_test_result.backend,
+            'test_start_date': latest_test_result.test_start_date,
+            'test_end_date': latest_test_result.test_end_date,
+            'test_starting_cash': latest_test_result.test_starting_cash,
+        })
+
+
+class AsyncStockAIPredictResultView(AsyncCachedResultView):
+    """
+    StockAIPredictResultView 의 async 버전
+    """
+    cache_scope = 'async_latest_weekly_stocks_predict_data'
+
+    async def get_result(self, isin_code):
+        try:
+            stock = await Stock.objects.aget(isin_code=isin_code)
+        except Stock.DoesNotExist:
+            return json_response({'error': 'No stock found for the given isin code.'}, status=404)
+
+        latest_predict_result = await WeeklyRecommendationStockPredictResult.objects.filter(
+            stock=stock
+        ).order_by('-target_date').afirst()
+        if latest_predict_result is None:
+            return json_response({'error': 'No prediction result found for the given stock.'}, status=404)
+
+        return json_response({
+            'action': latest_predict_result.action,
+            'target_date': latest_predict_result.target_date,
+        })
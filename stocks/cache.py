@@ -0,0 +1,155 @@
+"""
+공개 조회 API 응답 캐시
+캐시 키는 최신 WeeklyRecommendation id 와 데이터 버전으로 구성되며,
+DailyStockData / 테스트 결과 / 예측 결과가 저장될 때 bump_data_version() 으로 버전을 올려 무효화한다.
+캐시 백엔드는 settings.CACHES 를 따른다 (기본 local memory, REDIS_URL 설정 시 Redis).
+local memory 캐시는 프로세스별이라 데이터 버전 / 변경 시각이 작업 worker 와 공유되지 않으므로 Last-Modified 는 공유 캐시일 때만 보낸다.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework.response import Response
+
+from stocks.models import WeeklyRecommendation
+
+DATA_VERSION_KEY = 'stocks:data_version'
+DATA_UPDATED_AT_KEY = 'stocks:data_updated_at'
+RESPONSE_KEY_PREFIX = 'stocks:response'
+
+DEFAULT_RESPONSE_CACHE_TIMEOUT = 60 * 5
+
+
+def get_cache():
+    return caches[getattr(settings, 'STOCKS_CACHE_ALIAS', 'default')]
+
+
+def is_shared_cache():
+    """
+    데이터 버전이 모든 프로세스에 공유되는 캐시인지 여부 (STOCKS_CACHE_SHARED 로 지정하지 않으면 백엔드로 판단)
+    local memory 캐시는 프로세스마다 버전을 따로 세므로 작업 worker 에서 올린 버전이 웹 프로세스에 전달되지 않는다.
+    """
+    shared = getattr(settings, 'STOCKS_CACHE_SHARED', None)
+    if shared is None:
+        shared = not isinstance(get_cache(), (LocMemCache, DummyCache))
+    return shared
+
+
+def get_data_version():
+    """
+    (데이터 버전, 마지막 변경 시각 timestamp) 반환
+    """
+    cache = get_cache()
+    values = cache.get_many([DATA_VERSION_KEY, DATA_UPDATED_AT_KEY])
+    version = values.get(DATA_VERSION_KEY)
+    updated_at = values.get(DATA_UPDATED_AT_KEY)
+    if version is None or updated_at is None:
+        updated_at = int(time.time())
+        cache.add(DATA_VERSION_KEY, 1, timeout=None)
+        cache.add(DATA_UPDATED_AT_KEY, updated_at, timeout=None)
+        version = cache.get(DATA_VERSION_KEY, 1)
+    return version, updated_at
+
+
+def bump_data_version():
+    """
+    조회 API 에 노출되는 데이터가 바뀌었을 때 호출해 기존 응답 캐시를 무효화
+    """
+    cache = get_cache()
+    try:
+        cache.incr(DATA_VERSION_KEY)
+    except ValueError:
+        # 버전 키가 없으면 새로 만든다
+        cache.add(DATA_VERSION_KEY, 1, timeout=None)
+        cache.incr(DATA_VERSION_KEY)
+    cache.set(DATA_UPDATED_AT_KEY, int(time.time()), timeout=None)
+
+
+class CachedResponseMixin:
+    """
+    GET 응답을 렌더링된 bytes 로 캐시하고 ETag / Last-Modified 조건부 요청에 304 를 반환하는 mixin
+    get() 첫 줄에서 get_cached_response() 를 호출하고, 결과가 있으면 그대로 반환한다.
+    (async view 는 lookup_cached_response / cache_response 를 직접 사용한다)
+    """
+    cache_scope = None
+
+    def get_cached_response(self, request):
+        request.response_cache_key, request.response_last_modified, response = lookup_cached_response(
+            request, self.cache_scope or self.__class__.__name__, request.accepted_renderer.format)
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        cache_key = getattr(request, 'response_cache_key', None)
+        if cache_key is None or not isinstance(response, Response) or response.status_code != 200:
+            return response
+
+        response.render()
+        return cache_response(request, response, cache_key, request.response_last_modified)
+
+
+def lookup_cached_response(request, scope, renderer_format):
+    """
+    (캐시 키, Last-Modified timestamp, 캐시된 응답 또는 None) 반환
+    캐시 키는 최신 주차 id 와 데이터 버전을 포함하며, 캐시된 응답이 조건부 요청과 일치하면 304 를 반환한다.
+    """
+    latest_weekly_recommendation_id = WeeklyRecommendation.objects.order_by('-start_date').values_list(
+        'id', flat=True).first()
+    version, updated_at = get_data_version()
+
+    path_hash = hashlib.md5(f"{renderer_format}:{request.get_full_path()}".encode()).hexdigest()
+    cache_key = ':'.join([RESPONSE_KEY_PREFIX, scope, str(latest_weekly_recommendation_id), str(version), path_hash])
+    # 변경 시각은 공유 캐시일 때만 믿을 수 있다 (local memory 캐시는 다른 프로세스에서 저장한 데이터를 모름)
+    # 그 외에는 Last-Modified 를 보내지 않고 ETag 로만 조건부 요청을 처리한다
+    last_modified = updated_at if is_shared_cache() else None
+
+    cached = get_cache().get(cache_key)
+    if cached is None:
+        return cache_key, last_modified, None
+
+    content, content_type, etag = cached
+    if is_not_modified(request, etag, last_modified):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(content, content_type=content_type)
+    return cache_key, last_modified, set_validators(response, etag, last_modified)
+
+
+def cache_response(request, response, cache_key, last_modified):
+    """
+    렌더링된 200 응답을 캐시하고 ETag / Last-Modified 를 붙여 반환 (조건부 요청과 일치하면 304)
+    """
+    etag = quote_etag(hashlib.md5(response.content).hexdigest())
+    timeout = getattr(settings, 'STOCKS_RESPONSE_CACHE_TIMEOUT', DEFAULT_RESPONSE_CACHE_TIMEOUT)
+    get_cache().set(cache_key, (response.content, response['Content-Type'], etag), timeout=timeout)
+
+    set_validators(response, etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return set_validators(HttpResponseNotModified(), etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def is_not_modified(request, etag, last_modified):
+    """
+    If-None-Match / If-Modified-Since 조건부 요청에 304 로 응답할 수 있는지 여부 (last_modified 가 None 이면 ETag 만 비교)
+    """
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+
+    if last_modified is None:
+        return False
+    if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return if_modified_since is not None and last_modified <= if_modified_since
@@ -0,0 +1,250 @@
+"""
+외부 API 호출용 공용 HTTP 클라이언트
+호스트별 커넥션 풀(keep-alive), connect/read timeout, 429/5xx 재시도(지수 백오프 + jitter)와
+호스트별 지연 시간/재시도 통계를 제공한다.
+AsyncHttpClient 는 같은 동작을 httpx.AsyncClient 로 제공한다. (httpx 가 설치된 경우)
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+from stocks.metrics import observe_outbound_request
+
+try:
+    import httpx
+except ImportError:  # httpx 가 없으면 AsyncHttpClient 를 사용할 수 없음
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+# (connect timeout, read timeout) 초
+DEFAULT_TIMEOUT = (3.05, 30)
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_BACKOFF_MAX = 10
+DEFAULT_POOL_MAXSIZE = 16
+
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+RETRY_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+
+class BaseHttpClient:
+    """
+    재시도 대기 시간 계산과 호스트별 통계 (동기 / 비동기 클라이언트 공통)
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES, backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                 backoff_max=DEFAULT_BACKOFF_MAX):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    def get_stats(self):
+        """
+        호스트별 요청 수, 재시도 수, 오류 수, 지연 시간(초) 통계
+        """
+        with self._stats_lock:
+            return {
+                host: {**stats, 'latency_avg': stats['latency_total'] / stats['requests'] if stats['requests'] else 0.0}
+                for host, stats in self._stats.items()
+            }
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._stats.clear()
+
+    def _retry_delay(self, host, attempt, retry_after=None):
+        with self._stats_lock:
+            self._host_stats(host)['retries'] += 1
+
+        # full jitter: 0 ~ min(backoff_max, backoff_factor * 2^attempt)
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_factor * (2 ** attempt)))
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(self.backoff_max, int(retry_after)))
+        return delay
+
+    def _record(self, host, elapsed, error=False):
+        observe_outbound_request(host, elapsed, error)
+        with self._stats_lock:
+            stats = self._host_stats(host)
+            stats['requests'] += 1
+            stats['errors'] += int(error)
+            stats['latency_total'] += elapsed
+            stats['latency_max'] = max(stats['latency_max'], elapsed)
+
+    def _host_stats(self, host):
+        if host not in self._stats:
+            self._stats[host] = {'requests': 0, 'retries': 0, 'errors': 0, 'latency_total': 0.0, 'latency_max': 0.0}
+        return self._stats[host]
+
+
+class HttpClient(BaseHttpClient):
+    """
+    requests.Session 기반 클라이언트
+    Session 이 호스트별로 커넥션 풀을 유지하므로 같은 upstream 으로의 요청은 TCP/TLS 연결을 재사용한다.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES, backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                 backoff_max=DEFAULT_BACKOFF_MAX, pool_maxsize=DEFAULT_POOL_MAXSIZE):
+        super().__init__(timeout, max_retries, backoff_factor, backoff_max)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def request(self, method, url, retry=None, **kwargs):
+        """
+        요청을 보내고 응답을 반환
+        429/5xx 응답이나 연결 오류는 max_retries 만큼 재시도하며, 마지막 응답은 상태 코드와 관계없이 그대로 반환한다.
+        retry 를 지정하지 않으면 멱등 메서드(GET/HEAD/OPTIONS)만 재시도한다.
+        """
+        method = method.upper()
+        kwargs.setdefault('timeout', self.timeout)
+        if retry is None:
+            retry = method in RETRY_METHODS
+        max_retries = self.max_retries if retry else 0
+        host = urlparse(url).netloc
+
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self._record(host, time.perf_counter() - started, error=True)
+                if attempt >= max_retries:
+                    raise
+                logger.warning(f"{method} {host} 요청 실패, 재시도합니다 ({attempt + 1}/{max_retries}): {str(e)}")
+                self._sleep_before_retry(host, attempt)
+                attempt += 1
+                continue
+
+            self._record(host, time.perf_counter() - started, error=response.status_code >= 500)
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= max_retries:
+                return response
+
+            logger.warning(f"{method} {host} 응답 코드 {response.status_code}, 재시도합니다 ({attempt + 1}/{max_retries})")
+            self._sleep_before_retry(host, attempt, response.headers.get('Retry-After'))
+            response.close()
+            attempt += 1
+
+    def _sleep_before_retry(self, host, attempt, retry_after=None):
+        time.sleep(self._retry_delay(host, attempt, retry_after))
+
+
+class AsyncHttpClient(BaseHttpClient):
+    """
+    httpx.AsyncClient 기반 클라이언트 (HttpClient 와 같은 timeout / 재시도 / 통계)
+    event loop 에 묶이므로 async with 블록 안에서 생성해 사용한다.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES, backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                 backoff_max=DEFAULT_BACKOFF_MAX, pool_maxsize=DEFAULT_POOL_MAXSIZE):
+        if httpx is None:
+            raise ImportError("AsyncHttpClient 에는 httpx 가 필요합니다.")
+        super().__init__(timeout, max_retries, backoff_factor, backoff_max)
+        connect_timeout, read_timeout = timeout
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    async def request(self, method, url, retry=None, **kwargs):
+        """
+        HttpClient.request 와 같은 재시도 규칙 (대기는 asyncio.sleep 으로 event loop 를 막지 않음)
+        """
+        method = method.upper()
+        if retry is None:
+            retry = method in RETRY_METHODS
+        max_retries = self.max_retries if retry else 0
+        host = urlparse(url).netloc
+
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except (httpx.ConnectError, httpx.TimeoutException, httpx.RemoteProtocolError) as e:
+                self._record(host, time.perf_counter() - started, error=True)
+                if attempt >= max_retries:
+                    raise
+                logger.warning(f"{method} {host} 요청 실패, 재시도합니다 ({attempt + 1}/{max_retries}): {str(e)}")
+                await asyncio.sleep(self._retry_delay(host, attempt))
+                attempt += 1
+                continue
+
+            self._record(host, time.perf_counter() - started, error=response.status_code >= 500)
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= max_retries:
+                return response
+
+            logger.warning(f"{method} {host} 응답 코드 {response.status_code}, 재시도합니다 ({attempt + 1}/{max_retries})")
+            await asyncio.sleep(self._retry_delay(host, attempt, response.headers.get('Retry-After')))
+            attempt += 1
+
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """
+    프로세스 단위로 공유하는 HttpClient (settings 의 HTTP_CLIENT_* 값으로 생성)
+    """
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = HttpClient(
+                    timeout=tuple(getattr(settings, 'HTTP_CLIENT_TIMEOUT', DEFAULT_TIMEOUT)),
+                    max_retries=getattr(settings, 'HTTP_CLIENT_MAX_RETRIES', DEFAULT_MAX_RETRIES),
+                    backoff_factor=getattr(settings, 'HTTP_CLIENT_BACKOFF_FACTOR', DEFAULT_BACKOFF_FACTOR),
+                    backoff_max=getattr(settings, 'HTTP_CLIENT_BACKOFF_MAX', DEFAULT_BACKOFF_MAX),
+                    pool_maxsize=getattr(settings, 'HTTP_CLIENT_POOL_MAXSIZE', DEFAULT_POOL_MAXSIZE),
+                )
+    return _http_client
+
+
+def get_async_http_client():
+    """
+    settings 의 HTTP_CLIENT_* 값으로 AsyncHttpClient 생성 (호출한 event loop 안에서 사용 후 닫아야 한다)
+    """
+    return AsyncHttpClient(
+        timeout=tuple(getattr(settings, 'HTTP_CLIENT_TIMEOUT', DEFAULT_TIMEOUT)),
+        max_retries=getattr(settings, 'HTTP_CLIENT_MAX_RETRIES', DEFAULT_MAX_RETRIES),
+        backoff_factor=getattr(settings, 'HTTP_CLIENT_BACKOFF_FACTOR', DEFAULT_BACKOFF_FACTOR),
+        backoff_max=getattr(settings, 'HTTP_CLIENT_BACKOFF_MAX', DEFAULT_BACKOFF_MAX),
+        pool_maxsize=getattr(settings, 'HTTP_CLIENT_POOL_MAXSIZE', DEFAULT_POOL_MAXSIZE),
+    )
@@ -60,3 +60,9 @@ class WeeklyRecommendationStockDeleteException(APIException):
     status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
     default_detail = "주간 추천 주식 삭제 중 오류가 발생했습니다."
     default_code = "weekly_recommendation_stock_delete_failure"
+
+
+class TimeSeriesStoreDisabledException(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "시계열 저장소가 설정되지 않았습니다."
+    default_code = "timeseries_store_disabled"
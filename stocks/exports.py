@@ -0,0 +1,180 @@
+"""
+DailyStockData 대량 내보내기 (NDJSON / CSV / Parquet 스트리밍)
+.iterator(chunk_size) 로 서버 사이드 커서에서 chunk 단위로 읽어 바로 인코딩하므로
+내보내는 row 수와 관계없이 메모리 사용량이 일정하다.
+서버 사이드 커서를 끈 경우 (pgbouncer 모드) 에는 (종목, 기준일자) keyset 페이지 단위로 읽는다.
+"""
+import csv
+import io
+import json
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+
+from stocks.models import DailyStockData, Stock
+from stocks.serializers import DAILY_STOCK_DATA_FIELDS, DAILY_STOCK_DATA_DECIMAL_FIELDS
+
+try:
+    import orjson
+except ImportError:  # orjson 이 없으면 표준 json 모듈 사용
+    orjson = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pyarrow 가 없으면 Parquet 내보내기를 제공하지 않음
+    pyarrow = None
+
+EXPORT_CHUNK_SIZE = 5000
+EXPORT_FIELDS = ('isin_code',) + DAILY_STOCK_DATA_FIELDS
+
+
+def iter_daily_stock_data_chunks(start_date, end_date, stock_ids_by_isin_code=None, chunk_size=None):
+    """
+    (isin_code, *DAILY_STOCK_DATA_FIELDS) 튜플 목록을 chunk 단위로 반환하는 generator
+    stock_ids_by_isin_code 를 주지 않으면 전체 종목을 내보낸다. (종목, 기준일자) 순서로 정렬된다.
+    """
+    chunk_size = chunk_size or getattr(settings, 'EXPORT_CHUNK_SIZE', EXPORT_CHUNK_SIZE)
+    queryset = DailyStockData.objects.filter(bas_dt__range=[start_date, end_date])
+    if stock_ids_by_isin_code is None:
+        stock_ids_by_isin_code = dict(Stock.objects.values_list('isin_code', 'id'))
+    else:
+        queryset = queryset.filter(stock_id__in=stock_ids_by_isin_code.values())
+    # row 마다 stock 을 join 하지 않고 종목 코드는 미리 읽어 둔 dict 로 채운다
+    isin_codes_by_stock_id = {stock_id: isin_code for isin_code, stock_id in stock_ids_by_isin_code.items()}
+
+    queryset = queryset.order_by('stock_id', 'bas_dt').values_list('stock_id', *DAILY_STOCK_DATA_FIELDS)
+    if connections[queryset.db].settings_dict.get('DISABLE_SERVER_SIDE_CURSORS'):
+        rows = _iter_keyset_pages(queryset, chunk_size)
+    else:
+        rows = queryset.iterator(chunk_size=chunk_size)
+    chunk = []
+    for row in rows:
+        chunk.append((isin_codes_by_stock_id.get(row[0]),) + row[1:])
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _iter_keyset_pages(queryset, page_size):
+    """
+    서버 사이드 커서 없이 (stock_id, bas_dt) 순서로 page_size 건씩 읽음 (각 페이지는 별도 쿼리라 트랜잭션을 유지하지 않는다)
+    """
+    bas_dt_index = DAILY_STOCK_DATA_FIELDS.index('bas_dt') + 1
+    page = list(queryset[:page_size])
+    while page:
+        yield from page
+        if len(page) < page_size:
+            break
+        stock_id, bas_dt = page[-1][0], page[-1][bas_dt_index]
+        page = list(queryset.filter(Q(stock_id__gt=stock_id) | Q(stock_id=stock_id, bas_dt__gt=bas_dt))[:page_size])
+
+
+def _text_converters():
+    # API 응답과 같은 표현 (날짜는 ISO 문자열, Decimal 은 소수점 2자리 문자열)
+    converters = []
+    for field in EXPORT_FIELDS:
+        if field == 'bas_dt':
+            converters.append(lambda value: value.isoformat())
+        elif field in DAILY_STOCK_DATA_DECIMAL_FIELDS:
+            converters.append(lambda value: None if value is None else format(value, '.2f'))
+        else:
+            converters.append(None)
+    return converters
+
+
+_TEXT_CONVERTERS = _text_converters()
+
+
+def _to_text_row(row):
+    return [value if convert is None else convert(value) for convert, value in zip(_TEXT_CONVERTERS, row)]
+
+
+def stream_ndjson(chunks):
+    """
+    한 줄에 row 하나씩 JSON 객체로 인코딩
+    """
+    for chunk in chunks:
+        records = [dict(zip(EXPORT_FIELDS, _to_text_row(row))) for row in chunk]
+        if orjson is not None:
+            yield b''.join(orjson.dumps(record) + b'\n' for record in records)
+        else:
+            yield ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records).encode()
+
+
+def stream_csv(chunks):
+    """
+    첫 줄은 헤더
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for chunk in chunks:
+        writer.writerows(_to_text_row(row) for row in chunk)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    ParquetWriter 가 쓴 bytes 를 모아 두었다가 chunk 마다 꺼내는 쓰기 전용 파일 객체
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        content = b''.join(self.parts)
+        self.parts = []
+        return content
+
+
+def parquet_schema():
+    # Decimal 컬럼은 분석/백테스트에서 바로 쓸 수 있도록 float64 로 내보낸다
+    return pyarrow.schema(
+        [('isin_code', pyarrow.string()), ('id', pyarrow.int64()), ('bas_dt', pyarrow.date32())]
+        + [
+            (field, pyarrow.float64() if field in DAILY_STOCK_DATA_DECIMAL_FIELDS else pyarrow.int64())
+            for field in DAILY_STOCK_DATA_FIELDS[2:]
+        ]
+    )
+
+
+def stream_parquet(chunks):
+    """
+    chunk 하나를 row group 하나로 써서 바로 내보냄 (footer 는 마지막에 쓴다)
+    """
+    if pyarrow is None:
+        raise RuntimeError("Parquet 내보내기에는 pyarrow 가 필요합니다.")
+
+    schema = parquet_schema()
+    sink = _ChunkSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema)
+    try:
+        for chunk in chunks:
+            columns = [list(column) for column in zip(*chunk)]
+            for index, field in enumerate(EXPORT_FIELDS):
+                if field in DAILY_STOCK_DATA_DECIMAL_FIELDS:
+                    columns[index] = [None if value is None else float(value) for value in columns[index]]
+            writer.write_table(pyarrow.Table.from_arrays(columns, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
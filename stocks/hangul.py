@@ -0,0 +1,61 @@
+"""
+한글 음절 분해 (종목 명 초성 / 자모 검색용)
+완성형 음절은 (초성, 중성, 종성) 호환 자모로 분해하고, 겹모음 / 겹받침은 입력 순서대로 다시 나눈다. (과 -> ㄱㅗㅏ, 값 -> ㄱㅏㅂㅅ)
+그래서 입력 중인 글자(고 -> 과, 갑 -> 값)의 자모가 완성된 글자 자모의 접두어가 된다.
+"""
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNGSUNG = ['ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅗㅏ', 'ㅗㅐ', 'ㅗㅣ', 'ㅛ', 'ㅜ', 'ㅜㅓ', 'ㅜㅔ', 'ㅜㅣ',
+            'ㅠ', 'ㅡ', 'ㅡㅣ', 'ㅣ']
+JONGSUNG = ['', 'ㄱ', 'ㄲ', 'ㄱㅅ', 'ㄴ', 'ㄴㅈ', 'ㄴㅎ', 'ㄷ', 'ㄹ', 'ㄹㄱ', 'ㄹㅁ', 'ㄹㅂ', 'ㄹㅅ', 'ㄹㅌ', 'ㄹㅍ', 'ㄹㅎ',
+            'ㅁ', 'ㅂ', 'ㅂㅅ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+
+# 첫가끝 (조합형) 초성 U+1100 ~ U+1112 -> 호환 자모 (NFD 로 입력된 검색어 대응)
+CONJOINING_CHOSUNG = {chr(0x1100 + index): consonant for index, consonant in enumerate(CHOSUNG)}
+
+HANGUL_CONSONANTS = set(CHOSUNG) | {'ㄳ', 'ㄵ', 'ㄶ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ', 'ㅄ'}
+
+
+def is_syllable(char):
+    return HANGUL_BASE <= ord(char) <= HANGUL_LAST
+
+
+def is_jamo(char):
+    return 0x3131 <= ord(char) <= 0x318E
+
+
+def decompose_char(char):
+    """
+    음절 하나를 호환 자모 문자열로 분해 (음절이 아니면 그대로)
+    """
+    char = CONJOINING_CHOSUNG.get(char, char)
+    if not is_syllable(char):
+        return char
+    offset = ord(char) - HANGUL_BASE
+    return CHOSUNG[offset // 588] + JUNGSUNG[offset % 588 // 28] + JONGSUNG[offset % 28]
+
+
+def chosung_char(char):
+    """
+    음절은 초성, 자음 자모는 그대로, 그 외 문자도 그대로
+    """
+    char = CONJOINING_CHOSUNG.get(char, char)
+    if is_syllable(char):
+        return CHOSUNG[(ord(char) - HANGUL_BASE) // 588]
+    return char
+
+
+def decompose(text):
+    """
+    '삼성전자' -> 'ㅅㅏㅁㅅㅓㅇㅈㅓㄴㅈㅏ'
+    """
+    return ''.join(decompose_char(char) for char in text)
+
+
+def chosung(text):
+    """
+    '삼성전자' -> 'ㅅㅅㅈㅈ' (글자 수가 그대로 유지된다)
+    """
+    return ''.join(chosung_char(char) for char in text)
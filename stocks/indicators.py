@@ -0,0 +1,175 @@
+"""
+종목 일별 기술적 지표 (DailyIndicator) 배치 계산
+종목별 종가 배열에 NumPy rolling window 연산으로 이동평균 / RSI / 변동성을 계산한다.
+모든 지표는 고정 길이 window 만 참조하므로, 새 row 가 추가되면 마지막 계산일 이전 INDICATOR_LOOKBACK 거래일 row 와
+새 row 만 읽어 새 row 의 지표만 저장한다. (과거 구간이 바뀐 종목은 전체를 다시 계산)
+"""
+import logging
+from decimal import Decimal
+
+import numpy as np
+from django.db.models import Count, Max
+from numpy.lib.stride_tricks import sliding_window_view
+
+from stocks.cache import bump_data_version
+from stocks.models import DailyStockData, DailyIndicator
+from stocks.trading_calendar import get_trading_calendar
+
+logger = logging.getLogger(__name__)
+
+MOVING_AVERAGE_WINDOWS = (5, 20, 60)
+RSI_WINDOW = 14
+VOLATILITY_WINDOW = 20
+TRADING_DAYS_PER_YEAR = 252
+
+INDICATOR_FIELDS = ('ma5', 'ma20', 'ma60', 'rsi14', 'volatility20')
+# 새 row 의 지표 계산에 필요한 이전 row 수 (가장 긴 window)
+INDICATOR_LOOKBACK = max(MOVING_AVERAGE_WINDOWS + (RSI_WINDOW + 1, VOLATILITY_WINDOW + 1))
+
+INDICATOR_BATCH_SIZE = 2000
+INDICATOR_STOCK_CHUNK_SIZE = 200
+
+
+def _rolling_mean(values, window):
+    result = np.full(len(values), np.nan)
+    if len(values) >= window:
+        cumsum = np.cumsum(np.r_[0.0, values])
+        result[window - 1:] = (cumsum[window:] - cumsum[:-window]) / window
+    return result
+
+
+def compute_indicators(close):
+    """
+    종가 배열로 {지표: 배열} 계산 (window 가 차지 않은 구간은 NaN)
+    RSI 는 window 안의 평균 상승폭/하락폭으로 계산한다. (Cutler's RSI, 이전 값에 의존하지 않음)
+    """
+    close = np.asarray(close, dtype='float64')
+    days = len(close)
+    indicators = {f'ma{window}': _rolling_mean(close, window) for window in MOVING_AVERAGE_WINDOWS}
+
+    # RSI: t 일 값은 t-RSI_WINDOW+1 ~ t 일의 전일 대비 변화량으로 계산
+    change = np.r_[np.nan, np.diff(close)]
+    gain = _rolling_mean(np.clip(np.nan_to_num(change), 0, None), RSI_WINDOW)
+    loss = _rolling_mean(np.clip(-np.nan_to_num(change), 0, None), RSI_WINDOW)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = np.where(loss == 0, np.where(gain == 0, 50.0, 100.0), 100 - 100 / (1 + gain / loss))
+    rsi[:RSI_WINDOW] = np.nan
+    indicators['rsi14'] = rsi
+
+    # 변동성: 로그 수익률의 VOLATILITY_WINDOW 일 표본 표준편차를 연환산 (%)
+    volatility = np.full(days, np.nan)
+    if days > VOLATILITY_WINDOW:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_returns = np.diff(np.log(close))
+        volatility[VOLATILITY_WINDOW:] = sliding_window_view(log_returns, VOLATILITY_WINDOW).std(axis=1, ddof=1) \
+            * np.sqrt(TRADING_DAYS_PER_YEAR) * 100
+    indicators['volatility20'] = volatility
+    return indicators
+
+
+def _to_decimal(value):
+    return None if not np.isfinite(value) else Decimal(f'{value:.2f}')
+
+
+def build_indicator_rows(stock_id, bas_dts, close, from_index=0):
+    """
+    from_index 이후 row 의 DailyIndicator 목록 (지표는 전체 배열로 계산)
+    """
+    indicators = compute_indicators(close)
+    return [
+        DailyIndicator(
+            stock_id=stock_id,
+            bas_dt=bas_dts[index],
+            **{field: _to_decimal(indicators[field][index]) for field in INDICATOR_FIELDS},
+        )
+        for index in range(from_index, len(bas_dts))
+    ]
+
+
+def update_daily_indicators(stock_ids=None, full=False):
+    """
+    DailyStockData 와 DailyIndicator 를 비교해 지표가 필요한 row 만 계산 후 저장하고 {stock_id: 저장한 row 수} 반환
+    """
+    data_summaries = DailyStockData.objects.values('stock_id').annotate(count=Count('id'), last_bas_dt=Max('bas_dt'))
+    indicator_summaries = DailyIndicator.objects.values('stock_id').annotate(
+        count=Count('id'), last_bas_dt=Max('bas_dt'))
+    if stock_ids is not None:
+        data_summaries = data_summaries.filter(stock_id__in=stock_ids)
+        indicator_summaries = indicator_summaries.filter(stock_id__in=stock_ids)
+    data_summary_by_stock_id = {summary['stock_id']: summary for summary in data_summaries}
+    indicator_summary_by_stock_id = {summary['stock_id']: summary for summary in indicator_summaries}
+
+    # 이어서 계산할 종목 {stock_id: 지표 요약} / 전체를 다시 계산할 종목
+    tail_stocks, full_stock_ids = {}, []
+    for stock_id, summary in data_summary_by_stock_id.items():
+        indicator_summary = indicator_summary_by_stock_id.get(stock_id)
+        if full or indicator_summary is None or indicator_summary['count'] > summary['count']:
+            full_stock_ids.append(stock_id)
+        elif (indicator_summary['count'], indicator_summary['last_bas_dt']) != (summary['count'], summary['last_bas_dt']):
+            tail_stocks[stock_id] = indicator_summary
+
+    saved = {}
+    for stock_id, rows in _load_tail_rows(tail_stocks).items():
+        indicator_summary = tail_stocks[stock_id]
+        bas_dts = [row[0] for row in rows]
+        prior = sum(1 for bas_dt in bas_dts if bas_dt <= indicator_summary['last_bas_dt'])
+        new = len(bas_dts) - prior
+        # 새 row 가 모두 마지막 계산일 이후이고 (백필 없음) 필요한 이전 row 를 모두 읽었으면 tail 만 계산
+        if prior >= min(INDICATOR_LOOKBACK, indicator_summary['count']) \
+                and indicator_summary['count'] + new == data_summary_by_stock_id[stock_id]['count']:
+            saved[stock_id] = _save(build_indicator_rows(stock_id, bas_dts, [row[1] for row in rows], prior))
+        else:
+            full_stock_ids.append(stock_id)
+
+    for stock_id, rows in _load_rows(full_stock_ids).items():
+        saved[stock_id] = _save(build_indicator_rows(stock_id, [row[0] for row in rows], [row[1] for row in rows]))
+
+    if any(saved.values()):
+        bump_data_version()
+    logger.info(f"기술적 지표 {len(saved)}종목, {sum(saved.values())}건 저장")
+    return saved
+
+
+def _load_rows(stock_ids, since_by_stock_id=None):
+    """
+    {stock_id: [(bas_dt, clpr), ...]} (종목을 나눠 IN 쿼리)
+    """
+    rows_by_stock_id = {}
+    stock_ids = list(stock_ids)
+    for offset in range(0, len(stock_ids), INDICATOR_STOCK_CHUNK_SIZE):
+        chunk = stock_ids[offset:offset + INDICATOR_STOCK_CHUNK_SIZE]
+        queryset = DailyStockData.objects.filter(stock_id__in=chunk)
+        if since_by_stock_id:
+            queryset = queryset.filter(bas_dt__gte=min(since_by_stock_id[stock_id] for stock_id in chunk))
+        rows = queryset.order_by('stock_id', 'bas_dt').values_list('stock_id', 'bas_dt', 'clpr')
+        for stock_id, bas_dt, clpr in rows:
+            if since_by_stock_id and bas_dt < since_by_stock_id[stock_id]:
+                continue
+            rows_by_stock_id.setdefault(stock_id, []).append((bas_dt, clpr))
+    return rows_by_stock_id
+
+
+def _load_tail_rows(tail_stocks):
+    """
+    마지막 계산일 이전 INDICATOR_LOOKBACK 거래일부터 읽음
+    거래 정지 등으로 읽은 이전 row 가 부족한 종목은 호출하는 쪽에서 전체를 다시 계산한다.
+    """
+    if not tail_stocks:
+        return {}
+    calendar = get_trading_calendar()
+    since_by_stock_id = {
+        stock_id: calendar.trading_days_before(indicator_summary['last_bas_dt'], INDICATOR_LOOKBACK - 1)
+        for stock_id, indicator_summary in tail_stocks.items()
+    }
+    return _load_rows(tail_stocks, since_by_stock_id)
+
+
+def _save(rows):
+    DailyIndicator.objects.bulk_create(
+        rows,
+        batch_size=INDICATOR_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['stock', 'bas_dt'],
+        update_fields=list(INDICATOR_FIELDS),
+    )
+    return len(rows)
@@ -0,0 +1,237 @@
+"""
+DB 기반 작업 큐
+별도의 broker 없이 Job 테이블을 큐로 사용한다.
+worker 는 SELECT ... FOR UPDATE SKIP LOCKED 로 작업을 하나씩 가져가므로 여러 프로세스가 동시에 실행되어도 된다.
+"""
+import logging
+import os
+import socket
+import time
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from stocks.indicators import update_daily_indicators
+from stocks.metrics import observe_job
+from stocks.models import Job
+from stocks.services import SYNC_MODE_INCREMENTAL, ingest_market_daily_stock_data_range
+from stocks.snapshots import rebuild_weekly_recommendation_snapshot
+
+logger = logging.getLogger(__name__)
+
+JOB_HANDLERS = {}
+
+# 실행 중 상태로 이 시간이 지난 작업은 worker 가 죽은 것으로 보고 다시 대기시킨다 (초)
+JOB_STALE_TIMEOUT = 6 * 60 * 60
+JOB_MAX_ATTEMPTS = 3
+
+# 끝나면 최신 주차 스냅샷을 다시 만드는 작업 (스냅샷에 포함되는 데이터를 저장하는 작업)
+SNAPSHOT_JOB_KINDS = frozenset([
+    'fetch_all_stocks_info',
+    'fetch_weekly_stock_daily_data',
+    'fetch_market_daily_data',
+    'stock_ai_test',
+    'stock_ai_predict',
+])
+
+# 끝나면 시계열 저장소 / 기술적 지표를 증분 갱신하는 작업 (DailyStockData 를 저장하는 작업)
+DAILY_DATA_JOB_KINDS = frozenset([
+    'fetch_weekly_stock_daily_data',
+    'fetch_market_daily_data',
+])
+
+
+def job_handler(kind):
+    """
+    작업 종류(kind)에 실행 함수를 등록하는 decorator
+    실행 함수는 Job 인스턴스를 받고, JSON 으로 저장 가능한 결과를 반환한다.
+    """
+    def register(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return register
+
+
+def enqueue_job(kind, payload=None, idempotency_key=None):
+    """
+    작업을 큐에 등록하고 Job 을 반환
+    같은 idempotency_key 로 이미 등록된 작업이 있으면 새로 만들지 않고 기존 작업을 반환한다.
+    """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"등록되지 않은 작업 종류입니다: {kind}")
+
+    if idempotency_key:
+        existing = Job.objects.filter(idempotency_key=idempotency_key).first()
+        if existing:
+            return existing
+
+    try:
+        with transaction.atomic():
+            return Job.objects.create(kind=kind, payload=payload or {}, idempotency_key=idempotency_key or None)
+    except IntegrityError:
+        # 같은 키로 동시에 등록된 경우
+        return Job.objects.get(idempotency_key=idempotency_key)
+
+
+def claim_next_job(worker_name):
+    """
+    대기 중인 가장 오래된 작업을 실행 중 상태로 바꾸고 반환 (없으면 None)
+    """
+    with transaction.atomic():
+        job = Job.objects.select_for_update(skip_locked=True).filter(
+            status=Job.STATUS_QUEUED).order_by('id').first()
+        if job is None:
+            return None
+
+        job.status = Job.STATUS_RUNNING
+        job.worker = worker_name
+        job.attempts += 1
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'worker', 'attempts', 'started_at'])
+    return job
+
+
+def run_job(job):
+    """
+    작업을 실행하고 결과/오류를 저장
+    """
+    handler = JOB_HANDLERS.get(job.kind)
+    started = time.perf_counter()
+    try:
+        if handler is None:
+            raise ValueError(f"등록되지 않은 작업 종류입니다: {job.kind}")
+        job.result = handler(job)
+        if isinstance(job.result, dict) and 'error' in job.result:
+            # view 로직이 {"error": ...} 로 실패를 반환한 경우 (고정된 메시지라 그대로 공개해도 된다)
+            job.status = Job.STATUS_FAILED
+            job.error = str(job.result['error'])
+        else:
+            job.status = Job.STATUS_SUCCEEDED
+            job.error = ""
+    except Exception as e:
+        # 작업 상태 API 로 공개되므로 오류 종류만 저장하고 traceback 은 로그로만 남긴다
+        # (외부 API 오류 메시지에 요청 URL 과 인증 키가 포함될 수 있음)
+        logger.exception(f"작업 실패 ({job}): {str(e)}")
+        job.status = Job.STATUS_FAILED
+        job.error = f"{type(e).__name__}: 작업 실행 중 오류가 발생했습니다."
+    observe_job(job.kind, job.status, time.perf_counter() - started)
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'result', 'error', 'progress', 'progress_total', 'message', 'finished_at'])
+
+    if job.status == Job.STATUS_SUCCEEDED and job.kind in DAILY_DATA_JOB_KINDS:
+        update_timeseries()
+        update_indicators()
+    if job.status == Job.STATUS_SUCCEEDED and job.kind in SNAPSHOT_JOB_KINDS:
+        rebuild_latest_snapshot()
+    return job
+
+
+def update_timeseries():
+    """
+    시계열 저장소 증분 갱신 (TIMESERIES_STORE_DIR 가 설정된 경우, 실패해도 작업 결과에는 영향을 주지 않는다)
+    """
+    from stocks.timeseries import update_timeseries_store
+
+    try:
+        update_timeseries_store()
+    except Exception as e:
+        logger.error(f"시계열 저장소 갱신 실패: {str(e)}")
+
+
+def update_indicators():
+    """
+    기술적 지표 증분 계산 (실패해도 작업 결과에는 영향을 주지 않고, 다음 수집 작업 때 이어서 계산한다)
+    """
+    try:
+        update_daily_indicators()
+    except Exception as e:
+        logger.error(f"기술적 지표 계산 실패: {str(e)}")
+
+
+def rebuild_latest_snapshot():
+    """
+    최신 주차 스냅샷 재생성 (실패해도 작업 결과에는 영향을 주지 않고, 조회 시 다시 만든다)
+    """
+    try:
+        rebuild_weekly_recommendation_snapshot()
+    except Exception as e:
+        logger.error(f"스냅샷 생성 실패: {str(e)}")
+
+
+def requeue_stale_jobs():
+    """
+    worker 가 실행 중 종료되어 running 상태로 남은 작업을 다시 대기시키고 (실행 횟수가 JOB_MAX_ATTEMPTS 이상이면 실패 처리)
+    (다시 대기시킨 수, 실패 처리한 수) 반환
+    """
+    timeout = getattr(settings, 'JOB_STALE_TIMEOUT', JOB_STALE_TIMEOUT)
+    max_attempts = getattr(settings, 'JOB_MAX_ATTEMPTS', JOB_MAX_ATTEMPTS)
+    stale = Job.objects.filter(status=Job.STATUS_RUNNING, started_at__lt=timezone.now() - timedelta(seconds=timeout))
+
+    failed = stale.filter(attempts__gte=max_attempts).update(
+        status=Job.STATUS_FAILED, error="작업 실행 중 worker 가 종료되었습니다.", finished_at=timezone.now())
+    requeued = stale.filter(attempts__lt=max_attempts).update(status=Job.STATUS_QUEUED, worker="")
+    if requeued or failed:
+        logger.warning(f"중단된 작업 처리: 다시 대기 {requeued} 건, 실패 {failed} 건")
+    return requeued, failed
+
+
+def run_next_job(worker_name=None):
+    """
+    작업을 하나 가져와 실행 (실행할 작업이 없으면 None)
+    """
+    job = claim_next_job(worker_name or default_worker_name())
+    if job is None:
+        return None
+    return run_job(job)
+
+
+def default_worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+"""
+작업 종류별 실행 함수
+view 의 작업 로직을 그대로 재사용한다.
+"""
+
+
+@job_handler('fetch_all_stocks_info')
+def fetch_all_stocks_info(job):
+    from stocks.views import FetchAllStocksInfoView
+
+    created, updated = FetchAllStocksInfoView().fetch_and_save_all_stocks_info()
+    return {"created": created, "updated": updated}
+
+
+@job_handler('fetch_weekly_stock_daily_data')
+def fetch_weekly_stock_daily_data(job):
+    from stocks.views import FetchWeeklyStockDailyDataView
+
+    saved = FetchWeeklyStockDailyDataView().fetch_and_save_weekly_stocks_data(
+        mode=job.payload.get('mode', SYNC_MODE_INCREMENTAL), progress=job.report_progress)
+    return {"saved_rows": saved}
+
+
+@job_handler('fetch_market_daily_data')
+def fetch_market_daily_data(job):
+    return ingest_market_daily_stock_data_range(
+        date.fromisoformat(job.payload['start_date']),
+        date.fromisoformat(job.payload['end_date']),
+        progress=job.report_progress,
+    )
+
+
+@job_handler('stock_ai_test')
+def stock_ai_test(job):
+    from stocks.views import StockAITestView
+
+    return StockAITestView().test_and_save_weekly_stocks()
+
+
+@job_handler('stock_ai_predict')
+def stock_ai_predict(job):
+    from stocks.views import StockAIPredictView
+
+    return StockAIPredictView().predict_and_save_weekly_stocks()
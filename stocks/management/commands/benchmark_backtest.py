@@ -0,0 +1,79 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from stocks.models import WeeklyRecommendation, WeeklyRecommendationStock
+from stocks.services import BacktestPrices, BACKTEST_BACKEND_LOCAL, BACKTEST_BACKEND_REMOTE, \
+    simulate_moving_average_strategy
+from stocks.trading_calendar import get_trading_calendar, MODEL_WINDOW_TRADING_DAYS
+
+
+def _simulate(args):
+    prices, runs = args
+    return simulate_moving_average_strategy(prices, 10_000_000, runs, MODEL_WINDOW_TRADING_DAYS, seed=0)
+
+
+class Command(BaseCommand):
+    help = "로컬 백테스트 엔진 속도를 측정합니다. (--compare 면 최신 주차 종목으로 local / remote backend 결과와 시간을 비교)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stocks', type=int, default=50, help="합성 데이터 종목 수")
+        parser.add_argument('--days', type=int, default=1250, help="종목당 거래일 수")
+        parser.add_argument('--runs', type=int, default=1000, help="Monte-Carlo 실행 수")
+        parser.add_argument('--processes', type=int, default=4, help="프로세스 수")
+        parser.add_argument('--compare', action='store_true', help="최신 주차 종목으로 local / remote backend 비교")
+
+    def handle(self, *args, **options):
+        if options['compare']:
+            self.compare_backends()
+            return
+
+        rng = np.random.default_rng(0)
+        tasks = []
+        for _ in range(options['stocks']):
+            # 로그 수익률 random walk 로 만든 합성 가격
+            close = 10000 * np.exp(np.cumsum(rng.normal(0, 0.02, options['days'])))
+            prices = BacktestPrices(None, close * 1.01, close * 0.99, close, options['days'] // 5 * 4)
+            tasks.append((prices, options['runs']))
+
+        started = time.perf_counter()
+        for task in tasks:
+            _simulate(task)
+        single = time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=options['processes']) as executor:
+            list(executor.map(_simulate, tasks))
+        parallel = time.perf_counter() - started
+
+        simulations = options['stocks'] * options['runs']
+        self.stdout.write(f"stocks={options['stocks']} days={options['days']} runs={options['runs']}")
+        self.stdout.write(f"1 process           : {single:.3f}s ({simulations / single:,.0f} runs/s)")
+        self.stdout.write(f"{options['processes']} processes         : {parallel:.3f}s ({simulations / parallel:,.0f} runs/s)")
+
+    def compare_backends(self):
+        from stocks.views import StockAITestView
+
+        weekly_recommendation = WeeklyRecommendation.objects.latest('start_date')
+        view = StockAITestView()
+        stocks_with_cash = [
+            (weekly_stock.stock, view.get_test_starting_cash(weekly_stock.stock))
+            for weekly_stock in WeeklyRecommendationStock.objects.filter(
+                weekly_recommendation=weekly_recommendation).select_related('stock')
+        ]
+        backtest_window = get_trading_calendar().backtest_window(weekly_recommendation.start_date)
+        test_formatted_date = backtest_window.data_start_date.strftime('%Y-%m-%d')
+
+        results = {}
+        for backend in (BACKTEST_BACKEND_LOCAL, BACKTEST_BACKEND_REMOTE):
+            started = time.perf_counter()
+            results[backend] = view.run_backtests(backend, stocks_with_cash, backtest_window, test_formatted_date)
+            self.stdout.write(f"{backend:<6} : {time.perf_counter() - started:.3f}s")
+
+        for stock, _ in stocks_with_cash:
+            local, remote = results[BACKTEST_BACKEND_LOCAL].get(stock.id), results[BACKTEST_BACKEND_REMOTE].get(stock.id)
+            self.stdout.write(
+                f"{stock.isin_code} local={local.profit_mean if local else None} "
+                f"remote={remote.profit_mean if remote and remote.runs else None}")
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from stocks.models import Stock, DailyStockData
+from stocks.services import build_daily_stock_data_rows, bulk_upsert_daily_stock_data
+from stocks.testing import make_stock_price_items
+
+
+class Command(BaseCommand):
+    help = "DailyStockData 적재 속도(rows/s)를 기존 row 단위 방식과 bulk upsert 방식으로 비교합니다. (모든 변경은 롤백됩니다)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help="종목당 생성할 일별 데이터 수")
+        parser.add_argument('--page-size', type=int, default=100, help="API 한 페이지의 row 수")
+
+    def handle(self, *args, **options):
+        items = make_stock_price_items(options['rows'])
+        page_size = options['page_size']
+        pages = [items[i:i + page_size] for i in range(0, len(items), page_size)]
+
+        with transaction.atomic():
+            before = self.run(self.save_row_by_row, pages, "BENCHMARK-ROW")
+            after = self.run(self.save_bulk, pages, "BENCHMARK-BULK")
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"rows={len(items)} page_size={page_size}")
+        self.stdout.write(f"before (exists + create) : {before:,.0f} rows/s")
+        self.stdout.write(f"after  (bulk upsert)     : {after:,.0f} rows/s")
+        if before:
+            self.stdout.write(self.style.SUCCESS(f"speedup : x{after / before:.1f}"))
+
+    def run(self, save, pages, isin_code):
+        stock = Stock.objects.create(isin_code=isin_code, srtn_code=isin_code, itms_name=isin_code)
+        row_count = sum(len(page) for page in pages)
+        started = time.perf_counter()
+        for page in pages:
+            save(stock, page)
+        elapsed = time.perf_counter() - started
+        return row_count / elapsed if elapsed else 0.0
+
+    def save_row_by_row(self, stock, items):
+        # 기존 save_stock_data 와 동일한 방식 (row 마다 exists + create)
+        for row in build_daily_stock_data_rows(stock, items):
+            if not DailyStockData.objects.filter(stock=stock, bas_dt=row.bas_dt).exists():
+                row.save()
+
+    def save_bulk(self, stock, items):
+        bulk_upsert_daily_stock_data(build_daily_stock_data_rows(stock, items))
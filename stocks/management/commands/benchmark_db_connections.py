@@ -0,0 +1,91 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.db.backends.signals import connection_created
+from django.test import Client
+
+from stocks.models import WeeklyRecommendation, WeeklyRecommendationStock
+
+
+class Command(BaseCommand):
+    help = (
+        "공개 조회 API 를 요청마다 새 커넥션 (CONN_MAX_AGE=0) 과 커넥션 재사용 (settings 값) 으로 각각 호출해 "
+        "요청당 p50/p99 응답 시간과 새로 연 DB 커넥션 수를 비교합니다. "
+        "데이터는 benchmark_endpoints --keep 으로 남긴 벤치마크 DB (test_<DB 이름>) 를 DATABASE_NAME 으로 지정해 사용할 수 있습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="엔드포인트별 요청 수")
+        parser.add_argument('--conn-max-age', type=int, default=None,
+                            help="재사용 측정에 사용할 CONN_MAX_AGE (기본: settings 값, 0 이면 60)")
+
+    def handle(self, *args, **options):
+        endpoints = self.endpoints()
+        settings_dict = connection.settings_dict
+        configured = settings_dict['CONN_MAX_AGE']
+        persistent = options['conn_max_age'] if options['conn_max_age'] is not None else configured or 60
+
+        self.stdout.write(
+            f"{connection.vendor} {settings_dict.get('HOST') or 'local'} "
+            f"(CONN_HEALTH_CHECKS={settings_dict.get('CONN_HEALTH_CHECKS')}, "
+            f"DISABLE_SERVER_SIDE_CURSORS={settings_dict.get('DISABLE_SERVER_SIDE_CURSORS')})"
+        )
+        self.stdout.write(f"{'CONN_MAX_AGE':<14}{'endpoint':<32}{'p50 (ms)':>10}{'p99 (ms)':>10}{'connects':>10}")
+        try:
+            for conn_max_age in (0, persistent):
+                settings_dict['CONN_MAX_AGE'] = conn_max_age
+                connection.close()
+                for name, make_url in endpoints:
+                    latencies, connects = self.measure(make_url, options['requests'])
+                    p50, p99 = self.percentiles(latencies)
+                    self.stdout.write(f"{str(conn_max_age):<14}{name:<32}{p50:>10.2f}{p99:>10.2f}{connects:>10}")
+        finally:
+            settings_dict['CONN_MAX_AGE'] = configured
+            connection.close()
+
+    def endpoints(self):
+        latest_weekly_recommendation = WeeklyRecommendation.objects.order_by('-start_date').first()
+        isin_codes = list(WeeklyRecommendationStock.objects.filter(
+            weekly_recommendation=latest_weekly_recommendation).values_list('stock__isin_code', flat=True))
+        if not isin_codes:
+            raise CommandError("최신 주차 추천 종목이 없습니다. benchmark_endpoints --keep 으로 데이터를 만드세요.")
+        return [
+            ("weekly/latest", lambda _: "/stocks/weekly/latest/"),
+            ("weekly/latest/test/<isin>", lambda i: f"/stocks/weekly/latest/test/{isin_codes[i % len(isin_codes)]}"),
+            ("weekly/latest/predict/<isin>", lambda i: f"/stocks/weekly/latest/predict/{isin_codes[i % len(isin_codes)]}"),
+        ]
+
+    def measure(self, make_url, request_count):
+        """
+        test Client 는 요청 중 close_old_connections 시그널 핸들러를 떼어 두므로, 실제 서버의 request_finished 처럼
+        요청마다 직접 호출해 CONN_MAX_AGE 에 따른 커넥션 종료 / 재사용을 재현한다.
+        """
+        client = Client(HTTP_HOST='127.0.0.1')
+        connects = []
+
+        def count_connect(sender, **kwargs):
+            connects.append(sender)
+
+        client.get(make_url(0))  # warm up
+        close_old_connections()
+        connection_created.connect(count_connect)
+        try:
+            latencies = []
+            for i in range(request_count):
+                started = time.perf_counter()
+                response = client.get(make_url(i))
+                close_old_connections()
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code >= 400:
+                    raise CommandError(f"{make_url(i)} 요청 실패: {response.status_code}")
+        finally:
+            connection_created.disconnect(count_connect)
+        return latencies, len(connects)
+
+    def percentiles(self, latencies):
+        if len(latencies) < 2:
+            return latencies[0], latencies[0]
+        quantiles = statistics.quantiles(latencies, n=100, method='inclusive')
+        return quantiles[49], quantiles[98]
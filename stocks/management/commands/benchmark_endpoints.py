@@ -0,0 +1,152 @@
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connection, transaction
+from django.test import Client
+from django.test.utils import override_settings, setup_databases, teardown_databases
+
+from stocks.models import Stock, DailyStockData, WeeklyRecommendation, WeeklyRecommendationStock, \
+    WeeklyRecommendationStockTestResult, WeeklyRecommendationStockPredictResult
+
+BENCHMARK_ISIN_PREFIX = "BENCH"
+
+# 운영 캐시 (Redis) 에 벤치마크 응답 / 데이터 버전이 섞이지 않도록 프로세스 메모리 캐시를 사용
+BENCHMARK_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'stopickr-benchmark',
+    }
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "합성 데이터(기본 5년 x 2,800 종목)를 만들고 공개 API 의 p50/p99 응답 시간을 측정합니다.\n"
+        "운영 DB 대신 별도의 벤치마크 DB (test_<DB 이름>) 를 만들어 실행하고, 끝나면 삭제합니다. "
+        "--keep 이면 벤치마크 DB 를 남겨 두며, 다른 벤치마크 서버의 DATABASE_NAME 으로 지정해 사용할 수 있습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stocks', type=int, default=2800, help="생성할 종목 수")
+        parser.add_argument('--years', type=int, default=5, help="종목당 생성할 데이터 기간(년)")
+        parser.add_argument('--weekly-stocks', type=int, default=10, help="최신 주차 추천 종목 수")
+        parser.add_argument('--requests', type=int, default=100, help="엔드포인트별 요청 수")
+        parser.add_argument('--skip-seed', action='store_true', help="이전에 --keep 으로 남긴 합성 데이터를 재사용")
+        parser.add_argument('--keep', action='store_true', help="측정 후 벤치마크 DB 와 합성 데이터를 삭제하지 않음")
+
+    def handle(self, *args, **options):
+        # 테스트 실행과 같은 방식으로 벤치마크 DB 를 만들고 default 커넥션을 그쪽으로 바꾼다
+        old_config = setup_databases(
+            verbosity=0, interactive=False, keepdb=options['keep'] or options['skip_seed'], aliases={DEFAULT_DB_ALIAS})
+        database_name = connection.settings_dict['NAME']
+        try:
+            with override_settings(CACHES=BENCHMARK_CACHES, TIMESERIES_STORE_DIR=None):
+                self.run(options)
+        finally:
+            teardown_databases(old_config, verbosity=0, keepdb=options['keep'])
+        if options['keep']:
+            self.stdout.write(f"벤치마크 DB {database_name} 를 남겨 두었습니다.")
+
+    def run(self, options):
+        if options['skip_seed']:
+            if not Stock.objects.filter(isin_code__startswith=BENCHMARK_ISIN_PREFIX).exists():
+                raise CommandError("재사용할 합성 데이터가 없습니다. --skip-seed 없이 실행하세요.")
+        else:
+            self.cleanup()
+            self.seed(options['stocks'], options['years'], options['weekly_stocks'])
+
+        try:
+            self.measure(options['requests'])
+        finally:
+            if not options['keep']:
+                self.cleanup()
+
+    def seed(self, stock_count, years, weekly_stock_count):
+        trading_days = self.trading_days(date.today(), years)
+        started = time.perf_counter()
+
+        stocks = Stock.objects.bulk_create([
+            Stock(isin_code=f"{BENCHMARK_ISIN_PREFIX}{i:07d}", srtn_code=f"{i:06d}", itms_name=f"벤치마크{i}", mrkt_cls="KOSPI")
+            for i in range(stock_count)
+        ])
+        # bulk_create 가 pk 를 돌려주지 않는 DB 를 위해 다시 조회
+        stocks = list(Stock.objects.filter(isin_code__startswith=BENCHMARK_ISIN_PREFIX).order_by('isin_code'))
+
+        for done, stock in enumerate(stocks, start=1):
+            with transaction.atomic():
+                DailyStockData.objects.bulk_create(self.make_rows(stock, trading_days), batch_size=2000)
+            if done % 100 == 0:
+                self.stdout.write(f"seeded {done}/{len(stocks)} stocks")
+
+        weekly_recommendation = WeeklyRecommendation.objects.create(
+            start_date=date(9999, 12, 27), end_date=date(9999, 12, 31))  # 항상 최신 주차가 되도록
+        weekly_stocks = random.sample(stocks, min(weekly_stock_count, len(stocks)))
+        for stock in weekly_stocks:
+            WeeklyRecommendationStock.objects.create(weekly_recommendation=weekly_recommendation, stock=stock)
+            WeeklyRecommendationStockTestResult.objects.create(
+                profit=1.23, profit_std=0.5, test_runs=10, test_starting_cash=1000000,
+                stock=stock, weekly_recommendation=weekly_recommendation)
+            WeeklyRecommendationStockPredictResult.objects.create(
+                action="BUY", target_date=trading_days[-1], stock=stock, weekly_recommendation=weekly_recommendation)
+
+        row_count = len(stocks) * len(trading_days)
+        self.stdout.write(f"seeded {row_count:,} rows in {time.perf_counter() - started:.1f}s")
+
+    def measure(self, request_count):
+        client = Client(HTTP_HOST='127.0.0.1')
+        weekly_isin_codes = list(WeeklyRecommendationStock.objects.filter(
+            stock__isin_code__startswith=BENCHMARK_ISIN_PREFIX).values_list('stock__isin_code', flat=True))
+        endpoints = [
+            ("weekly/latest", lambda _: "/stocks/weekly/latest/"),
+            ("weekly/latest/test/<isin>", lambda i: f"/stocks/weekly/latest/test/{weekly_isin_codes[i % len(weekly_isin_codes)]}"),
+            ("weekly/latest/predict/<isin>", lambda i: f"/stocks/weekly/latest/predict/{weekly_isin_codes[i % len(weekly_isin_codes)]}"),
+        ]
+
+        self.stdout.write(f"{'endpoint':<32}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+        for name, make_url in endpoints:
+            client.get(make_url(0))  # warm up
+            latencies = []
+            for i in range(request_count):
+                started = time.perf_counter()
+                response = client.get(make_url(i))
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code >= 400:
+                    raise CommandError(f"{name} 요청 실패: {response.status_code}")
+            p50, p99 = self.percentiles(latencies)
+            self.stdout.write(f"{name:<32}{p50:>10.2f}{p99:>10.2f}")
+
+    def cleanup(self):
+        WeeklyRecommendation.objects.filter(start_date=date(9999, 12, 27)).delete()
+        Stock.objects.filter(isin_code__startswith=BENCHMARK_ISIN_PREFIX).delete()
+
+    def percentiles(self, latencies):
+        if len(latencies) < 2:
+            return latencies[0], latencies[0]
+        quantiles = statistics.quantiles(latencies, n=100, method='inclusive')
+        return quantiles[49], quantiles[98]
+
+    def trading_days(self, end, years):
+        # 주말을 제외한 평일을 거래일로 가정
+        days = []
+        current = end - timedelta(days=365 * years)
+        while current <= end:
+            if current.weekday() < 5:
+                days.append(current)
+            current += timedelta(days=1)
+        return days
+
+    def make_rows(self, stock, trading_days):
+        rows = []
+        price = random.randint(1000, 100000)
+        for bas_dt in trading_days:
+            change = int(price * random.uniform(-0.03, 0.03))
+            price = max(100, price + change)
+            rows.append(DailyStockData(
+                stock=stock, bas_dt=bas_dt, clpr=price, hipr=price + abs(change), lopr=price - abs(change),
+                mkp=price - change, vs=change, flt_rt=round(change / price * 100, 2), trqu=random.randint(1000, 1000000),
+                tr_prc=price * 1000, lstg_st_cnt=10000000, mrkt_tot_amt=price * 10000000,
+            ))
+        return rows
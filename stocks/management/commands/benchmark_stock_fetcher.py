@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from stocks.services import fetch_stock_price_items
+from stocks.testing import PublicDataStubServer, make_stock_price_items
+
+
+class Command(BaseCommand):
+    help = "로컬 stub 서버를 대상으로 getStockPriceInfo 순차 페이징과 동시 페이징 속도를 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2800, help="stub 서버가 내려줄 전체 row 수")
+        parser.add_argument('--latency', type=float, default=0.2, help="stub 서버의 요청당 지연 시간(초)")
+        parser.add_argument('--num-of-rows', type=int, default=1000, help="동시 페이징 시 페이지 크기")
+        parser.add_argument('--max-workers', type=int, default=4, help="동시 페이징 시 최대 동시 요청 수")
+
+    def handle(self, *args, **options):
+        items = make_stock_price_items(options['rows'])
+
+        with PublicDataStubServer(items, latency=options['latency']) as stub:
+            cases = [
+                ("sequential (numOfRows=100)", 100, 1),
+                (f"concurrent (numOfRows={options['num_of_rows']}, workers={options['max_workers']})",
+                 options['num_of_rows'], options['max_workers']),
+            ]
+            for label, num_of_rows, max_workers in cases:
+                stub.request_count = 0
+                started = time.perf_counter()
+                fetched = fetch_stock_price_items({}, num_of_rows=num_of_rows, max_workers=max_workers, url=stub.url)
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"{label:<45} rows={len(fetched)} requests={stub.request_count} "
+                    f"elapsed={elapsed:.2f}s ({len(fetched) / elapsed:,.0f} rows/s)"
+                )
@@ -0,0 +1,83 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from stocks.hangul import HANGUL_BASE, chosung, decompose_char, is_syllable
+from stocks.models import Stock
+from stocks.search import StockSearchIndex, get_stock_search_index, normalize
+
+
+class Command(BaseCommand):
+    help = (
+        "종목 명 / 코드 / 초성을 한 글자씩 입력하는 자동완성 요청을 흉내 내 종목 검색의 키 입력당 p50/p99 응답 시간을 측정합니다. "
+        "전체 KRX 종목(종목 정보 불러오기 작업 후) 기준으로 실행하세요."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', type=int, default=300, help="입력을 흉내 낼 종목 수")
+        parser.add_argument('--seed', type=int, default=0, help="종목 선택 random seed")
+
+    def handle(self, *args, **options):
+        stocks = list(Stock.objects.values_list('itms_name', 'srtn_code'))
+        if not stocks:
+            raise CommandError("종목 데이터가 없습니다. 종목 정보를 먼저 불러오세요.")
+
+        started = time.perf_counter()
+        index = StockSearchIndex.build()
+        self.stdout.write(
+            f"index: {len(index.entries):,} 종목, suffix {len(index.suffixes):,}개, "
+            f"생성 {(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+
+        # 종목별로 한 글자씩 입력할 때의 검색어 목록 (종류별)
+        random.seed(options['seed'])
+        sample = random.sample(stocks, min(options['queries'], len(stocks)))
+        keystrokes = {
+            "name": [prefix for itms_name, _ in sample for prefix in self.prefixes(normalize(itms_name))],
+            "code": [prefix for _, srtn_code in sample for prefix in self.prefixes(srtn_code or '')],
+            "chosung": [prefix for itms_name, _ in sample for prefix in self.prefixes(chosung(normalize(itms_name)))],
+            "jamo": [query for itms_name, _ in sample for query in self.composing(normalize(itms_name))],
+        }
+
+        get_stock_search_index()  # 프로세스 캐시를 미리 만들어 둠
+        client = Client(HTTP_HOST='127.0.0.1')
+        self.stdout.write(f"{'':<10}{'kind':<10}{'keystrokes':>12}{'hits':>8}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+        for name, search in (
+            ("index", lambda query: index.search(query)),
+            ("api", lambda query: client.get('/stocks/search/', {'q': query}).json()),
+        ):
+            for kind, queries in keystrokes.items():
+                latencies, hits = [], 0
+                for query in queries:
+                    started = time.perf_counter()
+                    hits += bool(search(query))
+                    latencies.append((time.perf_counter() - started) * 1000)
+                p50, p99 = self.percentiles(latencies)
+                self.stdout.write(f"{name:<10}{kind:<10}{len(queries):>12}{hits:>8}{p50:>10.3f}{p99:>10.3f}")
+
+    def prefixes(self, text):
+        return [text[:length] for length in range(1, len(text) + 1)]
+
+    def composing(self, text):
+        """
+        입력 중인 글자를 포함한 검색어 ('삼성전' 을 입력하는 중이면 '삼성ㅈ', '삼성저', '삼성전')
+        """
+        queries = []
+        for length, char in enumerate(text):
+            if not is_syllable(char):
+                continue
+            queries.append(text[:length] + decompose_char(char)[0])
+            offset = ord(char) - HANGUL_BASE
+            if offset % 28:
+                # 받침을 입력하기 전 글자 (저)
+                queries.append(text[:length] + chr(HANGUL_BASE + offset - offset % 28))
+        return queries
+
+    def percentiles(self, latencies):
+        if len(latencies) < 2:
+            return latencies[0], latencies[0]
+        quantiles = statistics.quantiles(latencies, n=100, method='inclusive')
+        return quantiles[49], quantiles[98]
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from stocks.exceptions import TimeSeriesStoreDisabledException
+from stocks.models import Stock
+from stocks.timeseries import get_timeseries_store
+
+
+class Command(BaseCommand):
+    help = "종목별 일자별 데이터를 시계열 저장소(.npy)에 저장합니다. (기본은 바뀐 종목만 증분 갱신)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="모든 종목을 처음부터 다시 만듭니다.")
+        parser.add_argument('--isin-codes', help="갱신할 종목 ISIN 코드 (쉼표로 구분, 기본: 전체)")
+
+    def handle(self, *args, **options):
+        try:
+            store = get_timeseries_store()
+        except TimeSeriesStoreDisabledException:
+            raise CommandError("settings.TIMESERIES_STORE_DIR 를 설정해야 합니다.")
+
+        stocks = None
+        if options['isin_codes']:
+            stocks = list(Stock.objects.filter(isin_code__in=options['isin_codes'].split(',')))
+
+        updated = store.update(stocks, full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f"{len(updated)}종목, {sum(updated.values())}건 저장 완료 ({store.root})"))
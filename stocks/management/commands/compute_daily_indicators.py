@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from stocks.indicators import update_daily_indicators
+from stocks.models import Stock
+
+
+class Command(BaseCommand):
+    help = "DailyStockData 로 기술적 지표(DailyIndicator)를 계산합니다. (기본은 새 row 만 증분 계산)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="모든 종목의 지표를 처음부터 다시 계산합니다.")
+        parser.add_argument('--isin-codes', help="계산할 종목 ISIN 코드 (쉼표로 구분, 기본: 전체)")
+
+    def handle(self, *args, **options):
+        stock_ids = None
+        if options['isin_codes']:
+            stock_ids = list(Stock.objects.filter(
+                isin_code__in=options['isin_codes'].split(',')).values_list('id', flat=True))
+
+        saved = update_daily_indicators(stock_ids, full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f"{len(saved)}종목, {sum(saved.values())}건 저장 완료"))
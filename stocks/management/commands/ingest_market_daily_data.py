@@ -0,0 +1,34 @@
+from datetime import date, datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from stocks.jobs import rebuild_latest_snapshot, update_indicators, update_timeseries
+from stocks.services import ingest_market_daily_stock_data_range
+
+
+class Command(BaseCommand):
+    help = "기준일자별 전체 시장 데이터를 가져와 모든 종목의 DailyStockData 를 저장합니다. (구간을 주면 여러 날짜를 동시에 처리)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start-date', help="시작 기준일자 (YYYY-MM-DD, 기본: 오늘)")
+        parser.add_argument('--end-date', help="종료 기준일자 (YYYY-MM-DD, 기본: 시작 기준일자)")
+        parser.add_argument('--workers', type=int, default=None, help="동시에 처리할 날짜 수")
+
+    def handle(self, *args, **options):
+        try:
+            start_date = self.parse_date(options['start_date']) or date.today()
+            end_date = self.parse_date(options['end_date']) or start_date
+        except ValueError:
+            raise CommandError("날짜는 YYYY-MM-DD 형식이어야 합니다.")
+
+        saved = ingest_market_daily_stock_data_range(
+            start_date, end_date, max_workers=options['workers'],
+            progress=lambda done, total, bas_dt: self.stdout.write(f"[{done}/{total}] {bas_dt}"),
+        )
+        update_timeseries()
+        update_indicators()
+        rebuild_latest_snapshot()
+        self.stdout.write(self.style.SUCCESS(f"{len(saved)}일, {sum(saved.values())}건 저장 완료"))
+
+    def parse_date(self, value):
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
@@ -0,0 +1,108 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from stocks.models import WeeklyRecommendation, WeeklyRecommendationStock
+
+
+class Command(BaseCommand):
+    help = (
+        "실행 중인 WSGI / ASGI 서버에 동시 요청을 보내 공개 조회 API 의 초당 처리량(RPS)과 p50/p99 응답 시간을 비교합니다.\n"
+        "예) gunicorn stopickr_django_server.wsgi -w 4 -b :8001\n"
+        "    uvicorn stopickr_django_server.asgi:application --workers 4 --port 8002\n"
+        "    python manage.py loadtest_wsgi_asgi --wsgi-url http://127.0.0.1:8001 --asgi-url http://127.0.0.1:8002\n"
+        "ASGI 서버에는 sync view 와 async view (/stocks/async/...) 를 모두 요청합니다. "
+        "데이터는 benchmark_endpoints --keep 으로 남긴 벤치마크 DB (test_<DB 이름>) 를 서버의 DATABASE_NAME 으로 지정해 사용할 수 있습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wsgi-url', help="WSGI 서버 주소 (예: http://127.0.0.1:8001)")
+        parser.add_argument('--asgi-url', help="ASGI 서버 주소 (예: http://127.0.0.1:8002)")
+        parser.add_argument('--concurrency', type=int, default=50, help="동시 클라이언트 수")
+        parser.add_argument('--requests', type=int, default=2000, help="엔드포인트별 요청 수")
+        parser.add_argument('--warmup', type=int, default=50, help="측정 전 엔드포인트별 warm up 요청 수")
+        parser.add_argument('--timeout', type=float, default=30, help="요청 timeout (초)")
+
+    def handle(self, *args, **options):
+        targets = []
+        if options['wsgi_url']:
+            targets.append(('wsgi', options['wsgi_url'].rstrip('/'), ''))
+        if options['asgi_url']:
+            targets.append(('asgi', options['asgi_url'].rstrip('/'), ''))
+            targets.append(('asgi/async', options['asgi_url'].rstrip('/'), 'async/'))
+        if not targets:
+            raise CommandError("--wsgi-url 또는 --asgi-url 중 하나 이상을 지정하세요.")
+
+        endpoints = self.endpoints()
+        self.stdout.write(f"{'server':<12}{'endpoint':<32}{'rps':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}{'errors':>8}")
+        for label, base_url, prefix in targets:
+            for name, make_path in endpoints:
+                make_url = lambda i: f"{base_url}/stocks/{prefix}{make_path(i)}"
+                self.run_load(make_url, options['warmup'], options['concurrency'], options['timeout'])
+                rps, latencies, errors = self.run_load(
+                    make_url, options['requests'], options['concurrency'], options['timeout'])
+                p50, p99 = self.percentiles(latencies)
+                self.stdout.write(f"{label:<12}{name:<32}{rps:>10.1f}{p50:>10.2f}{p99:>10.2f}{errors:>8}")
+
+    def endpoints(self):
+        latest_weekly_recommendation = WeeklyRecommendation.objects.order_by('-start_date').first()
+        if latest_weekly_recommendation is None:
+            raise CommandError("주차 추천 데이터가 없습니다. benchmark_endpoints --keep 으로 데이터를 만드세요.")
+        isin_codes = list(WeeklyRecommendationStock.objects.filter(
+            weekly_recommendation=latest_weekly_recommendation).values_list('stock__isin_code', flat=True))
+        if not isin_codes:
+            raise CommandError("최신 주차 추천 종목이 없습니다.")
+        return [
+            ("weekly/latest", lambda _: "weekly/latest/"),
+            ("weekly/latest/test/<isin>", lambda i: f"weekly/latest/test/{isin_codes[i % len(isin_codes)]}"),
+            ("weekly/latest/predict/<isin>", lambda i: f"weekly/latest/predict/{isin_codes[i % len(isin_codes)]}"),
+        ]
+
+    def run_load(self, make_url, request_count, concurrency, timeout):
+        """
+        concurrency 개의 클라이언트가 keep-alive 세션으로 요청을 나눠 보내는 closed-loop 부하
+        (RPS, 요청별 응답 시간(ms) 목록, 오류 수) 반환
+        """
+        if request_count <= 0:
+            return 0.0, [], 0
+
+        counter = iter(range(request_count))
+        counter_lock = threading.Lock()
+        latencies, errors = [], [0]
+        results_lock = threading.Lock()
+
+        def client():
+            session = requests.Session()
+            session.headers['Accept-Encoding'] = 'gzip'
+            while True:
+                with counter_lock:
+                    i = next(counter, None)
+                if i is None:
+                    break
+                started = time.perf_counter()
+                try:
+                    failed = session.get(make_url(i), timeout=timeout).status_code >= 400
+                except requests.exceptions.RequestException:
+                    failed = True
+                elapsed = (time.perf_counter() - started) * 1000
+                with results_lock:
+                    latencies.append(elapsed)
+                    errors[0] += int(failed)
+            session.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for _ in range(concurrency):
+                executor.submit(client)
+        elapsed = time.perf_counter() - started
+        return request_count / elapsed, latencies, errors[0]
+
+    def percentiles(self, latencies):
+        if len(latencies) < 2:
+            return (latencies[0], latencies[0]) if latencies else (0.0, 0.0)
+        quantiles = statistics.quantiles(latencies, n=100, method='inclusive')
+        return quantiles[49], quantiles[98]
@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from stocks.profiling import get_report_dir, load_reports
+
+SORT_KEYS = {
+    'db_time': lambda row: row['db_time'],
+    'duration': lambda row: row['duration'],
+    'queries': lambda row: row['query_count'],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "ProfilingMiddleware 가 저장한 요청 프로파일링 리포트를 URL name 별로 집계해 DB 시간이 큰 순서로 출력합니다. "
+        "반복된 쿼리 fingerprint (N+1 의심) 도 함께 보여줍니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', help="리포트 디렉터리 (기본: PROFILING_REPORT_DIR)")
+        parser.add_argument('--sort', choices=sorted(SORT_KEYS), default='db_time', help="정렬 기준 (합계)")
+        parser.add_argument('--limit', type=int, default=20, help="출력할 엔드포인트 수")
+        parser.add_argument('--duplicates', type=int, default=3, help="엔드포인트별로 보여줄 중복 쿼리 fingerprint 수")
+
+    def handle(self, *args, **options):
+        directory = options['dir'] or get_report_dir()
+        reports = load_reports(directory)
+        if not reports:
+            raise CommandError(f"{directory} 에 프로파일링 리포트가 없습니다.")
+
+        rows = self.aggregate(reports)
+        rows.sort(key=SORT_KEYS[options['sort']], reverse=True)
+
+        self.stdout.write(f"{len(reports)} reports in {directory}")
+        self.stdout.write(
+            f"{'url_name':<44}{'requests':>9}{'db (s)':>10}{'avg db (ms)':>13}{'avg queries':>13}"
+            f"{'max queries':>13}{'avg (ms)':>10}")
+        for row in rows[:options['limit']]:
+            count = row['requests']
+            self.stdout.write(
+                f"{row['url_name']:<44}{count:>9}{row['db_time']:>10.3f}{row['db_time'] / count * 1000:>13.2f}"
+                f"{row['query_count'] / count:>13.1f}{row['max_queries']:>13}{row['duration'] / count * 1000:>10.2f}")
+            for duplicate in row['duplicates'][:options['duplicates']]:
+                self.stdout.write(
+                    f"    x{duplicate['count']:<5} {duplicate['time'] * 1000:>9.2f} ms  {duplicate['fingerprint'][:160]}")
+
+    def aggregate(self, reports):
+        """
+        URL name 별 합계 (중복 쿼리는 fingerprint 별 요청당 최대 반복 횟수 / 시간 합계)
+        """
+        rows = {}
+        for report in reports:
+            row = rows.setdefault(report['url_name'], {
+                'url_name': report['url_name'], 'requests': 0, 'db_time': 0.0, 'duration': 0.0,
+                'query_count': 0, 'max_queries': 0, 'duplicates': {},
+            })
+            row['requests'] += 1
+            row['db_time'] += report['db_time']
+            row['duration'] += report['duration']
+            row['query_count'] += report['query_count']
+            row['max_queries'] = max(row['max_queries'], report['query_count'])
+            for duplicate in report['duplicate_queries']:
+                merged = row['duplicates'].setdefault(
+                    duplicate['fingerprint'], {'fingerprint': duplicate['fingerprint'], 'count': 0, 'time': 0.0})
+                merged['count'] = max(merged['count'], duplicate['count'])
+                merged['time'] += duplicate['time']
+        for row in rows.values():
+            row['duplicates'] = sorted(row['duplicates'].values(), key=lambda item: item['time'], reverse=True)
+        return list(rows.values())
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from stocks.models import WeeklyRecommendation
+from stocks.snapshots import rebuild_weekly_recommendation_snapshot
+
+
+class Command(BaseCommand):
+    help = "최신 주차 조회 API 스냅샷을 다시 만듭니다. (--all 이면 모든 주차)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="모든 주차의 스냅샷을 다시 만듭니다.")
+
+    def handle(self, *args, **options):
+        if options['all']:
+            weekly_recommendations = WeeklyRecommendation.objects.order_by('start_date')
+        else:
+            weekly_recommendations = WeeklyRecommendation.objects.order_by('-start_date')[:1]
+
+        for weekly_recommendation in weekly_recommendations:
+            snapshot = rebuild_weekly_recommendation_snapshot(weekly_recommendation)
+            self.stdout.write(f"{weekly_recommendation}: {snapshot.stock_count}종목, {len(snapshot.payload)} bytes")
+        self.stdout.write(self.style.SUCCESS("스냅샷 생성 완료"))
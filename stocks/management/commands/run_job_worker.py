@@ -0,0 +1,60 @@
+import multiprocessing
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from stocks.jobs import run_next_job, default_worker_name, requeue_stale_jobs
+from stocks.metrics import start_metrics_server
+
+
+class Command(BaseCommand):
+    help = "DB 작업 큐(Job)의 작업을 가져와 실행하는 worker 를 실행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1, help="실행할 worker 프로세스 수")
+        parser.add_argument('--poll-interval', type=float, default=2.0, help="대기 작업이 없을 때 다시 확인하기까지의 시간(초)")
+        parser.add_argument('--once', action='store_true', help="대기 중인 작업을 모두 실행한 뒤 종료")
+        parser.add_argument('--metrics-port', type=int, help="작업 실행 시간 등 지표를 노출할 포트 (프로세스마다 port + 순번)")
+
+    def handle(self, *args, **options):
+        metrics_port = options['metrics_port']
+        if options['processes'] <= 1:
+            self.work(options['poll_interval'], options['once'], metrics_port)
+            return
+
+        # fork 전에 커넥션을 닫아 자식 프로세스가 부모의 DB 커넥션을 공유하지 않도록 함
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(target=self.work, args=(
+                options['poll_interval'], options['once'], metrics_port + index if metrics_port else None))
+            for index in range(options['processes'])
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+    def work(self, poll_interval, once, metrics_port=None):
+        worker_name = default_worker_name()
+        self.stdout.write(f"worker {worker_name} 시작")
+        if metrics_port:
+            start_metrics_server(metrics_port)
+            self.stdout.write(f"worker {worker_name} 지표: :{metrics_port}/metrics")
+        try:
+            while True:
+                # 요청 사이클 밖이므로 CONN_MAX_AGE / CONN_HEALTH_CHECKS 를 직접 적용 (오래되거나 끊긴 커넥션을 닫음)
+                close_old_connections()
+                job = run_next_job(worker_name)
+                if job is not None:
+                    self.stdout.write(f"{job} 완료")
+                    continue
+                if once:
+                    break
+                # 대기 작업이 없을 때 죽은 worker 가 남긴 실행 중 작업을 다시 대기시킴
+                requeue_stale_jobs()
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            connections.close_all()
@@ -0,0 +1,221 @@
+"""
+Prometheus text exposition 포맷 지표
+외부 의존성 없이 프로세스 메모리에 histogram 을 누적하고 /metrics 에서 text 포맷으로 내보낸다.
+- 요청: URL name 별 응답 시간, 요청당 DB 쿼리 수 / 쿼리 시간 (MetricsMiddleware)
+- 외부 HTTP: upstream host 별 응답 시간 (stocks.clients)
+- 작업: 종류별 실행 시간 (stocks.jobs, run_job_worker --metrics-port 로 노출)
+지표는 프로세스별로 누적되므로 여러 worker 프로세스로 배포한 경우 Prometheus 가 프로세스마다 수집해야 한다.
+"""
+import contextvars
+import http.server
+import threading
+import time
+from bisect import bisect_left
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+JOB_DURATION_BUCKETS = (1, 5, 15, 30, 60, 300, 900, 1800, 3600, 7200)
+
+
+def _format_value(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class Metric:
+    metric_type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.metric_type}']
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self.render_samples(items))
+        return lines
+
+
+class Histogram(Metric):
+    metric_type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        # 누적 분포는 내보낼 때 계산하고, 관측 시에는 해당 bucket 하나만 증가시킨다
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            counts[0][index] += 1
+            counts[1] += value
+
+    def get(self, **labels):
+        """
+        (관측 수, 합계)
+        """
+        counts = self._values.get(self._key(labels))
+        return (sum(counts[0]), counts[1]) if counts else (0, 0.0)
+
+    def render_samples(self, items):
+        for key, (bucket_counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), bucket_counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else _format_value(bound)
+                yield f'{self.name}_bucket{_format_labels(self.labelnames, key, [("le", le)])} {cumulative}'
+            yield f'{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}'
+            yield f'{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}'
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        for metric in self.metrics:
+            metric.reset()
+
+
+REGISTRY = Registry()
+
+REQUEST_DURATION = REGISTRY.register(Histogram(
+    'stopickr_http_request_duration_seconds', "URL name 별 요청 처리 시간", ['url_name', 'method', 'status']))
+REQUEST_DB_QUERIES = REGISTRY.register(Histogram(
+    'stopickr_http_request_db_queries', "요청당 DB 쿼리 수", ['url_name'], buckets=QUERY_COUNT_BUCKETS))
+REQUEST_DB_DURATION = REGISTRY.register(Histogram(
+    'stopickr_http_request_db_duration_seconds', "요청당 DB 쿼리 시간 합계", ['url_name']))
+OUTBOUND_DURATION = REGISTRY.register(Histogram(
+    'stopickr_outbound_http_duration_seconds', "upstream host 별 외부 HTTP 요청 시간 (재시도는 각각 관측)",
+    ['host', 'outcome']))
+JOB_DURATION = REGISTRY.register(Histogram(
+    'stopickr_job_duration_seconds', "작업 종류별 실행 시간", ['kind', 'status'], buckets=JOB_DURATION_BUCKETS))
+
+
+def render_metrics():
+    return REGISTRY.render()
+
+
+def observe_outbound_request(host, elapsed, error=False):
+    OUTBOUND_DURATION.observe(elapsed, host=host, outcome='error' if error else 'ok')
+
+
+def observe_job(kind, status, elapsed):
+    JOB_DURATION.observe(elapsed, kind=kind, status=status)
+
+
+# 요청당 DB 쿼리 수 / 시간
+# 커넥션이 만들어질 때 execute wrapper 를 한 번 붙여 두고, 요청 중에만 context variable 에 누적한다.
+# (async view 의 ORM 호출은 다른 스레드에서 실행되지만 context variable 은 sync_to_async 로 전달된다)
+_request_db_stats = contextvars.ContextVar('stocks_request_db_stats', default=None)
+
+
+class QueryStats:
+    """
+    쿼리 수 / 시간 누적 (queries 가 list 면 (sql, 시간) 도 기록)
+    중첩해서 시작하면 (profiling middleware 등) 바깥 누적에도 함께 더한다.
+    """
+    __slots__ = ('count', 'duration', 'queries', 'parent')
+
+    def __init__(self, record_queries=False, parent=None):
+        self.count = 0
+        self.duration = 0.0
+        self.queries = [] if record_queries else None
+        self.parent = parent
+
+
+def _record_query(execute, sql, params, many, context):
+    stats = _request_db_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        while stats is not None:
+            stats.count += 1
+            stats.duration += elapsed
+            if stats.queries is not None:
+                stats.queries.append((sql, elapsed))
+            stats = stats.parent
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def start_query_stats(record_queries=False):
+    """
+    현재 context 의 DB 쿼리 누적을 시작하고 (QueryStats, reset token) 반환
+    """
+    stats = QueryStats(record_queries, parent=_request_db_stats.get())
+    return stats, _request_db_stats.set(stats)
+
+
+def stop_query_stats(token):
+    _request_db_stats.reset(token)
+
+
+class _MetricsRequestHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = render_metrics().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port, addr=''):
+    """
+    웹 서버가 없는 프로세스 (작업 worker) 의 지표를 노출하는 daemon 스레드 HTTP 서버
+    """
+    server = http.server.ThreadingHTTPServer((addr, port), _MetricsRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
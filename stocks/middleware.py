@@ -0,0 +1,125 @@
+"""
+요청 단위 middleware
+"""
+import logging
+import os
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+
+from stocks.metrics import REQUEST_DB_DURATION, REQUEST_DB_QUERIES, REQUEST_DURATION, start_query_stats, \
+    stop_query_stats
+from stocks.profiling import build_report, start_profiler, write_report
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """
+    URL name 별 요청 처리 시간과 요청당 DB 쿼리 수 / 시간을 stocks.metrics 에 기록
+    (sync / async view 모두 지원, URL name 이 없는 요청은 'unmatched' 로 묶어 label 수를 제한한다)
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        stats, token = start_query_stats()
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_query_stats(token)
+        self.observe(request, response, started, stats)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        stats, token = start_query_stats()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_query_stats(token)
+        self.observe(request, response, started, stats)
+        return response
+
+    def observe(self, request, response, started, stats):
+        resolver_match = getattr(request, 'resolver_match', None)
+        url_name = resolver_match.url_name if resolver_match and resolver_match.url_name else 'unmatched'
+        REQUEST_DURATION.observe(time.perf_counter() - started, url_name=url_name, method=request.method,
+                                 status=response.status_code)
+        REQUEST_DB_QUERIES.observe(stats.count, url_name=url_name)
+        REQUEST_DB_DURATION.observe(stats.duration, url_name=url_name)
+
+
+class ProfilingMiddleware:
+    """
+    opt-in 요청 프로파일링 (쿼리 수 / 시간, 중복 쿼리 fingerprint, cProfile 상위 함수)
+    - PROFILING_ENABLED 면 PROFILING_SAMPLE_RATE 비율로 표본 요청을 프로파일링
+    - PROFILING_TOKEN 을 설정한 경우 X-Profile: <token> 헤더가 있는 요청은 항상 프로파일링
+    리포트는 stocks.profiling.write_report 로 PROFILING_REPORT_DIR 에 저장하고, 응답 헤더에 요약을 붙인다.
+    cProfile 은 스레드 단위라 async view 요청은 쿼리 정보만 기록한다.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.should_profile(request):
+            return self.get_response(request)
+        started = time.perf_counter()
+        stats, token = start_query_stats(record_queries=True)
+        profiler = start_profiler()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+            stop_query_stats(token)
+        self.report(request, response, time.perf_counter() - started, stats, profiler)
+        return response
+
+    async def __acall__(self, request):
+        if not self.should_profile(request):
+            return await self.get_response(request)
+        started = time.perf_counter()
+        stats, token = start_query_stats(record_queries=True)
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_query_stats(token)
+        await sync_to_async(self.report)(request, response, time.perf_counter() - started, stats)
+        return response
+
+    def should_profile(self, request):
+        token = getattr(settings, 'PROFILING_TOKEN', None)
+        header = request.headers.get('X-Profile')
+        if token and header and constant_time_compare(header, token):
+            return True
+        return getattr(settings, 'PROFILING_ENABLED', False) and \
+            random.random() < getattr(settings, 'PROFILING_SAMPLE_RATE', 1.0)
+
+    def report(self, request, response, duration, stats, profiler=None):
+        response['X-Profile-Queries'] = str(stats.count)
+        response['X-Profile-DB-Time'] = f'{stats.duration:.6f}'
+        try:
+            path = write_report(build_report(request, response, duration, stats, profiler))
+        except Exception as e:
+            # 리포트 저장 실패가 응답을 막지 않도록 한다
+            logger.error(f"프로파일링 리포트 저장 실패 ({request.path}): {str(e)}")
+            return
+        response['X-Profile-Report'] = os.path.basename(path)
@@ -0,0 +1,81 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Stock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('isin_code', models.CharField(max_length=50, verbose_name='ISIN 코드')),
+                ('srtn_code', models.CharField(max_length=50, verbose_name='단축 코드')),
+                ('itms_name', models.CharField(max_length=50, verbose_name='종목 명')),
+                ('mrkt_cls', models.CharField(default='Unknown', max_length=50, verbose_name='시장 구분')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='WeeklyRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='WeeklyRecommendationStockTestResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('profit', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('test_start_date', models.DateField(null=True, verbose_name='테스트 시작 날짜')),
+                ('test_end_date', models.DateField(null=True, verbose_name='테스트 종료 날짜')),
+                ('test_starting_cash', models.IntegerField(null=True, verbose_name='테스트 시작 자본금')),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='stocks.stock')),
+                ('weekly_recommendation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='stocks.weeklyrecommendation')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='WeeklyRecommendationStockPredictResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(max_length=50)),
+                ('target_date', models.DateField()),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='stocks.stock')),
+                ('weekly_recommendation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='stocks.weeklyrecommendation')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='WeeklyRecommendationStock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='stocks.stock')),
+                ('weekly_recommendation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='stocks.weeklyrecommendation')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyStockData',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bas_dt', models.DateField(verbose_name='기준일자')),
+                ('clpr', models.IntegerField(verbose_name='종가')),
+                ('hipr', models.IntegerField(verbose_name='고가')),
+                ('lopr', models.IntegerField(verbose_name='저가')),
+                ('mkp', models.IntegerField(verbose_name='시가')),
+                ('vs', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='대비')),
+                ('flt_rt', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='등락률')),
+                ('trqu', models.BigIntegerField(verbose_name='거래량')),
+                ('tr_prc', models.DecimalField(decimal_places=2, max_digits=20, verbose_name='거래대금')),
+                ('lstg_st_cnt', models.BigIntegerField(verbose_name='상장주식수')),
+                ('mrkt_tot_amt', models.BigIntegerField(verbose_name='시가총액')),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='stocks.stock', verbose_name='종목')),
+            ],
+        ),
+    ]
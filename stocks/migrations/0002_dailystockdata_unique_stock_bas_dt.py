@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:48
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def delete_duplicate_daily_stock_data(apps, schema_editor):
+    """
+    (stock, bas_dt) 가 같은 행은 마지막에 저장된 행 (id 가 가장 큰 행) 만 남긴다
+    """
+    DailyStockData = apps.get_model('stocks', 'DailyStockData')
+    duplicates = DailyStockData.objects.values('stock_id', 'bas_dt').annotate(
+        count=Count('id'), keep_id=Max('id')).filter(count__gt=1)
+    for row in duplicates.iterator():
+        DailyStockData.objects.filter(stock_id=row['stock_id'], bas_dt=row['bas_dt']).exclude(
+            id=row['keep_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_daily_stock_data, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='dailystockdata',
+            constraint=models.UniqueConstraint(fields=('stock', 'bas_dt'), name='unique_daily_stock_data_stock_bas_dt'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:49
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def merge_duplicate_stocks(apps, schema_editor):
+    """
+    isin_code 가 같은 종목은 먼저 저장된 종목 (id 가 가장 작은 종목) 으로 합친다
+    다른 종목의 일자별 데이터 / 추천 / 테스트 / 예측 결과는 남길 종목으로 옮기고,
+    남길 종목에 이미 있는 기준일자의 일자별 데이터는 (stock, bas_dt) 유니크 제약 때문에 버린다.
+    (추천 / 예측 결과의 중복은 이후 유니크 제약을 추가하는 migration 에서 정리한다)
+    """
+    if schema_editor.connection.vendor == 'postgresql':
+        # 종목 삭제로 쌓인 지연 FK 검사가 남아 있으면 같은 transaction 의 ALTER TABLE 이 실패한다 (pending trigger events)
+        schema_editor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+    Stock = apps.get_model('stocks', 'Stock')
+    DailyStockData = apps.get_model('stocks', 'DailyStockData')
+    related_models = [
+        apps.get_model('stocks', 'WeeklyRecommendationStock'),
+        apps.get_model('stocks', 'WeeklyRecommendationStockTestResult'),
+        apps.get_model('stocks', 'WeeklyRecommendationStockPredictResult'),
+    ]
+
+    duplicates = Stock.objects.values('isin_code').annotate(count=Count('id'), keep_id=Min('id')).filter(count__gt=1)
+    for row in duplicates.iterator():
+        duplicate_ids = list(Stock.objects.filter(isin_code=row['isin_code']).exclude(
+            id=row['keep_id']).values_list('id', flat=True))
+        for duplicate_id in duplicate_ids:
+            DailyStockData.objects.filter(
+                stock_id=duplicate_id,
+                bas_dt__in=DailyStockData.objects.filter(stock_id=row['keep_id']).values('bas_dt'),
+            ).delete()
+            DailyStockData.objects.filter(stock_id=duplicate_id).update(stock_id=row['keep_id'])
+        for model in related_models:
+            model.objects.filter(stock_id__in=duplicate_ids).update(stock_id=row['keep_id'])
+        Stock.objects.filter(id__in=duplicate_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0002_dailystockdata_unique_stock_bas_dt'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_stocks, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='stock',
+            name='isin_code',
+            field=models.CharField(max_length=50, unique=True, verbose_name='ISIN 코드'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0003_stock_isin_code_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='weeklyrecommendationstocktestresult',
+            name='profit_std',
+            field=models.DecimalField(decimal_places=2, max_digits=10, null=True, verbose_name='profit 표준편차'),
+        ),
+        migrations.AddField(
+            model_name='weeklyrecommendationstocktestresult',
+            name='test_runs',
+            field=models.IntegerField(null=True, verbose_name='테스트 실행 횟수'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0004_testresult_profit_std_test_runs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=50, verbose_name='작업 종류')),
+                ('status', models.CharField(choices=[('queued', '대기'), ('running', '실행 중'), ('succeeded', '성공'), ('failed', '실패')], default='queued', max_length=20, verbose_name='상태')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='작업 인자')),
+                ('idempotency_key', models.CharField(blank=True, max_length=100, null=True, unique=True, verbose_name='멱등성 키')),
+                ('progress', models.IntegerField(default=0, verbose_name='진행량')),
+                ('progress_total', models.IntegerField(blank=True, null=True, verbose_name='전체 작업량')),
+                ('message', models.CharField(blank=True, default='', max_length=255, verbose_name='진행 메시지')),
+                ('result', models.JSONField(blank=True, null=True, verbose_name='결과')),
+                ('error', models.TextField(blank=True, default='', verbose_name='오류')),
+                ('attempts', models.IntegerField(default=0, verbose_name='실행 횟수')),
+                ('worker', models.CharField(blank=True, default='', max_length=100, verbose_name='실행 worker')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'id'], name='job_status_id_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:51
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min
+
+
+def check_constraints_immediately(schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        # 행 삭제 / FK 변경으로 쌓인 지연 FK 검사가 남아 있으면 같은 transaction 의 ALTER TABLE 이 실패한다 (pending trigger events)
+        schema_editor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+
+def merge_duplicate_weekly_recommendations(apps, schema_editor):
+    """
+    start_date 가 같은 주차는 먼저 만든 주차 (id 가 가장 작은 주차) 로 합친다
+    추천 종목 / 테스트 / 예측 결과는 남길 주차로 옮긴다. (옮기면서 생긴 중복은 다음 단계에서 정리)
+    """
+    check_constraints_immediately(schema_editor)
+    WeeklyRecommendation = apps.get_model('stocks', 'WeeklyRecommendation')
+    related_models = [
+        apps.get_model('stocks', 'WeeklyRecommendationStock'),
+        apps.get_model('stocks', 'WeeklyRecommendationStockTestResult'),
+        apps.get_model('stocks', 'WeeklyRecommendationStockPredictResult'),
+    ]
+
+    duplicates = WeeklyRecommendation.objects.values('start_date').annotate(
+        count=Count('id'), keep_id=Min('id')).filter(count__gt=1)
+    for row in duplicates.iterator():
+        duplicate_ids = list(WeeklyRecommendation.objects.filter(start_date=row['start_date']).exclude(
+            id=row['keep_id']).values_list('id', flat=True))
+        for model in related_models:
+            model.objects.filter(weekly_recommendation_id__in=duplicate_ids).update(
+                weekly_recommendation_id=row['keep_id'])
+        WeeklyRecommendation.objects.filter(id__in=duplicate_ids).delete()
+
+
+def delete_duplicate_weekly_recommendation_stocks(apps, schema_editor):
+    """
+    (주차, 종목) 이 같은 추천 종목은 먼저 저장된 행만 남긴다
+    """
+    check_constraints_immediately(schema_editor)
+    WeeklyRecommendationStock = apps.get_model('stocks', 'WeeklyRecommendationStock')
+    duplicates = WeeklyRecommendationStock.objects.values('weekly_recommendation_id', 'stock_id').annotate(
+        count=Count('id'), keep_id=Min('id')).filter(count__gt=1)
+    for row in duplicates.iterator():
+        WeeklyRecommendationStock.objects.filter(
+            weekly_recommendation_id=row['weekly_recommendation_id'], stock_id=row['stock_id']).exclude(
+            id=row['keep_id']).delete()
+
+
+def delete_duplicate_predict_results(apps, schema_editor):
+    """
+    (종목, 주차, 예측일) 이 같은 예측 결과는 마지막에 저장된 행 (id 가 가장 큰 행) 만 남긴다
+    """
+    check_constraints_immediately(schema_editor)
+    WeeklyRecommendationStockPredictResult = apps.get_model('stocks', 'WeeklyRecommendationStockPredictResult')
+    duplicates = WeeklyRecommendationStockPredictResult.objects.values(
+        'stock_id', 'weekly_recommendation_id', 'target_date').annotate(
+        count=Count('id'), keep_id=Max('id')).filter(count__gt=1)
+    for row in duplicates.iterator():
+        WeeklyRecommendationStockPredictResult.objects.filter(
+            stock_id=row['stock_id'], weekly_recommendation_id=row['weekly_recommendation_id'],
+            target_date=row['target_date']).exclude(id=row['keep_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0005_job'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='weeklyrecommendationstockpredictresult',
+            index=models.Index(fields=['stock', '-target_date'], include=('action',), name='predict_result_stock_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='weeklyrecommendationstocktestresult',
+            index=models.Index(fields=['stock', 'weekly_recommendation', '-id'], name='test_result_stock_week_id_idx'),
+        ),
+        migrations.RunPython(merge_duplicate_weekly_recommendations, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='weeklyrecommendation',
+            constraint=models.UniqueConstraint(fields=('start_date',), name='unique_weekly_recommendation_start_date'),
+        ),
+        migrations.RunPython(delete_duplicate_weekly_recommendation_stocks, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='weeklyrecommendationstock',
+            constraint=models.UniqueConstraint(fields=('weekly_recommendation', 'stock'), name='unique_weekly_recommendation_stock'),
+        ),
+        migrations.RunPython(delete_duplicate_predict_results, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='weeklyrecommendationstockpredictresult',
+            constraint=models.UniqueConstraint(fields=('stock', 'weekly_recommendation', 'target_date'), name='unique_predict_result_stock_week_target_date'),
+        ),
+    ]
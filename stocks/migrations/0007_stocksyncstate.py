@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0006_hot_path_indexes_constraints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockSyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_bas_dt', models.DateField(blank=True, null=True, verbose_name='마지막 저장 기준일자')),
+                ('backfilled_from', models.DateField(blank=True, null=True, verbose_name='백필 시작일자')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('stock', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='sync_state', to='stocks.stock', verbose_name='종목')),
+            ],
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0007_stocksyncstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MarketHoliday',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True, verbose_name='휴장일')),
+                ('name', models.CharField(blank=True, default='', max_length=50, verbose_name='휴장 사유')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='dailystockdata',
+            index=models.Index(fields=['bas_dt'], name='daily_stock_data_bas_dt_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0008_marketholiday'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeeklyRecommendationSnapshot',
+            fields=[
+                ('weekly_recommendation', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='snapshot', serialize=False, to='stocks.weeklyrecommendation')),
+                ('start_date', models.DateField(db_index=True, verbose_name='주차 시작일')),
+                ('stock_count', models.IntegerField(default=0, verbose_name='종목 수')),
+                ('payload', models.BinaryField(verbose_name='응답 (row 포맷, gzip JSON)')),
+                ('columnar_payload', models.BinaryField(verbose_name='응답 (columnar 포맷, gzip JSON)')),
+                ('etag', models.CharField(max_length=64, verbose_name='ETag')),
+                ('data_version', models.IntegerField(blank=True, null=True, verbose_name='생성 시점 데이터 버전')),
+                ('built_at', models.DateTimeField(verbose_name='생성 시각')),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0009_weeklyrecommendationsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='weeklyrecommendationstocktestresult',
+            name='backend',
+            field=models.CharField(blank=True, default='', max_length=20, verbose_name='테스트 backend'),
+        ),
+        migrations.AddField(
+            model_name='weeklyrecommendationstocktestresult',
+            name='max_drawdown',
+            field=models.DecimalField(decimal_places=2, max_digits=10, null=True, verbose_name='평균 최대 낙폭(%)'),
+        ),
+    ]
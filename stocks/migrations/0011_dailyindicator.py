@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0010_testresult_max_drawdown_backend'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='weeklyrecommendationsnapshot',
+            name='indicators_columnar_payload',
+            field=models.BinaryField(default=b'', verbose_name='응답 (columnar 포맷 + 기술적 지표, gzip JSON)'),
+        ),
+        migrations.AddField(
+            model_name='weeklyrecommendationsnapshot',
+            name='indicators_payload',
+            field=models.BinaryField(default=b'', verbose_name='응답 (row 포맷 + 기술적 지표, gzip JSON)'),
+        ),
+        migrations.CreateModel(
+            name='DailyIndicator',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bas_dt', models.DateField(verbose_name='기준일자')),
+                ('ma5', models.DecimalField(decimal_places=2, max_digits=14, null=True, verbose_name='5일 이동평균')),
+                ('ma20', models.DecimalField(decimal_places=2, max_digits=14, null=True, verbose_name='20일 이동평균')),
+                ('ma60', models.DecimalField(decimal_places=2, max_digits=14, null=True, verbose_name='60일 이동평균')),
+                ('rsi14', models.DecimalField(decimal_places=2, max_digits=5, null=True, verbose_name='14일 RSI')),
+                ('volatility20', models.DecimalField(decimal_places=2, max_digits=8, null=True, verbose_name='20일 연환산 변동성(%)')),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='stocks.stock')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='dailyindicator',
+            constraint=models.UniqueConstraint(fields=('stock', 'bas_dt'), name='unique_daily_indicator_stock_bas_dt'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:51
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0011_dailyindicator'),
+    ]
+
+    operations = [
+        # gin_trgm_ops 연산자 클래스 (CREATE EXTENSION IF NOT EXISTS pg_trgm, PostgreSQL 에서만 실행)
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='stock',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['itms_name'], name='stock_itms_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='stock',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['srtn_code'], name='stock_srtn_code_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0012_stock_trgm_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stock',
+            name='itms_name_chosung',
+            field=models.CharField(blank=True, default='', max_length=50, verbose_name='종목 명 초성'),
+        ),
+        migrations.AddField(
+            model_name='stock',
+            name='itms_name_jamo',
+            field=models.CharField(blank=True, default='', max_length=250, verbose_name='종목 명 자모'),
+        ),
+    ]
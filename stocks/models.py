@@ -1,12 +1,23 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 
 
 # 주식 종목
 class Stock(models.Model):
-    isin_code = models.CharField(max_length=50, verbose_name="ISIN 코드")
+    isin_code = models.CharField(max_length=50, unique=True, verbose_name="ISIN 코드")
     srtn_code = models.CharField(max_length=50, verbose_name="단축 코드")
     itms_name = models.CharField(max_length=50, verbose_name="종목 명")
     mrkt_cls = models.CharField(max_length=50, verbose_name="시장 구분", default="Unknown")
+    # 종목 명 검색용 (종목 마스터 동기화 시 stocks.search.stock_name_keys 로 채움)
+    itms_name_jamo = models.CharField(max_length=250, blank=True, default="", verbose_name="종목 명 자모")
+    itms_name_chosung = models.CharField(max_length=50, blank=True, default="", verbose_name="종목 명 초성")
+
+    class Meta:
+        indexes = [
+            # 종목 명 / 단축 코드 부분 일치 검색 (admin 검색, autocomplete 의 ILIKE '%q%') 용 trigram 인덱스 (pg_trgm 필요)
+            GinIndex(fields=['itms_name'], opclasses=['gin_trgm_ops'], name='stock_itms_name_trgm_idx'),
+            GinIndex(fields=['srtn_code'], opclasses=['gin_trgm_ops'], name='stock_srtn_code_trgm_idx'),
+        ]
 
     def __str__(self):
         return self.itms_name
@@ -31,15 +42,77 @@ class DailyStockData(models.Model):
         verbose_name="종목",
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['stock', 'bas_dt'], name='unique_daily_stock_data_stock_bas_dt'),
+        ]
+        indexes = [
+            # 거래일 달력(distinct bas_dt), 날짜 구간 조회용
+            models.Index(fields=['bas_dt'], name='daily_stock_data_bas_dt_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.stock} - {self.bas_dt}"
+
+
+# 종목 일별 기술적 지표 (DailyStockData 수집 후 배치로 계산)
+class DailyIndicator(models.Model):
+    stock = models.ForeignKey(
+        Stock,
+        on_delete=models.CASCADE,
+    )
+    bas_dt = models.DateField(verbose_name="기준일자")
+    ma5 = models.DecimalField(max_digits=14, decimal_places=2, null=True, verbose_name="5일 이동평균")
+    ma20 = models.DecimalField(max_digits=14, decimal_places=2, null=True, verbose_name="20일 이동평균")
+    ma60 = models.DecimalField(max_digits=14, decimal_places=2, null=True, verbose_name="60일 이동평균")
+    rsi14 = models.DecimalField(max_digits=5, decimal_places=2, null=True, verbose_name="14일 RSI")
+    volatility20 = models.DecimalField(max_digits=8, decimal_places=2, null=True, verbose_name="20일 연환산 변동성(%)")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['stock', 'bas_dt'], name='unique_daily_indicator_stock_bas_dt'),
+        ]
+
     def __str__(self):
         return f"{self.stock} - {self.bas_dt}"
 
 
+# 휴장일 (KRX)
+class MarketHoliday(models.Model):
+    date = models.DateField(unique=True, verbose_name="휴장일")
+    name = models.CharField(max_length=50, blank=True, default="", verbose_name="휴장 사유")
+
+    def __str__(self):
+        return f"{self.date} {self.name}"
+
+
+# 종목별 일별 데이터 동기화 상태
+class StockSyncState(models.Model):
+    stock = models.OneToOneField(
+        Stock,
+        on_delete=models.CASCADE,
+        related_name='sync_state',
+        verbose_name="종목",
+    )
+    last_bas_dt = models.DateField(null=True, blank=True, verbose_name="마지막 저장 기준일자")  # high-water mark
+    backfilled_from = models.DateField(null=True, blank=True, verbose_name="백필 시작일자")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.stock} - {self.last_bas_dt}"
+
+
 # 주차별 추천
 class WeeklyRecommendation(models.Model):
     start_date = models.DateField(null=False)
     end_date = models.DateField(null=False)
 
+    class Meta:
+        constraints = [
+            # latest('start_date') 조회용 인덱스를 겸함
+            models.UniqueConstraint(fields=['start_date'], name='unique_weekly_recommendation_start_date'),
+        ]
+
     def __str__(self):
         return f"{self.start_date} - {self.end_date}"
 
@@ -55,12 +128,21 @@ class WeeklyRecommendationStock(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['weekly_recommendation', 'stock'], name='unique_weekly_recommendation_stock'),
+        ]
+
     def __str__(self):
         return f"{self.stock} - {self.weekly_recommendation}"
 
 
 class WeeklyRecommendationStockTestResult(models.Model):
     profit = models.DecimalField(max_digits=10, decimal_places=2)
+    profit_std = models.DecimalField(max_digits=10, decimal_places=2, null=True, verbose_name="profit 표준편차")
+    test_runs = models.IntegerField(null=True, verbose_name="테스트 실행 횟수")
+    max_drawdown = models.DecimalField(max_digits=10, decimal_places=2, null=True, verbose_name="평균 최대 낙폭(%)")
+    backend = models.CharField(max_length=20, blank=True, default="", verbose_name="테스트 backend")
     test_start_date = models.DateField(null=True, verbose_name="테스트 시작 날짜")
     test_end_date = models.DateField(null=True, verbose_name="테스트 종료 날짜")
     test_starting_cash = models.IntegerField(null=True, verbose_name="테스트 시작 자본금")
@@ -73,6 +155,12 @@ class WeeklyRecommendationStockTestResult(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        indexes = [
+            # 주식/주차별 최신 테스트 결과 (order_by('-id').first())
+            models.Index(fields=['stock', 'weekly_recommendation', '-id'], name='test_result_stock_week_id_idx'),
+        ]
+
     def __str__(self):
         return f"{self.stock} - {self.weekly_recommendation}"
 
@@ -89,5 +177,87 @@ class WeeklyRecommendationStockPredictResult(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['stock', 'weekly_recommendation', 'target_date'],
+                                    name='unique_predict_result_stock_week_target_date'),
+        ]
+        indexes = [
+            # 주식별 최신 예측 결과 (order_by('-target_date').first()), action 까지 인덱스만으로 조회
+            models.Index(fields=['stock', '-target_date'], include=['action'], name='predict_result_stock_date_idx'),
+        ]
+
     def __str__(self):
-        return f"{self.stock} - {self.weekly_recommendation}"
\ No newline at end of file
+        return f"{self.stock} - {self.weekly_recommendation}"
+
+
+# 최신 주차 조회 API 응답 스냅샷 (주차별로 미리 직렬화해 gzip 으로 저장)
+class WeeklyRecommendationSnapshot(models.Model):
+    weekly_recommendation = models.OneToOneField(
+        WeeklyRecommendation,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='snapshot',
+    )
+    start_date = models.DateField(db_index=True, verbose_name="주차 시작일")  # 최신 스냅샷 조회용 (join 없이)
+    stock_count = models.IntegerField(default=0, verbose_name="종목 수")
+    payload = models.BinaryField(verbose_name="응답 (row 포맷, gzip JSON)")
+    columnar_payload = models.BinaryField(verbose_name="응답 (columnar 포맷, gzip JSON)")
+    indicators_payload = models.BinaryField(default=b'', verbose_name="응답 (row 포맷 + 기술적 지표, gzip JSON)")
+    indicators_columnar_payload = models.BinaryField(
+        default=b'', verbose_name="응답 (columnar 포맷 + 기술적 지표, gzip JSON)")
+    etag = models.CharField(max_length=64, verbose_name="ETag")
+    data_version = models.IntegerField(null=True, blank=True, verbose_name="생성 시점 데이터 버전")
+    built_at = models.DateTimeField(verbose_name="생성 시각")
+
+    def __str__(self):
+        return f"{self.weekly_recommendation} ({self.built_at})"
+
+
+# 비동기 작업 (DB 기반 작업 큐)
+class Job(models.Model):
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "대기"),
+        (STATUS_RUNNING, "실행 중"),
+        (STATUS_SUCCEEDED, "성공"),
+        (STATUS_FAILED, "실패"),
+    ]
+
+    kind = models.CharField(max_length=50, verbose_name="작업 종류")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED, verbose_name="상태")
+    payload = models.JSONField(default=dict, blank=True, verbose_name="작업 인자")
+    idempotency_key = models.CharField(max_length=100, unique=True, null=True, blank=True, verbose_name="멱등성 키")
+    progress = models.IntegerField(default=0, verbose_name="진행량")
+    progress_total = models.IntegerField(null=True, blank=True, verbose_name="전체 작업량")
+    message = models.CharField(max_length=255, blank=True, default="", verbose_name="진행 메시지")
+    result = models.JSONField(null=True, blank=True, verbose_name="결과")
+    error = models.TextField(blank=True, default="", verbose_name="오류")
+    attempts = models.IntegerField(default=0, verbose_name="실행 횟수")
+    worker = models.CharField(max_length=100, blank=True, default="", verbose_name="실행 worker")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'id'], name='job_status_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.id} ({self.status})"
+
+    def report_progress(self, progress, progress_total=None, message=None):
+        """
+        진행 상황을 바로 DB 에 반영 (worker 실행 중 폴링하는 클라이언트가 볼 수 있도록)
+        """
+        self.progress = progress
+        if progress_total is not None:
+            self.progress_total = progress_total
+        if message is not None:
+            self.message = message[:255]
+        Job.objects.filter(pk=self.pk).update(
+            progress=self.progress, progress_total=self.progress_total, message=self.message)
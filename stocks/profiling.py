@@ -0,0 +1,116 @@
+"""
+요청 단위 프로파일링 리포트
+요청마다 DB 쿼리 수 / 시간, 같은 쿼리가 반복된 fingerprint (N+1 의심), cProfile 상위 함수를 모아
+PROFILING_REPORT_DIR 에 JSON 파일로 저장한다. (ProfilingMiddleware 가 켜진 요청만)
+profile_report management command 로 URL name 별 DB 시간 순위를 볼 수 있다.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import time
+import uuid
+
+from django.conf import settings
+from django.utils import timezone
+
+PROFILE_TOP_FUNCTIONS = 30
+DUPLICATE_QUERY_THRESHOLD = 2
+
+# 리터럴을 ? 로 바꿔 값만 다른 쿼리를 같은 fingerprint 로 묶는다
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_PARAM_RE = re.compile(r'%s|\$\d+')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """
+    SELECT ... WHERE "stock_id" = 12 AND "bas_dt" IN ('2024-01-02', '2024-01-03')
+    -> SELECT ... WHERE "stock_id" = ? AND "bas_dt" IN (?)
+    """
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = _PARAM_RE.sub('?', sql)
+    sql = _IN_LIST_RE.sub('(?)', sql)
+    return _SPACE_RE.sub(' ', sql).strip()
+
+
+def duplicate_queries(queries, threshold=DUPLICATE_QUERY_THRESHOLD):
+    """
+    [(sql, 시간)] 에서 threshold 번 이상 반복된 fingerprint 를 [{fingerprint, count, time}] (반복 횟수 순) 으로 반환
+    """
+    groups = {}
+    for sql, elapsed in queries:
+        group = groups.setdefault(fingerprint(sql), [0, 0.0])
+        group[0] += 1
+        group[1] += elapsed
+    return [
+        {'fingerprint': key, 'count': count, 'time': round(total, 6)}
+        for key, (count, total) in sorted(groups.items(), key=lambda item: (-item[1][0], -item[1][1]))
+        if count >= threshold
+    ]
+
+
+def profile_stats(profiler, limit=PROFILE_TOP_FUNCTIONS):
+    """
+    cProfile 결과의 누적 시간 상위 함수 (pstats 텍스트)
+    """
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).strip_dirs().sort_stats('cumulative').print_stats(limit)
+    return stream.getvalue()
+
+
+def build_report(request, response, duration, query_stats, profiler=None):
+    resolver_match = getattr(request, 'resolver_match', None)
+    return {
+        'timestamp': timezone.now().isoformat(),
+        'method': request.method,
+        'path': request.get_full_path(),
+        'url_name': resolver_match.url_name if resolver_match and resolver_match.url_name else 'unmatched',
+        'status': response.status_code,
+        'duration': round(duration, 6),
+        'query_count': query_stats.count,
+        'db_time': round(query_stats.duration, 6),
+        'duplicate_queries': duplicate_queries(query_stats.queries or []),
+        'queries': [{'sql': sql, 'time': round(elapsed, 6)} for sql, elapsed in query_stats.queries or []],
+        'profile': profile_stats(profiler) if profiler is not None else None,
+    }
+
+
+def get_report_dir():
+    return getattr(settings, 'PROFILING_REPORT_DIR', None) or os.path.join(settings.BASE_DIR, 'profiles')
+
+
+def write_report(report, directory=None):
+    """
+    <url_name>-<시각>-<id>.json 으로 저장하고 경로 반환
+    """
+    directory = directory or get_report_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{report['url_name']}-{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    return path
+
+
+def load_reports(directory=None):
+    directory = directory or get_report_dir()
+    if not os.path.isdir(directory):
+        return []
+    reports = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.json'):
+            continue
+        with open(os.path.join(directory, name), encoding='utf-8') as f:
+            reports.append(json.load(f))
+    return reports
+
+
+def start_profiler():
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
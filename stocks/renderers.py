@@ -0,0 +1,65 @@
+from decimal import Decimal
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # orjson 이 없으면 DRF 기본 JSON 인코더 사용
+    orjson = None
+
+
+def _orjson_default(obj):
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    orjson 으로 인코딩하는 JSONRenderer (orjson 이 설치되지 않은 경우 기본 JSONRenderer 와 동일)
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ColumnarJSONRenderer(ORJSONRenderer):
+    """
+    row 객체 배열 대신 필드별 배열로 응답하는 포맷
+    ?format=columnar 또는 Accept: application/vnd.stopickr.columnar+json 으로 선택한다.
+    """
+    media_type = 'application/vnd.stopickr.columnar+json'
+    format = 'columnar'
+
+
+class StreamingExportRenderer(BaseRenderer):
+    """
+    내보내기 포맷 선택(?format= / Accept 헤더)용 renderer
+    본문은 view 가 StreamingHttpResponse 로 직접 만들며, 오류 응답은 JSON 으로 렌더링한다.
+    """
+    charset = None
+    file_extension = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        raise NotImplementedError("내보내기 본문은 StreamingHttpResponse 로 응답합니다.")
+
+
+class NDJSONRenderer(StreamingExportRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    file_extension = 'ndjson'
+
+
+class CSVRenderer(StreamingExportRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+    file_extension = 'csv'
+
+
+class ParquetRenderer(StreamingExportRenderer):
+    media_type = 'application/vnd.apache.parquet'
+    format = 'parquet'
+    file_extension = 'parquet'
@@ -0,0 +1,181 @@
+"""
+종목 검색 / 자동완성
+종목 마스터(약 2,800 종목)를 프로세스 메모리에 정렬 배열로 올려 두고 bisect 로 검색한다.
+- 단축 코드 / ISIN 코드: 접두어 일치
+- 종목 명: 접두어 일치 + 부분 일치 (종목 명의 모든 접미사를 정렬한 suffix array 에서 접두어를 찾음)
+- 한글: 초성 (ㅅㅅㅈㅈ), 입력 중인 글자 (삼성저), 초성 / 음절 혼합 (삼ㅅ전ㅈ) 검색
+  종목 명 초성 문자열의 bigram 역색인으로 후보를 고른 뒤 글자 단위로 확인한다.
+종목 마스터가 동기화되면 invalidate_stock_search_index() 로 모든 프로세스의 인덱스를 다시 만들게 한다.
+"""
+import heapq
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from collections import namedtuple
+
+from stocks.cache import get_cache
+from stocks.hangul import CONJOINING_CHOSUNG, HANGUL_CONSONANTS, chosung, decompose, decompose_char, is_jamo, is_syllable
+from stocks.models import Stock
+
+SEARCH_INDEX_VERSION_KEY = 'stocks:search_index_version'
+# 캐시 백엔드가 프로세스별 local memory 인 경우에도 다른 프로세스의 동기화가 반영되도록 주기적으로 다시 만든다
+SEARCH_INDEX_MAX_AGE = 60 * 60
+
+SEARCH_DEFAULT_LIMIT = 10
+SEARCH_MAX_LIMIT = 50
+
+StockSearchEntry = namedtuple('StockSearchEntry', ['id', 'isin_code', 'srtn_code', 'itms_name', 'mrkt_cls'])
+
+# 순위: 코드/종목 명 완전 일치 > 코드 접두어 > 종목 명 접두어 > 종목 명 부분 일치 > 초성/자모 접두어 > 초성/자모 부분 일치
+RANK_EXACT = 0
+RANK_CODE_PREFIX = 1
+RANK_NAME_PREFIX = 2
+RANK_NAME_SUBSTRING = 3
+RANK_CHOSUNG_PREFIX = 4
+RANK_CHOSUNG_SUBSTRING = 5
+
+CHOSUNG_NGRAM = 2
+
+
+def normalize(text):
+    """
+    검색 키 정규화 (NFC 로 한글 자모 조합을 맞추고, 대소문자 / 공백 무시, 조합형 초성은 호환 자모로)
+    """
+    text = ''.join(unicodedata.normalize('NFC', text or '').split()).casefold()
+    return ''.join(CONJOINING_CHOSUNG.get(char, char) for char in text)
+
+
+def stock_name_keys(itms_name):
+    """
+    Stock.itms_name_jamo / itms_name_chosung 에 저장하는 (자모, 초성) 문자열 (정규화한 종목 명 기준)
+    """
+    name = normalize(itms_name)
+    return decompose(name), chosung(name)
+
+
+class StockSearchIndex:
+    def __init__(self, entries, chosungs=None):
+        self.entries = list(entries)
+        self.names = [normalize(entry.itms_name) for entry in self.entries]
+        # 종목 명 글자별 자모 / 초성 문자열 (초성은 Stock.itms_name_chosung 에 미리 계산된 값을 사용)
+        self.jamos = [[decompose_char(char) for char in name] for name in self.names]
+        self.chosungs = [
+            precomputed if precomputed and len(precomputed) == len(name) else chosung(name)
+            for name, precomputed in zip(self.names, chosungs or [None] * len(self.names))
+        ]
+        # 초성 n-gram (1 ~ CHOSUNG_NGRAM 글자) -> 종목 위치 set
+        self.chosung_postings = {}
+        for index, key in enumerate(self.chosungs):
+            for size in range(1, CHOSUNG_NGRAM + 1):
+                for offset in range(len(key) - size + 1):
+                    self.chosung_postings.setdefault(key[offset:offset + size], set()).add(index)
+        # (키, 종목 위치) 정렬 배열
+        self.codes = sorted(
+            (normalize(code), index)
+            for index, entry in enumerate(self.entries)
+            for code in (entry.srtn_code, entry.isin_code) if code
+        )
+        self.suffixes = sorted(
+            (name[offset:], index)
+            for index, name in enumerate(self.names)
+            for offset in range(len(name))
+        )
+
+    @classmethod
+    def build(cls):
+        rows = Stock.objects.order_by('id').values_list(*StockSearchEntry._fields, 'itms_name_chosung')
+        return cls([StockSearchEntry(*row[:-1]) for row in rows], [row[-1] for row in rows])
+
+    def search(self, query, limit=SEARCH_DEFAULT_LIMIT):
+        """
+        [(StockSearchEntry, 순위)] 반환 (순위, 종목 명 길이, 종목 명 순)
+        """
+        query = normalize(query)
+        if not query:
+            return []
+
+        ranks = {}
+        for code, index in self._prefix_range(self.codes, query):
+            ranks[index] = min(ranks.get(index, RANK_NAME_SUBSTRING), RANK_EXACT if code == query else RANK_CODE_PREFIX)
+        for suffix, index in self._prefix_range(self.suffixes, query):
+            name = self.names[index]
+            rank = RANK_EXACT if name == query else RANK_NAME_PREFIX if len(suffix) == len(name) else RANK_NAME_SUBSTRING
+            ranks[index] = min(ranks.get(index, rank), rank)
+        if any(is_syllable(char) or is_jamo(char) for char in query):
+            for index, rank in self._search_hangul(query):
+                ranks[index] = min(ranks.get(index, rank), rank)
+
+        ordered = heapq.nsmallest(limit, ranks, key=lambda index: (ranks[index], len(self.names[index]), self.names[index]))
+        return [(self.entries[index], ranks[index]) for index in ordered]
+
+    def _search_hangul(self, query):
+        """
+        초성 / 입력 중인 글자 / 혼합 검색어로 (종목 위치, 순위) 반환
+        검색어의 각 글자를 초성으로 바꾼 키가 종목 명 초성 문자열에 있어야 하므로, 키의 n-gram 을 모두 가진 종목만 확인한다.
+        """
+        key = chosung(query)
+        # 자음만 입력한 경우 초성 위치만 찾으면 된다
+        consonants_only = all(char in HANGUL_CONSONANTS for char in query)
+        grams = {key[offset:offset + CHOSUNG_NGRAM] for offset in range(len(key) - CHOSUNG_NGRAM + 1)} or {key}
+        postings = sorted((self.chosung_postings.get(gram, set()) for gram in grams), key=len)
+        for index in set.intersection(*postings) if postings[0] else ():
+            position = self.chosungs[index].find(key)
+            while position != -1:
+                if consonants_only or self._matches_at(query, index, position):
+                    yield index, RANK_CHOSUNG_PREFIX if position == 0 else RANK_CHOSUNG_SUBSTRING
+                    break
+                position = self.chosungs[index].find(key, position + 1)
+
+    def _matches_at(self, query, index, position):
+        # 초성이 같은 위치에서 글자 단위 확인 (자음은 초성 일치로 충분, 음절은 같아야 함)
+        name, jamos = self.names[index], self.jamos[index]
+        for offset, char in enumerate(query):
+            if char == name[position + offset] or (is_jamo(char) and char in HANGUL_CONSONANTS):
+                continue
+            if is_syllable(char) and offset == len(query) - 1:
+                # 입력 중인 마지막 글자: 자모가 접두어면 일치 (받침이 다음 글자의 초성이 되는 '삼성전' -> '삼성저녁' 포함)
+                return ''.join(jamos[position + offset:position + offset + 2]).startswith(decompose_char(char))
+            return False
+        return True
+
+    def _prefix_range(self, keys, query):
+        # query 로 시작하는 키는 정렬 배열에서 연속 구간을 이룬다
+        start = bisect_left(keys, (query,))
+        for position in range(start, len(keys)):
+            if not keys[position][0].startswith(query):
+                break
+            yield keys[position]
+
+
+_index = None
+_index_version = None
+_index_built_at = 0.0
+_index_lock = threading.Lock()
+
+
+def get_stock_search_index():
+    """
+    프로세스 단위로 캐시된 StockSearchIndex
+    """
+    global _index, _index_version, _index_built_at
+    version = get_cache().get(SEARCH_INDEX_VERSION_KEY)
+    if _index_is_stale(version):
+        with _index_lock:
+            # 기다리는 동안 다른 스레드가 이미 다시 만들었으면 그대로 사용
+            if _index_is_stale(version):
+                _index = StockSearchIndex.build()
+                _index_version = version
+                _index_built_at = time.monotonic()
+    return _index
+
+
+def _index_is_stale(version):
+    return _index is None or version != _index_version or time.monotonic() - _index_built_at > SEARCH_INDEX_MAX_AGE
+
+
+def invalidate_stock_search_index():
+    """
+    종목 마스터가 바뀌었을 때 호출해 모든 프로세스의 검색 인덱스를 다시 만들게 함
+    """
+    get_cache().set(SEARCH_INDEX_VERSION_KEY, time.time(), timeout=None)
@@ -24,6 +24,52 @@ class DailyStockDataSerializer(serializers.Serializer):
     mrkt_tot_amt = serializers.IntegerField()
 
 
+# DailyStockDataSerializer 와 같은 필드 순서 (values_list 용)
+DAILY_STOCK_DATA_FIELDS = (
+    'id', 'bas_dt', 'clpr', 'hipr', 'lopr', 'mkp', 'vs', 'flt_rt', 'trqu', 'tr_prc', 'lstg_st_cnt', 'mrkt_tot_amt',
+)
+DAILY_STOCK_DATA_DECIMAL_FIELDS = ('vs', 'flt_rt', 'tr_prc')
+
+
+def _daily_stock_data_converters():
+    # DailyStockDataSerializer 와 같은 표현 (날짜는 ISO 문자열, Decimal 은 소수점 2자리 문자열)
+    converters = []
+    for field in DAILY_STOCK_DATA_FIELDS:
+        if field == 'bas_dt':
+            converters.append(lambda value: value.isoformat())
+        elif field in DAILY_STOCK_DATA_DECIMAL_FIELDS:
+            converters.append(lambda value: format(value, '.2f'))
+        else:
+            converters.append(None)
+    return converters
+
+
+_DAILY_STOCK_DATA_CONVERTERS = _daily_stock_data_converters()
+
+
+def serialize_daily_stock_data_rows(rows):
+    """
+    values_list(*DAILY_STOCK_DATA_FIELDS) 튜플을 DailyStockDataSerializer(many=True) 와 같은 dict 목록으로 변환
+    """
+    fields = DAILY_STOCK_DATA_FIELDS
+    converters = _DAILY_STOCK_DATA_CONVERTERS
+    return [
+        dict(zip(fields, [value if convert is None else convert(value) for convert, value in zip(converters, row)]))
+        for row in rows
+    ]
+
+
+def serialize_daily_stock_data_columns(rows):
+    """
+    values_list(*DAILY_STOCK_DATA_FIELDS) 튜플을 필드별 배열({필드: [값, ...]})로 변환
+    """
+    columns = list(zip(*rows)) if rows else [()] * len(DAILY_STOCK_DATA_FIELDS)
+    return {
+        field: list(column) if convert is None else [convert(value) for value in column]
+        for field, convert, column in zip(DAILY_STOCK_DATA_FIELDS, _DAILY_STOCK_DATA_CONVERTERS, columns)
+    }
+
+
 class DailyStockDataWithStockSerializer(serializers.Serializer):
     isin_code = serializers.CharField(max_length=50)
     itms_name = serializers.CharField(max_length=50)
@@ -39,3 +85,17 @@ class WeeklyRecommendationStockSerializer(serializers.Serializer):
     weekly_stock_recommendation_id = serializers.IntegerField()
     stock_id = serializers.IntegerField()
 
+
+class JobSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    kind = serializers.CharField(max_length=50)
+    status = serializers.CharField(max_length=20)
+    progress = serializers.IntegerField()
+    progress_total = serializers.IntegerField(allow_null=True)
+    message = serializers.CharField(max_length=255)
+    result = serializers.JSONField(allow_null=True)
+    error = serializers.CharField()
+    attempts = serializers.IntegerField()
+    created_at = serializers.DateTimeField()
+    started_at = serializers.DateTimeField(allow_null=True)
+    finished_at = serializers.DateTimeField(allow_null=True)
@@ -0,0 +1,496 @@
+import math
+import logging
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+
+import numpy as np
+import requests
+from django.conf import settings
+from django.db import connection
+
+from stocks.cache import bump_data_version
+from stocks.search import invalidate_stock_search_index, stock_name_keys
+from stocks.timeseries import get_timeseries_store
+from stocks.trading_calendar import get_trading_calendar, invalidate_trading_calendar
+from stocks.clients import get_http_client
+from stocks.exceptions import ApiRequestFailureException, ApiResponseParseFailureException, \
+    HttpStatusCodeFailureException, TimeSeriesStoreDisabledException
+from stocks.models import Stock, DailyStockData, StockSyncState
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_DATA_STOCK_PRICE_URL = "http://apis.data.go.kr/1160100/service/GetStockSecuritiesInfoService/getStockPriceInfo"
+
+# 공공 데이터 포털 페이지 크기 / 동시 요청 수
+PUBLIC_DATA_NUM_OF_ROWS = 1000
+PUBLIC_DATA_MAX_WORKERS = 4
+
+
+# 공공 데이터 포털 응답 필드 -> DailyStockData 필드
+DAILY_STOCK_DATA_FIELD_MAP = {
+    'clpr': 'clpr',  # 종가
+    'hipr': 'hipr',  # 고가
+    'lopr': 'lopr',  # 저가
+    'mkp': 'mkp',  # 시가
+    'vs': 'vs',  # 대비
+    'fltRt': 'flt_rt',  # 등락률
+    'trqu': 'trqu',  # 거래량
+    'trPrc': 'tr_prc',  # 거래대금
+    'lstgStCnt': 'lstg_st_cnt',  # 상장주식수
+    'mrktTotAmt': 'mrkt_tot_amt',  # 시가총액
+}
+
+DAILY_STOCK_DATA_UPDATE_FIELDS = list(DAILY_STOCK_DATA_FIELD_MAP.values())
+
+DAILY_STOCK_DATA_BATCH_SIZE = 1000
+
+# 전체 시장 일별 데이터는 하루치(약 2,800 종목)를 한 번의 INSERT 로 저장
+MARKET_DAILY_STOCK_DATA_BATCH_SIZE = 5000
+MARKET_DAILY_STOCK_DATA_MAX_WORKERS = 4
+
+STOCK_SYNC_BATCH_SIZE = 500
+
+# 일별 데이터 동기화 모드
+SYNC_MODE_INCREMENTAL = 'incremental'  # 마지막 저장 기준일자 다음 날부터만 요청
+SYNC_MODE_BACKFILL = 'backfill'  # 조회 구간 전체를 다시 요청
+SYNC_MODES = (SYNC_MODE_INCREMENTAL, SYNC_MODE_BACKFILL)
+
+
+def build_daily_stock_data_rows(stock, items):
+    """
+    API item 목록을 저장되지 않은 DailyStockData 인스턴스 목록으로 변환
+    같은 기준일자가 여러 번 들어오면 마지막 값만 남긴다.
+    """
+    rows = {}
+    for item in items:
+        bas_dt = datetime.strptime(item.get('basDt'), '%Y%m%d').date()  # 기준일자
+        rows[bas_dt] = DailyStockData(stock=stock, bas_dt=bas_dt, **_daily_stock_data_fields(item))
+    return list(rows.values())
+
+
+def build_market_daily_stock_data_rows(items, stock_ids_by_isin_code):
+    """
+    여러 종목이 섞인 API item 목록을 DailyStockData 인스턴스 목록으로 변환
+    등록되지 않은 종목의 item 은 건너뛴다.
+    """
+    rows = {}
+    for item in items:
+        stock_id = stock_ids_by_isin_code.get(item.get('isinCd'))
+        if stock_id is None:
+            continue
+        bas_dt = datetime.strptime(item.get('basDt'), '%Y%m%d').date()  # 기준일자
+        rows[(stock_id, bas_dt)] = DailyStockData(stock_id=stock_id, bas_dt=bas_dt, **_daily_stock_data_fields(item))
+    return list(rows.values())
+
+
+def _daily_stock_data_fields(item):
+    return {model_field: item.get(api_field) for api_field, model_field in DAILY_STOCK_DATA_FIELD_MAP.items()}
+
+
+def bulk_upsert_daily_stock_data(rows, batch_size=DAILY_STOCK_DATA_BATCH_SIZE):
+    """
+    (stock, bas_dt) 유니크 제약을 기준으로 한 번의 INSERT ... ON CONFLICT DO UPDATE 로 저장
+    """
+    saved = DailyStockData.objects.bulk_create(
+        rows,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['stock', 'bas_dt'],
+        update_fields=DAILY_STOCK_DATA_UPDATE_FIELDS,
+    )
+    bump_data_version()
+    invalidate_trading_calendar()
+    return saved
+
+
+def sync_stocks(items, update_existing=True):
+    """
+    종목 마스터를 set 기반으로 동기화
+    기존 종목을 한 번에 읽어 들인 뒤 신규 종목은 bulk_create, 종목 명/시장 구분이 바뀐 종목은 bulk_update 한다.
+    종목 수와 관계없이 조회 1번 + 배치 단위 INSERT/UPDATE 만 실행된다.
+    종목 명 검색용 자모 / 초성 컬럼도 함께 채운다. (비어 있는 기존 종목도 갱신)
+    update_existing=False 면 없는 종목만 추가한다. (과거 날짜 item 으로 현재 종목 명 / 시장 구분을 덮어쓰지 않도록)
+    """
+    stocks = Stock.objects.all() if update_existing else Stock.objects.filter(
+        isin_code__in={item.get('isinCd') for item in items if item.get('isinCd')})
+    existing = {
+        isin_code: (stock_id, itms_name, mrkt_cls, name_keys)
+        for stock_id, isin_code, itms_name, mrkt_cls, *name_keys
+        in stocks.values_list('id', 'isin_code', 'itms_name', 'mrkt_cls', 'itms_name_jamo', 'itms_name_chosung')
+    }
+
+    new_stocks = {}
+    changed_stocks = []
+    for item in items:
+        isin_code = item.get('isinCd')
+        if not isin_code:
+            continue
+        itms_name = item.get('itmsNm')
+        mrkt_cls = item.get('mrktCtg', "Unknown")
+
+        itms_name_jamo, itms_name_chosung = stock_name_keys(itms_name)
+
+        if isin_code not in existing:
+            new_stocks[isin_code] = Stock(
+                isin_code=isin_code,
+                srtn_code=item.get('srtnCd'),
+                itms_name=itms_name,
+                mrkt_cls=mrkt_cls,
+                itms_name_jamo=itms_name_jamo,
+                itms_name_chosung=itms_name_chosung,
+            )
+            continue
+        if not update_existing:
+            continue
+
+        stock_id, old_itms_name, old_mrkt_cls, old_name_keys = existing[isin_code]
+        name_keys = [itms_name_jamo, itms_name_chosung]
+        if (old_itms_name, old_mrkt_cls, old_name_keys) != (itms_name, mrkt_cls, name_keys):
+            changed_stocks.append(Stock(id=stock_id, isin_code=isin_code, itms_name=itms_name, mrkt_cls=mrkt_cls,
+                                        itms_name_jamo=itms_name_jamo, itms_name_chosung=itms_name_chosung))
+            existing[isin_code] = (stock_id, itms_name, mrkt_cls, name_keys)
+
+    if new_stocks:
+        Stock.objects.bulk_create(new_stocks.values(), batch_size=STOCK_SYNC_BATCH_SIZE, ignore_conflicts=True)
+    if changed_stocks:
+        Stock.objects.bulk_update(changed_stocks, ['itms_name', 'mrkt_cls', 'itms_name_jamo', 'itms_name_chosung'],
+                                  batch_size=STOCK_SYNC_BATCH_SIZE)
+    if new_stocks or changed_stocks:
+        bump_data_version()
+        invalidate_stock_search_index()
+
+    return len(new_stocks), len(changed_stocks)
+
+
+def fetch_stock_price_items(params, num_of_rows=None, max_workers=None, url=None):
+    """
+    getStockPriceInfo 의 모든 페이지를 가져와 item 목록으로 반환
+    첫 페이지 응답의 totalCount 로 남은 페이지 수를 계산하고, 나머지 페이지는 스레드 풀에서 동시에 요청한다.
+    """
+    url = url or getattr(settings, 'PUBLIC_DATA_STOCK_PRICE_URL', PUBLIC_DATA_STOCK_PRICE_URL)
+    num_of_rows = num_of_rows or getattr(settings, 'PUBLIC_DATA_NUM_OF_ROWS', PUBLIC_DATA_NUM_OF_ROWS)
+    max_workers = max_workers or getattr(settings, 'PUBLIC_DATA_MAX_WORKERS', PUBLIC_DATA_MAX_WORKERS)
+
+    def fetch_page(page_no):
+        return _fetch_stock_price_page(url, params, page_no, num_of_rows)
+
+    total_count, items = fetch_page(1)
+    page_count = math.ceil(total_count / num_of_rows) if total_count else 0
+    if page_count <= 1:
+        return items
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, page_count - 1)) as executor:
+        # map 은 페이지 순서를 유지한다
+        for _, page_items in executor.map(fetch_page, range(2, page_count + 1)):
+            items.extend(page_items)
+    return items
+
+
+def _fetch_stock_price_page(url, params, page_no, num_of_rows):
+    """
+    getStockPriceInfo 한 페이지를 요청해 (totalCount, item 목록) 을 반환
+    """
+    query_string = urlencode({
+        "serviceKey": settings.PUBLIC_DATA_SECRET_KEY,
+        "resultType": "json",
+        **params,
+        "pageNo": page_no,
+        "numOfRows": num_of_rows,
+    }, safe='=')
+
+    try:
+        response = get_http_client().get(f"{url}?{query_string}")
+    except requests.exceptions.RequestException as e:
+        # 예외 메시지에는 serviceKey 가 포함된 요청 URL 이 들어 있으므로 오류 종류만 남긴다
+        raise ApiRequestFailureException(f"API 요청 실패: {type(e).__name__}")
+    if response.status_code != 200:
+        raise HttpStatusCodeFailureException()
+
+    try:
+        body = response.json().get('response', {}).get('body', {})
+        total_count = int(body.get('totalCount') or 0)
+        items = body.get('items') or {}
+        items = items.get('item', []) if isinstance(items, dict) else []
+        if isinstance(items, dict):  # 결과가 한 건이면 list 가 아닌 dict 로 내려온다
+            items = [items]
+    except Exception:
+        raise ApiResponseParseFailureException()
+
+    return total_count, items
+
+
+class RunningStats:
+    """
+    Welford 알고리즘으로 평균/분산을 누적 계산 (값을 리스트에 모으지 않음)
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        # 표본 분산 (값이 하나 이하면 0)
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+
+def get_sync_begin_date(sync_state, window_start_date, mode=SYNC_MODE_INCREMENTAL):
+    """
+    일별 데이터 요청 시작일과 백필 여부를 (시작일, 백필 여부) 로 반환
+    처음 추천된 종목처럼 조회 구간 전체가 백필되지 않은 경우에는 incremental 모드여도 백필한다.
+    """
+    if mode == SYNC_MODE_BACKFILL or sync_state is None or sync_state.backfilled_from is None \
+            or sync_state.backfilled_from > window_start_date:
+        return window_start_date, True
+    if sync_state.last_bas_dt is None:
+        return window_start_date, False
+    return max(sync_state.last_bas_dt + timedelta(days=1), window_start_date), False
+
+
+def record_stock_sync(stock, last_bas_dt=None, backfilled_from=None):
+    """
+    종목의 동기화 상태(high-water 기준일자, 백필 시작일자)를 갱신
+    """
+    sync_state, _ = StockSyncState.objects.get_or_create(stock=stock)
+    if last_bas_dt is not None and (sync_state.last_bas_dt is None or last_bas_dt > sync_state.last_bas_dt):
+        sync_state.last_bas_dt = last_bas_dt
+    if backfilled_from is not None and (sync_state.backfilled_from is None or backfilled_from < sync_state.backfilled_from):
+        sync_state.backfilled_from = backfilled_from
+    sync_state.save()
+    return sync_state
+
+
+def ingest_market_daily_stock_data(bas_dt, stock_ids_by_isin_code=None):
+    """
+    하루(bas_dt)치 전체 시장 데이터를 페이지 단위로 가져와 모든 종목의 DailyStockData 를 한 번에 저장하고 저장한 row 수를 반환
+    """
+    items = fetch_stock_price_items({"basDt": bas_dt.strftime("%Y%m%d")})
+    if not items:
+        # 휴장일
+        return 0
+
+    if stock_ids_by_isin_code is None:
+        # 새로 상장된 종목도 저장되도록 종목 마스터를 먼저 동기화
+        sync_stocks(items)
+        stock_ids_by_isin_code = dict(Stock.objects.values_list('isin_code', 'id'))
+    else:
+        add_missing_stocks(items, stock_ids_by_isin_code)
+
+    rows = build_market_daily_stock_data_rows(items, stock_ids_by_isin_code)
+    bulk_upsert_daily_stock_data(rows, batch_size=MARKET_DAILY_STOCK_DATA_BATCH_SIZE)
+    logger.info(f"{bas_dt} 전체 시장 데이터 {len(rows)}건이 저장되었습니다.")
+    return len(rows)
+
+
+_missing_stocks_lock = threading.Lock()
+
+
+def add_missing_stocks(items, stock_ids_by_isin_code):
+    """
+    stock_ids_by_isin_code 에 없는 종목만 종목 마스터에 추가하고 id 를 채워 넣는다. (기존 종목은 갱신하지 않음)
+    여러 날짜를 동시에 처리할 때 같은 신규 종목을 중복으로 추가하지 않도록 한 스레드씩 실행한다.
+    """
+    with _missing_stocks_lock:
+        missing = [item for item in items if item.get('isinCd') and item['isinCd'] not in stock_ids_by_isin_code]
+        if not missing:
+            return
+        sync_stocks(missing, update_existing=False)
+        stock_ids_by_isin_code.update(
+            Stock.objects.filter(isin_code__in={item['isinCd'] for item in missing}).values_list('isin_code', 'id'))
+
+
+def ingest_market_daily_stock_data_range(start_date, end_date, max_workers=None, progress=None):
+    """
+    start_date ~ end_date 의 평일마다 전체 시장 데이터를 저장 (여러 날짜를 스레드 풀에서 동시에 처리)
+    {기준일자 문자열: 저장한 row 수} 를 반환한다.
+    """
+    max_workers = max_workers or getattr(settings, 'MARKET_DAILY_STOCK_DATA_MAX_WORKERS', MARKET_DAILY_STOCK_DATA_MAX_WORKERS)
+    dates = []
+    current = start_date
+    while current <= end_date:
+        if current.weekday() < 5:  # 주말은 요청하지 않음 (공휴일은 빈 응답)
+            dates.append(current)
+        current += timedelta(days=1)
+    if not dates:
+        return {}
+
+    # 종목 마스터는 한 번만 읽고, 날짜마다 없는 종목만 추가한다
+    # (과거 날짜의 종목 명 / 시장 구분으로 현재 종목을 덮어쓰지 않도록 기존 종목은 갱신하지 않음)
+    stock_ids_by_isin_code = dict(Stock.objects.values_list('isin_code', 'id'))
+
+    def ingest(bas_dt):
+        try:
+            return ingest_market_daily_stock_data(bas_dt, stock_ids_by_isin_code)
+        finally:
+            # 스레드마다 열린 DB 커넥션 정리
+            connection.close()
+
+    saved = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(dates))) as executor:
+        for done, (bas_dt, row_count) in enumerate(zip(dates, executor.map(ingest, dates)), start=1):
+            saved[bas_dt.isoformat()] = row_count
+            if progress:
+                progress(done, len(dates), bas_dt.isoformat())
+    return saved
+
+
+"""
+로컬 백테스트 엔진
+DailyStockData 의 가격 배열로 전략을 NumPy 벡터 연산으로 실행하며, Monte-Carlo 실행 여러 번을 (실행 수, 거래일 수) 배열 하나로 처리한다.
+전략: 전일 종가가 window 거래일 이동평균보다 높으면 보유, 낮으면 현금 (long only)
+Monte-Carlo: 진입/청산 체결가를 그날의 저가 ~ 고가 사이에서 무작위로 정한다. (소수 주 단위 매매)
+"""
+
+BACKTEST_BACKEND_REMOTE = 'remote'
+BACKTEST_BACKEND_LOCAL = 'local'
+BACKTEST_BACKENDS = (BACKTEST_BACKEND_REMOTE, BACKTEST_BACKEND_LOCAL)
+
+BACKTEST_RUNS = 1000
+BACKTEST_FEE_RATE = 0.00015  # 매수/매도 1회당 수수료율
+
+BacktestPrices = namedtuple('BacktestPrices', ['bas_dt', 'hipr', 'lopr', 'clpr', 'test_start_index'])
+BacktestResult = namedtuple('BacktestResult', ['runs', 'profit_mean', 'profit_std', 'max_drawdown'])
+
+
+def simulate_moving_average_strategy(prices, starting_cash, runs, window, fee_rate=BACKTEST_FEE_RATE, seed=None):
+    """
+    (실행별 profit, 실행별 최대 낙폭 비율) 배열을 반환
+    prices.test_start_index 이전 구간은 이동평균 계산에만 쓰고, 수익은 테스트 구간에서만 계산한다.
+    """
+    close = np.asarray(prices.clpr, dtype='float64')
+    high = np.asarray(prices.hipr, dtype='float64')
+    low = np.asarray(prices.lopr, dtype='float64')
+    start = prices.test_start_index
+    days = len(close)
+    if days - start < 1 or days < window or not starting_cash:
+        return np.zeros(0), np.zeros(0)
+
+    # t 일 종가 기준 신호 (이동평균은 window 거래일 이후부터 정의)
+    cumsum = np.cumsum(np.r_[0.0, close])
+    moving_average = np.full(days, np.inf)
+    moving_average[window - 1:] = (cumsum[window:] - cumsum[:-window]) / window
+    signal = close > moving_average
+
+    # t 일 보유 여부는 t-1 일 신호로 결정, 테스트 시작일에는 현금에서 시작
+    holding = np.zeros(days, dtype=bool)
+    holding[1:] = signal[:-1]
+    holding[:start] = False
+    held_before = np.r_[False, holding[:-1]]
+    entry = holding & ~held_before
+    exit_ = ~holding & held_before
+    carry = holding & held_before
+    previous_close = np.r_[close[0], close[:-1]]
+
+    rng = np.random.default_rng(seed)
+    fills = low + (high - low) * rng.random((runs, days))
+
+    growth = np.ones((runs, days))
+    growth[:, carry] = close[carry] / previous_close[carry]
+    growth[:, entry] = close[entry] / fills[:, entry] * (1 - fee_rate)
+    growth[:, exit_] = fills[:, exit_] / previous_close[exit_] * (1 - fee_rate)
+
+    equity = starting_cash * np.cumprod(growth[:, start:], axis=1)
+    profit = equity[:, -1] - starting_cash
+    max_drawdown = (1 - equity / np.maximum.accumulate(equity, axis=1)).max(axis=1)
+    return profit, max_drawdown
+
+
+def load_backtest_prices(stocks, load_start_date, test_start_date, test_end_date):
+    """
+    {stock_id: BacktestPrices} 반환
+    시계열 저장소(TIMESERIES_STORE_DIR)가 설정되어 있으면 저장소에서, 없으면 한 번의 쿼리로 모든 주식의 가격을 읽는다.
+    """
+    columns_by_stock_id = {}
+    try:
+        store = get_timeseries_store()
+    except TimeSeriesStoreDisabledException:
+        store = None
+
+    remaining = []
+    for stock in stocks:
+        window = store.window(stock.isin_code, load_start_date, test_end_date, ['bas_dt', 'hipr', 'lopr', 'clpr']) \
+            if store else None
+        if window is None or not len(window.columns['bas_dt']):
+            remaining.append(stock)
+        else:
+            columns_by_stock_id[stock.id] = window.columns
+
+    if remaining:
+        rows_by_stock_id = {}
+        rows = DailyStockData.objects.filter(
+            stock_id__in=[stock.id for stock in remaining], bas_dt__range=[load_start_date, test_end_date],
+        ).order_by('stock_id', 'bas_dt').values_list('stock_id', 'bas_dt', 'hipr', 'lopr', 'clpr')
+        for stock_id, *row in rows:
+            rows_by_stock_id.setdefault(stock_id, []).append(row)
+        for stock_id, stock_rows in rows_by_stock_id.items():
+            bas_dt, hipr, lopr, clpr = zip(*stock_rows)
+            columns_by_stock_id[stock_id] = {
+                'bas_dt': np.array(bas_dt, dtype='datetime64[D]'),
+                'hipr': np.array(hipr, dtype='float64'),
+                'lopr': np.array(lopr, dtype='float64'),
+                'clpr': np.array(clpr, dtype='float64'),
+            }
+
+    return {
+        stock_id: BacktestPrices(
+            columns['bas_dt'], columns['hipr'], columns['lopr'], columns['clpr'],
+            int(np.searchsorted(columns['bas_dt'], np.datetime64(test_start_date, 'D'))),
+        )
+        for stock_id, columns in columns_by_stock_id.items()
+    }
+
+
+def _run_local_backtest(args):
+    stock_id, prices, starting_cash, runs, window, fee_rate, seed = args
+    profit, max_drawdown = simulate_moving_average_strategy(prices, starting_cash, runs, window, fee_rate, seed)
+    if not len(profit):
+        return stock_id, None
+    return stock_id, BacktestResult(
+        runs=len(profit),
+        profit_mean=float(profit.mean()),
+        profit_std=float(profit.std(ddof=1)) if len(profit) > 1 else 0.0,
+        max_drawdown=float(max_drawdown.mean()),
+    )
+
+
+def run_local_backtests(stocks_with_cash, backtest_window, window_size, runs=None, processes=None, seed=None):
+    """
+    주식별 로컬 백테스트 결과 {stock_id: BacktestResult} 반환 (가격 데이터가 부족한 주식은 제외)
+    processes 가 2 이상이면 주식별 실행을 프로세스 풀에 나눠 실행한다. (자식 프로세스는 DB 에 접근하지 않음)
+    """
+    runs = runs or getattr(settings, 'BACKTEST_RUNS', BACKTEST_RUNS)
+    processes = processes or getattr(settings, 'BACKTEST_PROCESSES', 1)
+    fee_rate = getattr(settings, 'BACKTEST_FEE_RATE', BACKTEST_FEE_RATE)
+
+    # 이동평균 계산용으로 테스트 시작일 이전 window 거래일을 함께 읽는다
+    load_start_date = get_trading_calendar().trading_days_before(backtest_window.test_start_date, window_size)
+    prices_by_stock_id = load_backtest_prices(
+        [stock for stock, _ in stocks_with_cash], load_start_date, backtest_window.test_start_date,
+        backtest_window.test_end_date)
+
+    tasks = [
+        (stock.id, prices_by_stock_id[stock.id], starting_cash, runs, window_size, fee_rate,
+         None if seed is None else seed + stock.id)
+        for stock, starting_cash in stocks_with_cash
+        if stock.id in prices_by_stock_id
+    ]
+    if processes > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(processes, len(tasks))) as executor:
+            results = list(executor.map(_run_local_backtest, tasks))
+    else:
+        results = [_run_local_backtest(task) for task in tasks]
+    return {stock_id: result for stock_id, result in results if result is not None}
@@ -0,0 +1,47 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from stocks.cache import bump_data_version
+from stocks.models import Stock, DailyStockData, WeeklyRecommendation, WeeklyRecommendationStock, \
+    WeeklyRecommendationStockTestResult, WeeklyRecommendationStockPredictResult, MarketHoliday, DailyIndicator
+from stocks.search import invalidate_stock_search_index
+from stocks.snapshots import invalidate_weekly_recommendation_snapshot
+from stocks.trading_calendar import invalidate_trading_calendar
+
+# 조회 API 응답에 포함되는 모델 (bulk_create / bulk_update 는 signal 이 발생하지 않으므로 호출하는 쪽에서 직접 bump 한다)
+CACHED_MODELS = [
+    Stock,
+    DailyStockData,
+    WeeklyRecommendation,
+    WeeklyRecommendationStock,
+    WeeklyRecommendationStockTestResult,
+    WeeklyRecommendationStockPredictResult,
+    DailyIndicator,
+]
+
+
+@receiver([post_save, post_delete])
+def invalidate_response_cache(sender, **kwargs):
+    if sender in CACHED_MODELS:
+        bump_data_version()
+
+
+@receiver([post_save, post_delete], sender=MarketHoliday)
+def invalidate_calendar(sender, **kwargs):
+    invalidate_trading_calendar()
+
+
+@receiver([post_save, post_delete], sender=Stock)
+def invalidate_search_index(sender, **kwargs):
+    invalidate_stock_search_index()
+
+
+@receiver([post_save, post_delete], sender=WeeklyRecommendation)
+def invalidate_weekly_snapshot(sender, instance, **kwargs):
+    invalidate_weekly_recommendation_snapshot(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=WeeklyRecommendationStock)
+def invalidate_weekly_stock_snapshot(sender, instance, **kwargs):
+    # 추천 종목 추가 / 삭제 (admin) 는 작업을 거치지 않으므로 주차 스냅샷을 지워 다음 조회에서 다시 만든다
+    invalidate_weekly_recommendation_snapshot(instance.weekly_recommendation_id)
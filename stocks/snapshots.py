@@ -0,0 +1,258 @@
+"""
+최신 주차 조회 API 응답 스냅샷
+WeeklyRecommendation 별로 추천 종목, 최근 1년 일자별 데이터 (+ 기술적 지표), 최신 테스트/예측 결과를 미리 직렬화해
+gzip JSON 으로 WeeklyRecommendationSnapshot 에 저장한다.
+데이터 수집/AI 작업이 끝나면 다시 만들고, 조회 API 는 스냅샷 한 건만 읽어 그대로 응답한다.
+"""
+import gzip
+import hashlib
+import logging
+from datetime import timedelta
+
+from django.db import IntegrityError
+from django.db.models import Subquery
+from django.utils import timezone
+
+from stocks.cache import get_data_version, is_shared_cache
+from stocks.exceptions import StockNotFoundException, WeeklyRecommendationNotFoundException
+from stocks.indicators import INDICATOR_FIELDS
+from stocks.models import WeeklyRecommendation, WeeklyRecommendationStock, DailyStockData, DailyIndicator, \
+    WeeklyRecommendationStockTestResult, WeeklyRecommendationStockPredictResult, WeeklyRecommendationSnapshot
+from stocks.renderers import ORJSONRenderer
+from stocks.serializers import DAILY_STOCK_DATA_FIELDS, serialize_daily_stock_data_rows, \
+    serialize_daily_stock_data_columns
+from stocks.trading_calendar import get_trading_calendar
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_COMPRESS_LEVEL = 6
+SNAPSHOT_MAX_AGE = 60 * 60  # 초, 데이터 버전을 비교하지 않는 경우에도 이 시간이 지나면 다시 만든다
+
+# (columnar 포맷 여부, 기술적 지표 포함 여부) -> 응답을 저장하는 필드
+SNAPSHOT_PAYLOAD_FIELDS = {
+    (False, False): 'payload',
+    (True, False): 'columnar_payload',
+    (False, True): 'indicators_payload',
+    (True, True): 'indicators_columnar_payload',
+}
+SNAPSHOT_META_FIELDS = ('weekly_recommendation', 'start_date', 'stock_count', 'etag', 'data_version', 'built_at')
+
+
+def get_latest_weekly_recommendation_snapshot(payload_field='payload'):
+    """
+    최신 주차 스냅샷 반환 (응답 필드는 payload_field 하나만 읽는다)
+    최신 주차의 스냅샷이 없거나 만든 뒤 데이터 버전이 바뀌었으면 (작업 외의 경로로 데이터가 저장된 경우) 다시 만든다.
+    """
+    version, _ = get_data_version()
+    snapshot = latest_weekly_recommendation_snapshot_queryset(payload_field).first()
+    if is_snapshot_stale(snapshot, version, payload_field):
+        snapshot = rebuild_weekly_recommendation_snapshot()
+    return snapshot
+
+
+def latest_weekly_recommendation_snapshot_queryset(payload_field):
+    """
+    최신 주차 (start_date 기준) 의 스냅샷 (한 번의 쿼리, 최신 주차가 새로 추가되었으면 비어 있다)
+    """
+    latest_weekly_recommendation = WeeklyRecommendation.objects.order_by('-start_date').values('id')[:1]
+    return WeeklyRecommendationSnapshot.objects.only(*SNAPSHOT_META_FIELDS, payload_field).filter(
+        weekly_recommendation_id=Subquery(latest_weekly_recommendation))
+
+
+def is_snapshot_stale(snapshot, version, payload_field):
+    """
+    데이터 버전 비교는 공유 캐시일 때만 한다.
+    local memory 캐시는 프로세스마다 버전이 달라, 비교하면 작업 worker 가 만든 스냅샷을 웹 프로세스마다 계속 다시 만든다.
+    (이 경우 데이터를 저장하는 작업이 끝날 때 worker 가 스냅샷을 다시 만들고,
+    작업 외의 경로로 저장된 데이터는 주차 / 추천 종목 변경 signal 과 SNAPSHOT_MAX_AGE 로 반영한다)
+    """
+    if snapshot is None or not getattr(snapshot, payload_field):
+        return True
+    if timezone.now() - snapshot.built_at > timedelta(seconds=SNAPSHOT_MAX_AGE):
+        return True
+    return is_shared_cache() and snapshot.data_version != version
+
+
+def invalidate_weekly_recommendation_snapshot(weekly_recommendation_id):
+    """
+    주차 스냅샷 삭제 (다음 조회에서 다시 만든다)
+    """
+    WeeklyRecommendationSnapshot.objects.filter(weekly_recommendation_id=weekly_recommendation_id).delete()
+
+
+def rebuild_weekly_recommendation_snapshot(weekly_recommendation=None):
+    """
+    주차 스냅샷을 새로 만들어 저장 (weekly_recommendation 을 주지 않으면 최신 주차)
+    """
+    # 데이터를 읽기 전에 버전을 읽어야 생성 도중 저장된 데이터가 있을 때 다음 조회에서 다시 만든다
+    version, _ = get_data_version()
+
+    if weekly_recommendation is None:
+        try:
+            weekly_recommendation = WeeklyRecommendation.objects.latest('start_date')
+        except WeeklyRecommendation.DoesNotExist:
+            raise WeeklyRecommendationNotFoundException("No weekly recommendation data found.")
+
+    responses = build_weekly_recommendation_snapshot_data(weekly_recommendation)
+    payloads = {key: ORJSONRenderer().render(response) for key, response in responses.items()}
+
+    defaults = {
+        'start_date': weekly_recommendation.start_date,
+        'stock_count': len(responses[(False, False)]),
+        **{
+            field: gzip.compress(payloads[key], compresslevel=SNAPSHOT_COMPRESS_LEVEL, mtime=0)
+            for key, field in SNAPSHOT_PAYLOAD_FIELDS.items()
+        },
+        # 지표 포함 응답은 다른 응답의 내용을 모두 포함하므로 이 응답의 hash 를 공통 ETag 로 사용 (view 에서 포맷별 접미사를 붙임)
+        'etag': hashlib.md5(payloads[(False, True)]).hexdigest(),
+        'data_version': version,
+        'built_at': timezone.now(),
+    }
+    try:
+        snapshot, _ = WeeklyRecommendationSnapshot.objects.update_or_create(
+            weekly_recommendation=weekly_recommendation, defaults=defaults)
+    except IntegrityError:
+        # 다른 요청이 같은 주차 스냅샷을 동시에 만든 경우 그 스냅샷을 사용
+        snapshot = WeeklyRecommendationSnapshot.objects.get(weekly_recommendation=weekly_recommendation)
+    logger.info(f"{weekly_recommendation} 스냅샷 생성 ({snapshot.stock_count}종목, {len(snapshot.payload)} bytes)")
+    return snapshot
+
+
+def build_weekly_recommendation_snapshot_data(weekly_recommendation):
+    """
+    {(columnar 포맷 여부, 기술적 지표 포함 여부): 응답} 반환
+    추천 종목 / 일자별 데이터 / 기술적 지표 / 테스트 결과 / 예측 결과를 각각 한 번의 쿼리로 조회한다.
+    """
+    # Step 1: 추천 종목 (stock 을 join 해서 한 번에 조회)
+    stocks = [
+        weekly_stock.stock
+        for weekly_stock in WeeklyRecommendationStock.objects.filter(
+            weekly_recommendation=weekly_recommendation).select_related('stock').order_by('id')
+    ]
+    responses = {key: [] for key in SNAPSHOT_PAYLOAD_FIELDS}
+    if not stocks:
+        return responses
+
+    # Step 2: 최근 1년 (거래일 기준) 일자별 데이터 / 기술적 지표
+    start_date, end_date = get_trading_calendar().display_window()
+    daily_rows_by_stock_id = get_daily_stock_data_rows(stocks, start_date, end_date)
+    indicator_rows_by_stock_id = get_indicator_rows(stocks, start_date, end_date)
+
+    # Step 3: 주차의 종목별 최신 테스트 / 예측 결과
+    test_results = get_latest_test_results(weekly_recommendation)
+    predict_results = get_latest_predict_results(weekly_recommendation)
+
+    for stock in stocks:
+        base = {
+            'isin_code': stock.isin_code,
+            'itms_name': stock.itms_name,
+        }
+        extra = {
+            'test_result': test_results.get(stock.id),
+            'predict_result': predict_results.get(stock.id),
+        }
+        daily_rows = daily_rows_by_stock_id.get(stock.id, [])
+        indicator_rows = indicator_rows_by_stock_id.get(stock.id, [])
+        for columnar in (False, True):
+            if columnar:
+                daily_stock_data = serialize_daily_stock_data_columns(daily_rows)
+                indicators = serialize_indicator_columns(indicator_rows)
+            else:
+                daily_stock_data = serialize_daily_stock_data_rows(daily_rows)
+                indicators = serialize_indicator_rows(indicator_rows)
+            responses[(columnar, False)].append({**base, 'daily_stock_data': daily_stock_data, **extra})
+            responses[(columnar, True)].append(
+                {**base, 'daily_stock_data': daily_stock_data, 'indicators': indicators, **extra})
+    return responses
+
+
+def get_daily_stock_data_rows(stocks, start_date, end_date):
+    """
+    stock_id IN (...) 한 번의 쿼리로 모든 주식의 DailyStockData values_list 튜플을 가져와 주식별로 묶음
+    """
+    try:
+        daily_stock_data = DailyStockData.objects.filter(
+            stock_id__in=[stock.id for stock in stocks],
+            bas_dt__range=[start_date, end_date],
+        ).order_by('stock_id', 'bas_dt').values_list('stock_id', *DAILY_STOCK_DATA_FIELDS)
+
+        rows_by_stock_id = {}
+        for row in daily_stock_data:
+            rows_by_stock_id.setdefault(row[0], []).append(row[1:])
+        return rows_by_stock_id
+    except Exception as e:
+        logger.error(f"Error querying daily stock data: {str(e)}")
+        raise StockNotFoundException("Error retrieving daily stock data.")
+
+
+def get_indicator_rows(stocks, start_date, end_date):
+    """
+    {stock_id: [(bas_dt, *INDICATOR_FIELDS), ...]} (한 번의 쿼리)
+    """
+    rows_by_stock_id = {}
+    indicators = DailyIndicator.objects.filter(
+        stock_id__in=[stock.id for stock in stocks],
+        bas_dt__range=[start_date, end_date],
+    ).order_by('stock_id', 'bas_dt').values_list('stock_id', 'bas_dt', *INDICATOR_FIELDS)
+    for row in indicators:
+        rows_by_stock_id.setdefault(row[0], []).append(row[1:])
+    return rows_by_stock_id
+
+
+def serialize_indicator_rows(rows):
+    return [
+        {'bas_dt': row[0].isoformat(), **dict(zip(INDICATOR_FIELDS, map(_format_decimal, row[1:])))}
+        for row in rows
+    ]
+
+
+def serialize_indicator_columns(rows):
+    columns = list(zip(*rows)) if rows else [()] * (len(INDICATOR_FIELDS) + 1)
+    return {
+        'bas_dt': [value.isoformat() for value in columns[0]],
+        **{field: [_format_decimal(value) for value in column] for field, column in zip(INDICATOR_FIELDS, columns[1:])},
+    }
+
+
+def get_latest_test_results(weekly_recommendation):
+    """
+    종목별 최신 테스트 결과 ({stock_id: dict}, StockAITestResultView 응답과 같은 필드)
+    """
+    results = {}
+    test_results = WeeklyRecommendationStockTestResult.objects.filter(
+        weekly_recommendation=weekly_recommendation).order_by('stock_id', '-id')
+    for test_result in test_results:
+        if test_result.stock_id in results:
+            continue
+        results[test_result.stock_id] = {
+            'average_profit': _format_decimal(test_result.profit),
+            'profit_std': _format_decimal(test_result.profit_std),
+            'test_runs': test_result.test_runs,
+            'max_drawdown': _format_decimal(test_result.max_drawdown),
+            'backend': test_result.backend,
+            'test_start_date': _format_date(test_result.test_start_date),
+            'test_end_date': _format_date(test_result.test_end_date),
+            'test_starting_cash': test_result.test_starting_cash,
+        }
+    return results
+
+
+def get_latest_predict_results(weekly_recommendation):
+    """
+    종목별 최신 예측 결과 ({stock_id: dict}, StockAIPredictResultView 응답과 같은 필드)
+    """
+    results = {}
+    predict_results = WeeklyRecommendationStockPredictResult.objects.filter(
+        weekly_recommendation=weekly_recommendation).order_by('stock_id', '-target_date').values_list(
+        'stock_id', 'action', 'target_date')
+    for stock_id, action, target_date in predict_results:
+        results.setdefault(stock_id, {'action': action, 'target_date': target_date.isoformat()})
+    return results
+
+
+def _format_decimal(value):
+    return None if value is None else format(value, '.2f')
+
+
+def _format_date(value):
+    return None if value is None else value.isoformat()
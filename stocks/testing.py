@@ -0,0 +1,253 @@
+"""
+테스트 / 벤치마크에서 사용하는 로컬 stub 서버와 query budget 검사 mixin
+"""
+import json
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+from stocks.profiling import duplicate_queries
+
+
+class StubServer:
+    """
+    백그라운드 스레드에서 동작하는 로컬 HTTP 서버
+    with 문으로 사용하며, url 속성으로 주소를 얻는다.
+    """
+    handler_class = None
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        stub = self
+
+        class Handler(self.handler_class):
+            server_stub = stub
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def count_request(self):
+        with self._lock:
+            self.request_count += 1
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    server_stub = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, payload, status=200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def query_params(self):
+        return {key: values[-1] for key, values in parse_qs(urlparse(self.path).query).items()}
+
+
+class PublicDataStockPriceHandler(StubRequestHandler):
+    def do_GET(self):
+        stub = self.server_stub
+        stub.count_request()
+        if stub.latency:
+            time.sleep(stub.latency)
+
+        params = self.query_params()
+        stub.requested_params.append(params)
+        page_no = int(params.get('pageNo', 1))
+        num_of_rows = int(params.get('numOfRows', 10))
+        matched = [item for item in stub.items if self.matches(item, params)]
+        items = matched[(page_no - 1) * num_of_rows:page_no * num_of_rows]
+        self.send_json({
+            'response': {
+                'header': {'resultCode': '00', 'resultMsg': 'NORMAL SERVICE.'},
+                'body': {
+                    'numOfRows': num_of_rows,
+                    'pageNo': page_no,
+                    'totalCount': len(matched),
+                    'items': {'item': items},
+                },
+            },
+        })
+
+    def matches(self, item, params):
+        # beginBasDt / endBasDt / basDt / isinCd 조건 (YYYYMMDD 문자열 비교)
+        return (
+            item['basDt'] >= params.get('beginBasDt', item['basDt'])
+            and item['basDt'] <= params.get('endBasDt', item['basDt'])
+            and item['basDt'] == params.get('basDt', item['basDt'])
+            and item['isinCd'] == params.get('isinCd', item['isinCd'])
+        )
+
+
+class PublicDataStubServer(StubServer):
+    """
+    공공 데이터 포털 getStockPriceInfo 를 흉내내는 stub 서버
+    requested_params 에 요청받은 query parameter 를 순서대로 기록한다.
+    """
+    handler_class = PublicDataStockPriceHandler
+
+    def __init__(self, items, latency=0.0):
+        super().__init__(latency=latency)
+        self.items = items
+        self.requested_params = []
+
+
+class PredictHandler(StubRequestHandler):
+    def do_GET(self):
+        stub = self.server_stub
+        stub.count_request()
+        if stub.latency:
+            time.sleep(stub.latency)
+
+        params = self.query_params()
+        stub.requested_params.append(params)
+        if 'stocks' in params:
+            self.send_json({'results': [stub.predict(code) for code in params['stocks'].split(',') if code]})
+        else:
+            self.send_json(stub.predict(params.get('stock')))
+
+
+class PredictStubServer(StubServer):
+    """
+    AI 예측 API (?stock=<코드> 종목별 요청, ?stocks=<코드,...> 묶음 요청) 를 흉내내는 stub 서버
+    모든 종목에 대해 action / target_date 를 반환하며, requested_params 에 요청 순서대로 기록한다.
+    """
+    handler_class = PredictHandler
+
+    def __init__(self, action='BUY', target_date=None, latency=0.0):
+        super().__init__(latency=latency)
+        self.action = action
+        self.target_date = target_date or date.today()
+        self.requested_params = []
+
+    def predict(self, code):
+        return {'stock': code, 'action': self.action, 'target_date': self.target_date.isoformat()}
+
+
+class BacktestHandler(StubRequestHandler):
+    def do_GET(self):
+        stub = self.server_stub
+        stub.count_request()
+        code = self.query_params().get('stock')
+        profit = stub.start_request(code)
+        try:
+            if stub.latency:
+                time.sleep(stub.latency)
+        finally:
+            stub.finish_request(code)
+        self.send_json({'stock': code, 'average_profit': profit})
+
+
+class BacktestStubServer(StubServer):
+    """
+    AI 테스트 API (?stock=<코드>) 를 흉내내는 stub 서버
+    종목별로 profits 를 요청 순서대로 돌려가며 반환하고, 전체 / 종목별 최대 동시 요청 수를 기록한다.
+    """
+    handler_class = BacktestHandler
+
+    def __init__(self, profits, latency=0.0):
+        super().__init__(latency=latency)
+        self.profits = profits
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.in_flight_by_stock = {}
+        self.max_in_flight_by_stock = {}
+        self.request_count_by_stock = {}
+
+    def start_request(self, code):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.in_flight_by_stock[code] = self.in_flight_by_stock.get(code, 0) + 1
+            self.max_in_flight_by_stock[code] = max(
+                self.max_in_flight_by_stock.get(code, 0), self.in_flight_by_stock[code])
+            index = self.request_count_by_stock.get(code, 0)
+            self.request_count_by_stock[code] = index + 1
+        return self.profits[index % len(self.profits)]
+
+    def finish_request(self, code):
+        with self._lock:
+            self.in_flight -= 1
+            self.in_flight_by_stock[code] -= 1
+
+
+def make_stock_price_items(row_count, isin_code='KR7000000001', start_ordinal=730000):
+    """
+    getStockPriceInfo 형식의 합성 item 목록 생성
+    """
+    items = []
+    for i in range(row_count):
+        price = 10000 + i
+        items.append({
+            'basDt': date.fromordinal(start_ordinal + i).strftime('%Y%m%d'),
+            'srtnCd': isin_code[3:9],
+            'isinCd': isin_code,
+            'itmsNm': f'종목{isin_code[-4:]}',
+            'mrktCtg': 'KOSPI',
+            'clpr': str(price),
+            'hipr': str(price + 100),
+            'lopr': str(price - 100),
+            'mkp': str(price - 50),
+            'vs': '50',
+            'fltRt': '0.50',
+            'trqu': '123456',
+            'trPrc': '1234567890',
+            'lstgStCnt': '1000000',
+            'mrktTotAmt': str(price * 1000000),
+        })
+    return items
+
+
+class QueryBudgetTestMixin:
+    """
+    TestCase mixin: 요청이 view 에 선언된 query_budget (요청당 최대 쿼리 수) 을 넘으면 실패
+    실패 메시지에 반복된 쿼리 fingerprint 를 함께 보여준다. (N+1 확인용)
+    """
+
+    def assertWithinQueryBudget(self, path, data=None, method='get', budget=None, **extra):
+        view_class = getattr(resolve(urlparse(path).path).func, 'view_class', None)
+        if budget is None:
+            budget = getattr(view_class, 'query_budget', None)
+        if budget is None:
+            self.fail(f"{view_class.__name__ if view_class else path} 에 query_budget 이 선언되어 있지 않습니다.")
+
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(path, data, **extra)
+
+        queries = [(query['sql'], float(query['time'] or 0)) for query in context.captured_queries]
+        if len(queries) > budget:
+            lines = [f"{path}: 쿼리 {len(queries)} 개로 query budget {budget} 개를 넘었습니다."]
+            lines.extend(f"  x{item['count']} {item['fingerprint']}" for item in duplicate_queries(queries))
+            lines.extend(f"  {index}. {sql}" for index, (sql, _) in enumerate(queries, start=1))
+            self.fail('\n'.join(lines))
+        return response
@@ -1,3 +1,1006 @@
-from django.test import TestCase
+import gzip
+import io
+import json
+import shutil
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import numpy as np
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, modify_settings, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from stocks import exports
+from stocks.cache import get_cache
+from stocks.clients import AsyncHttpClient, HttpClient, httpx
+from stocks.indicators import INDICATOR_FIELDS, compute_indicators, update_daily_indicators
+from stocks.jobs import enqueue_job, requeue_stale_jobs, run_job, run_next_job
+from stocks.metrics import JOB_DURATION, OUTBOUND_DURATION, REGISTRY, REQUEST_DB_QUERIES, REQUEST_DURATION
+from stocks.models import DailyIndicator, Job, Stock, DailyStockData, WeeklyRecommendation, WeeklyRecommendationStock, \
+    WeeklyRecommendationStockTestResult, WeeklyRecommendationStockPredictResult, WeeklyRecommendationSnapshot
+from stocks.renderers import ColumnarJSONRenderer, NDJSONRenderer
+from stocks.search import get_stock_search_index
+from stocks.serializers import DailyStockDataSerializer, DAILY_STOCK_DATA_FIELDS, serialize_daily_stock_data_rows
+from stocks.services import sync_stocks, fetch_stock_price_items, build_daily_stock_data_rows, bulk_upsert_daily_stock_data, \
+    SYNC_MODE_INCREMENTAL, SYNC_MODE_BACKFILL, ingest_market_daily_stock_data_range, BacktestPrices, \
+    simulate_moving_average_strategy, run_local_backtests, RunningStats
+from stocks.profiling import fingerprint, load_reports
+from stocks.testing import BacktestStubServer, PublicDataStubServer, PredictStubServer, QueryBudgetTestMixin, \
+    StubServer, StubRequestHandler, make_stock_price_items
+from stocks.timeseries import TimeSeriesStore
+from stocks.trading_calendar import BacktestWindow, TradingCalendar, get_trading_calendar, invalidate_trading_calendar
+from stocks.views import FetchWeeklyStockDailyDataView, StockAIPredictView, StockAITestView
+
+
+class FlakyHandler(StubRequestHandler):
+    def do_GET(self):
+        self.server_stub.count_request()
+        if self.server_stub.request_count <= self.server_stub.failures:
+            self.send_json({'error': 'unavailable'}, status=503)
+        else:
+            self.send_json({'ok': True})
+
+    do_POST = do_GET
+
+
+class FlakyStubServer(StubServer):
+    handler_class = FlakyHandler
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+
+@override_settings(PUBLIC_DATA_SECRET_KEY='test-key')
+class FetchStockPriceItemsTest(SimpleTestCase):
+    def test_fetches_every_page_in_order(self):
+        items = make_stock_price_items(2500)
+        with PublicDataStubServer(items) as stub:
+            fetched = fetch_stock_price_items({}, num_of_rows=1000, max_workers=4, url=stub.url)
+
+        self.assertEqual([item['basDt'] for item in fetched], [item['basDt'] for item in items])
+        self.assertEqual(stub.request_count, 3)
+
+    def test_empty_result(self):
+        with PublicDataStubServer([]) as stub:
+            fetched = fetch_stock_price_items({}, url=stub.url)
+
+        self.assertEqual(fetched, [])
+        self.assertEqual(stub.request_count, 1)
+
+
+class DailyStockDataUpsertTest(TestCase):
+    def test_overlapping_page_updates_existing_rows(self):
+        stock = Stock.objects.create(isin_code='KR7000000001', srtn_code='000000', itms_name='종목0001')
+        bulk_upsert_daily_stock_data(build_daily_stock_data_rows(stock, make_stock_price_items(5)))
+
+        # 뒤쪽 3일이 겹치는 다음 페이지 (겹치는 날의 가격은 정정됨)
+        items = make_stock_price_items(5, start_ordinal=730002)
+        for item in items:
+            item['clpr'] = str(int(item['clpr']) + 1)
+        bulk_upsert_daily_stock_data(build_daily_stock_data_rows(stock, items))
+
+        rows = list(DailyStockData.objects.filter(stock=stock).order_by('bas_dt').values_list('bas_dt', 'clpr'))
+        self.assertEqual([bas_dt for bas_dt, _ in rows], [date.fromordinal(730000 + i) for i in range(7)])
+        self.assertEqual([clpr for _, clpr in rows], [10000, 10001, 10001, 10002, 10003, 10004, 10005])
+
+
+class SyncStocksTest(TestCase):
+    ITEMS = [
+        {'isinCd': 'KR7005930003', 'srtnCd': '005930', 'itmsNm': '삼성전자', 'mrktCtg': 'KOSPI'},
+        {'isinCd': 'KR7000660001', 'srtnCd': '000660', 'itmsNm': 'SK하이닉스', 'mrktCtg': 'KOSPI'},
+        {'isinCd': 'KR7035720002', 'srtnCd': '035720', 'itmsNm': '카카오', 'mrktCtg': 'KOSPI'},
+    ]
+
+    def test_inserts_updates_and_skips_unchanged_with_fixed_queries(self):
+        self.assertEqual(sync_stocks(self.ITEMS), (3, 0))
+
+        items = [
+            self.ITEMS[0],  # 변경 없음
+            {**self.ITEMS[1], 'itmsNm': 'SK하이닉스우'},  # 종목 명 변경
+            {**self.ITEMS[2], 'mrktCtg': 'KOSDAQ'},  # 시장 구분 변경
+            {'isinCd': 'KR7035420009', 'srtnCd': '035420', 'itmsNm': 'NAVER', 'mrktCtg': 'KOSPI'},
+        ]
+        # 기존 종목 조회 1번 + INSERT 1번 + UPDATE 1번
+        with self.assertNumQueries(3):
+            self.assertEqual(sync_stocks(items), (1, 2))
+        with self.assertNumQueries(1):
+            self.assertEqual(sync_stocks(items), (0, 0))
+
+        self.assertEqual(Stock.objects.count(), 4)
+        self.assertEqual(Stock.objects.get(isin_code='KR7000660001').itms_name, 'SK하이닉스우')
+        self.assertEqual(Stock.objects.get(isin_code='KR7035720002').mrkt_cls, 'KOSDAQ')
+
+
+class HttpClientTest(SimpleTestCase):
+    def test_retries_5xx_and_records_host_stats(self):
+        client = HttpClient(max_retries=3, backoff_factor=0)
+        with FlakyStubServer(failures=2) as stub:
+            response = client.get(stub.url)
+            host = stub.url.split('//')[1]
+
+        self.assertEqual(response.status_code, 200)
+        stats = client.get_stats()[host]
+        self.assertEqual(stats['requests'], 3)
+        self.assertEqual(stats['retries'], 2)
+        self.assertEqual(stats['errors'], 2)
+
+    def test_returns_last_response_when_retries_exhausted(self):
+        client = HttpClient(max_retries=1, backoff_factor=0)
+        with FlakyStubServer(failures=5) as stub:
+            response = client.get(stub.url)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(stub.request_count, 2)
+
+    def test_post_is_not_retried_by_default(self):
+        client = HttpClient(max_retries=3, backoff_factor=0)
+        with FlakyStubServer(failures=1) as stub:
+            response = client.post(stub.url)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(stub.request_count, 1)
+
+
+@skipUnless(httpx is not None, "httpx 가 설치되지 않음")
+class AsyncHttpClientTest(SimpleTestCase):
+    async def test_retries_5xx_and_records_host_stats(self):
+        with FlakyStubServer(failures=2) as stub:
+            async with AsyncHttpClient(max_retries=3, backoff_factor=0) as client:
+                response = await client.get(stub.url)
+            host = stub.url.split('//')[1]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(client.get_stats()[host]['retries'], 2)
+
+
+class RunningStatsTest(SimpleTestCase):
+    def test_matches_statistics_module(self):
+        values = [1.5, -2.25, 3.0, 10.0, 0.0, -7.5, 4.75]
+        stats = RunningStats()
+        for value in values:
+            stats.add(value)
+
+        self.assertEqual(stats.count, len(values))
+        self.assertAlmostEqual(stats.mean, statistics.mean(values))
+        self.assertAlmostEqual(stats.std, statistics.stdev(values))
+
+    def test_single_value_has_zero_std(self):
+        stats = RunningStats()
+        stats.add(5.0)
+
+        self.assertEqual((stats.mean, stats.std), (5.0, 0.0))
+
+
+@override_settings(BACKTEST_BACKEND='remote', AI_HTTP_ASYNC=False, AI_TEST_RUNS=6, AI_TEST_MAX_WORKERS=4,
+                   AI_TEST_MAX_WORKERS_PER_STOCK=2)
+class RemoteBacktestTest(TestCase):
+    def test_concurrency_limits_and_one_result_per_stock(self):
+        weekly_recommendation = create_weekly_stocks(3, days=5)
+        profits = [1.0, 2.5, -0.5, 4.0, 3.0, 0.25]
+
+        with BacktestStubServer(profits, latency=0.02) as stub:
+            def get_test_url(view, stock_name, *args):
+                return f'{stub.url}/api/test/?stock={stock_name}'
+
+            with mock.patch.object(StockAITestView, 'get_test_url', get_test_url):
+                StockAITestView().test_and_save_weekly_stocks()
+
+        self.assertEqual(stub.request_count, 3 * 6)
+        self.assertGreater(stub.max_in_flight, 1)
+        self.assertLessEqual(stub.max_in_flight, 4)
+        self.assertTrue(all(count <= 2 for count in stub.max_in_flight_by_stock.values()))
+
+        results = WeeklyRecommendationStockTestResult.objects.filter(weekly_recommendation=weekly_recommendation)
+        self.assertEqual(sorted(result.stock.srtn_code for result in results), ['000000', '000001', '000002'])
+        for result in results:
+            self.assertEqual(result.test_runs, 6)
+            self.assertEqual(result.backend, 'remote')
+            self.assertEqual(result.profit, Decimal(str(round(statistics.mean(profits), 2))))
+            self.assertEqual(result.profit_std, Decimal(str(round(statistics.stdev(profits), 2))))
+
+
+class JobQueueTest(TestCase):
+    def test_post_enqueues_job_and_returns_202(self):
+        response = self.client.post('/stocks/weekly/latest/predict/')
+
+        self.assertEqual(response.status_code, 202)
+        job = Job.objects.get(pk=response.json()['job_id'])
+        self.assertEqual(job.kind, 'stock_ai_predict')
+        self.assertEqual(job.status, Job.STATUS_QUEUED)
+
+    def test_idempotency_key_returns_existing_job(self):
+        first = enqueue_job('stock_ai_predict', idempotency_key='weekly-predict')
+        second = enqueue_job('stock_ai_predict', idempotency_key='weekly-predict')
+
+        self.assertEqual(first.id, second.id)
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_worker_runs_jobs_in_order_and_records_failure(self):
+        predict = enqueue_job('stock_ai_predict')
+        daily_data = enqueue_job('fetch_weekly_stock_daily_data')
+
+        self.assertEqual(run_next_job('test-worker').id, predict.id)
+        self.assertEqual(run_next_job('test-worker').id, daily_data.id)
+        self.assertIsNone(run_next_job('test-worker'))
+
+        predict.refresh_from_db()
+        daily_data.refresh_from_db()
+        # 추천 주식 목록이 없으면 실패로 기록된다 ({"error": ...} 를 반환한 경우 포함)
+        self.assertEqual(predict.status, Job.STATUS_FAILED)
+        self.assertEqual(predict.error, "No weekly stock recommendations found")
+        self.assertEqual(daily_data.status, Job.STATUS_FAILED)
+        self.assertIn('StockNotFoundException', daily_data.error)
+        self.assertNotIn('Traceback', daily_data.error)
+
+    def test_stale_running_jobs_are_requeued_then_failed(self):
+        job = enqueue_job('stock_ai_predict')
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.STATUS_RUNNING, attempts=1, started_at=timezone.now() - timedelta(days=1))
+
+        self.assertEqual(requeue_stale_jobs(), (1, 0))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_QUEUED)
+
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.STATUS_RUNNING, attempts=3, started_at=timezone.now() - timedelta(days=1))
+        self.assertEqual(requeue_stale_jobs(), (0, 1))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+
+
+def create_weekly_stocks(stock_count, days=30):
+    today = date.today()
+    weekly_recommendation = WeeklyRecommendation.objects.create(start_date=today, end_date=today + timedelta(days=6))
+    for i in range(stock_count):
+        stock = Stock.objects.create(isin_code=f'KR{i:010d}', srtn_code=f'{i:06d}', itms_name=f'종목{i}')
+        WeeklyRecommendationStock.objects.create(weekly_recommendation=weekly_recommendation, stock=stock)
+        DailyStockData.objects.bulk_create([
+            DailyStockData(
+                stock=stock, bas_dt=today - timedelta(days=day), clpr=100, hipr=110, lopr=90, mkp=95,
+                vs=5, flt_rt=1.5, trqu=1000, tr_prc=100000, lstg_st_cnt=10000, mrkt_tot_amt=1000000,
+            )
+            for day in range(days)
+        ])
+    invalidate_trading_calendar()
+    return weekly_recommendation
+
+
+class LatestWeeklyStocksDataViewTest(TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def test_query_count_does_not_grow_with_stock_count(self):
+        build_query_counts = []
+        for stock_count in (1, 10):
+            with self.subTest(stock_count=stock_count):
+                WeeklyRecommendation.objects.all().delete()
+                Stock.objects.all().delete()
+                create_weekly_stocks(stock_count)
+
+                get_trading_calendar()  # 프로세스 캐시에 거래일 달력을 미리 만들어 둠
+
+                # 첫 요청은 스냅샷 생성 (종목 수와 관계없이 같은 쿼리 수)
+                with CaptureQueriesContext(connection) as queries:
+                    self.client.get('/stocks/weekly/latest/')
+                build_query_counts.append(len(queries))
+
+                # 이후 요청은 스냅샷 한 건 조회
+                with self.assertNumQueries(1):
+                    response = self.client.get('/stocks/weekly/latest/')
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.json()), stock_count)
+                self.assertTrue(all(len(stock['daily_stock_data']) == 30 for stock in response.json()))
+        self.assertEqual(build_query_counts[0], build_query_counts[1])
+
+    def test_snapshot_includes_latest_test_and_predict_results(self):
+        weekly_recommendation = create_weekly_stocks(2, days=5)
+        stock = Stock.objects.order_by('id').first()
+        WeeklyRecommendationStockTestResult.objects.create(
+            stock=stock, weekly_recommendation=weekly_recommendation, profit=Decimal('1.5'), test_runs=10)
+        WeeklyRecommendationStockTestResult.objects.create(
+            stock=stock, weekly_recommendation=weekly_recommendation, profit=Decimal('2.25'), test_runs=10)
+        WeeklyRecommendationStockPredictResult.objects.create(
+            stock=stock, weekly_recommendation=weekly_recommendation, action='buy', target_date=date(2024, 1, 2))
+
+        first, second = self.client.get('/stocks/weekly/latest/').json()
+
+        self.assertEqual(first['test_result']['average_profit'], '2.25')
+        self.assertEqual(first['predict_result'], {'action': 'buy', 'target_date': '2024-01-02'})
+        self.assertIsNone(second['test_result'])
+        self.assertIsNone(second['predict_result'])
+
+    def test_gzip_payload_is_served_as_is(self):
+        create_weekly_stocks(1, days=5)
+        plain = self.client.get('/stocks/weekly/latest/')
+        compressed = self.client.get('/stocks/weekly/latest/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertEqual(compressed['ETag'], plain['ETag'])
+
+    def test_successful_job_rebuilds_snapshot(self):
+        create_weekly_stocks(1, days=5)
+        self.client.get('/stocks/weekly/latest/')
+        WeeklyRecommendationSnapshot.objects.update(data_version=None, stock_count=0)
+
+        with mock.patch('stocks.views.StockAIPredictView.predict_and_save_weekly_stocks', return_value={}):
+            run_job(enqueue_job('stock_ai_predict'))
+
+        self.assertEqual(WeeklyRecommendationSnapshot.objects.get().stock_count, 1)
+
+
+class BatchPredictTest(TestCase):
+    def test_batched_requests_saved_with_one_upsert(self):
+        create_weekly_stocks(5, days=1)
+        with PredictStubServer(action='BUY') as stub:
+            with self.settings(AI_PREDICT_URL=f'{stub.url}/api/predict/', AI_PREDICT_BATCH_SIZE=2):
+                StockAIPredictView().predict_and_save_weekly_stocks()
+                stub.action = 'SELL'
+                StockAIPredictView().predict_and_save_weekly_stocks()
+
+        # 5 종목을 2 종목씩 묶어 3 번 요청
+        self.assertEqual(stub.request_count, 6)
+        self.assertEqual(sorted(len(params['stocks'].split(',')) for params in stub.requested_params[:3]), [1, 2, 2])
+        # 다시 예측해도 (stock, weekly_recommendation, target_date) 당 한 건만 남고 action 이 갱신된다
+        self.assertEqual(WeeklyRecommendationStockPredictResult.objects.count(), 5)
+        self.assertEqual(set(WeeklyRecommendationStockPredictResult.objects.values_list('action', flat=True)), {'SELL'})
+
+    def test_repeated_per_stock_predictions_update_existing_rows(self):
+        create_weekly_stocks(2, days=1)
+        with PredictStubServer(action='BUY') as stub:
+            with self.settings(AI_PREDICT_URL=f'{stub.url}/api/predict/'):
+                StockAIPredictView().predict_and_save_weekly_stocks()
+                stub.action = 'SELL'
+                StockAIPredictView().predict_and_save_weekly_stocks()
+
+        self.assertEqual(stub.request_count, 4)
+        self.assertEqual(WeeklyRecommendationStockPredictResult.objects.count(), 2)
+        self.assertEqual(set(WeeklyRecommendationStockPredictResult.objects.values_list('action', flat=True)), {'SELL'})
+
+    def test_duplicate_results_are_merged(self):
+        create_weekly_stocks(1, days=1)
+        stock, weekly_recommendation = Stock.objects.get(), WeeklyRecommendation.objects.get()
+        results = [(stock, {'action': 'BUY', 'target_date': '2024-01-02'}),
+                   (stock, {'action': 'SELL', 'target_date': '2024-01-02'})]
+
+        with self.assertNumQueries(1):
+            StockAIPredictView().save_prediction_results_to_db(results, weekly_recommendation)
+        self.assertEqual(WeeklyRecommendationStockPredictResult.objects.get().action, 'SELL')
+
+
+class AsyncViewTest(TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    async def test_async_latest_weekly_matches_sync_view(self):
+        await sync_to_async(create_weekly_stocks)(2, days=5)
+        sync_response = await sync_to_async(self.client.get)('/stocks/weekly/latest/?format=columnar')
+        async_response = await self.async_client.get('/stocks/async/weekly/latest/?format=columnar')
+
+        self.assertEqual(async_response.status_code, 200)
+        self.assertEqual(async_response.content, sync_response.content)
+        self.assertEqual(async_response['ETag'], sync_response['ETag'])
+
+        not_modified = await self.async_client.get(
+            '/stocks/async/weekly/latest/?format=columnar', headers={'If-None-Match': async_response['ETag']})
+        self.assertEqual(not_modified.status_code, 304)
+
+    async def test_async_result_views_match_sync_views(self):
+        weekly_recommendation = await sync_to_async(create_weekly_stocks)(1, days=5)
+        stock = await Stock.objects.afirst()
+        await WeeklyRecommendationStockTestResult.objects.acreate(
+            stock=stock, weekly_recommendation=weekly_recommendation, profit=Decimal('1.5'), test_runs=10)
+        await WeeklyRecommendationStockPredictResult.objects.acreate(
+            stock=stock, weekly_recommendation=weekly_recommendation, action='buy', target_date=date(2024, 1, 2))
+
+        for path in ('weekly/latest/test/', 'weekly/latest/predict/'):
+            with self.subTest(path=path):
+                sync_response = await sync_to_async(self.client.get)(f'/stocks/{path}{stock.isin_code}')
+                async_response = await self.async_client.get(f'/stocks/async/{path}{stock.isin_code}')
+                self.assertEqual(async_response.status_code, 200)
+                self.assertEqual(async_response.json(), sync_response.json())
+
+                not_modified = await self.async_client.get(
+                    f'/stocks/async/{path}{stock.isin_code}', headers={'If-None-Match': async_response['ETag']})
+                self.assertEqual(not_modified.status_code, 304)
+
+                missing_sync = await sync_to_async(self.client.get)(f'/stocks/{path}KR9999999999')
+                missing_async = await self.async_client.get(f'/stocks/async/{path}KR9999999999')
+                self.assertEqual((missing_async.status_code, missing_async.json()),
+                                 (missing_sync.status_code, missing_sync.json()))
+                self.assertEqual(missing_async.status_code, 404)
+
+    async def test_async_empty_week_matches_sync_view(self):
+        await WeeklyRecommendation.objects.acreate(start_date=date.today(), end_date=date.today() + timedelta(days=6))
+        sync_response = await sync_to_async(self.client.get)('/stocks/weekly/latest/')
+        async_response = await self.async_client.get('/stocks/async/weekly/latest/')
+
+        self.assertEqual(sync_response.status_code, 204)
+        self.assertEqual((async_response.status_code, async_response.content),
+                         (sync_response.status_code, sync_response.content))
+
+    async def test_async_trigger_enqueues_job(self):
+        headers = {'Idempotency-Key': 'weekly-test'}
+        response = await self.async_client.post('/stocks/async/weekly/latest/test/', headers=headers)
+        again = await self.async_client.post('/stocks/async/weekly/latest/test/', headers=headers)
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(again.json()['job_id'], response.json()['job_id'])
+        job = await Job.objects.aget(pk=response.json()['job_id'])
+        self.assertEqual(job.kind, 'stock_ai_test')
+
+
+class StockSearchTest(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        sync_stocks([
+            {'isinCd': 'KR7005930003', 'srtnCd': '005930', 'itmsNm': '삼성전자', 'mrktCtg': 'KOSPI'},
+            {'isinCd': 'KR7005935002', 'srtnCd': '005935', 'itmsNm': '삼성전자우', 'mrktCtg': 'KOSPI'},
+            {'isinCd': 'KR7028260008', 'srtnCd': '028260', 'itmsNm': '삼성물산', 'mrktCtg': 'KOSPI'},
+            {'isinCd': 'KR7032830002', 'srtnCd': '032830', 'itmsNm': '삼성생명', 'mrktCtg': 'KOSPI'},
+            {'isinCd': 'KR7000660001', 'srtnCd': '000660', 'itmsNm': 'SK하이닉스', 'mrktCtg': 'KOSPI'},
+        ])
+
+    def search(self, query, **params):
+        response = self.client.get('/stocks/search/', {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [stock['itms_name'] for stock in response.json()]
+
+    def test_prefix_substring_and_code_lookup(self):
+        self.assertEqual(self.search('삼성전자'), ['삼성전자', '삼성전자우'])
+        self.assertEqual(self.search('전자'), ['삼성전자', '삼성전자우'])
+        self.assertEqual(self.search('sk하이'), ['SK하이닉스'])
+        self.assertEqual(self.search('0059'), ['삼성전자', '삼성전자우'])
+        self.assertEqual(self.search('KR70006'), ['SK하이닉스'])
+        self.assertEqual(self.search('삼성', limit=2), ['삼성물산', '삼성생명'])
+
+    def test_chosung_partial_jamo_and_mixed_queries(self):
+        self.assertEqual(self.search('ㅅㅅㅈㅈ'), ['삼성전자', '삼성전자우'])
+        self.assertEqual(self.search('삼성저'), ['삼성전자', '삼성전자우'])
+        self.assertEqual(self.search('삼ㅅ물'), ['삼성물산'])
+        self.assertEqual(self.search('ㅈㅈㅇ'), ['삼성전자우'])
+        self.assertEqual(self.search('ㅎㅇㄴ'), ['SK하이닉스'])
+        # 받침이 다음 글자의 초성이 되는 입력 중 상태
+        self.assertEqual(self.search('삼성생며'), ['삼성생명'])
+        self.assertEqual(self.search('삼성물삭'), [])
+
+    def test_sync_fills_jamo_and_chosung_columns(self):
+        stock = Stock.objects.get(isin_code='KR7005930003')
+        self.assertEqual(stock.itms_name_chosung, 'ㅅㅅㅈㅈ')
+        self.assertEqual(stock.itms_name_jamo, 'ㅅㅏㅁㅅㅓㅇㅈㅓㄴㅈㅏ')
+
+    def test_served_from_memory_and_rebuilt_after_sync(self):
+        get_stock_search_index()
+        with self.assertNumQueries(0):
+            self.search('삼성')
+
+        sync_stocks([{'isinCd': 'KR7035420009', 'srtnCd': '035420', 'itmsNm': 'NAVER', 'mrktCtg': 'KOSPI'}])
+        self.assertEqual(self.search('nav'), ['NAVER'])
+
+    def test_invalid_params(self):
+        self.assertEqual(self.client.get('/stocks/search/').status_code, 400)
+        self.assertEqual(self.client.get('/stocks/search/', {'q': '삼성', 'limit': '0'}).status_code, 400)
+
+
+@modify_settings(MIDDLEWARE={'prepend': 'stocks.middleware.MetricsMiddleware'})
+class MetricsTest(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        REGISTRY.reset()
+
+    def test_request_latency_and_db_queries_per_url_name(self):
+        create_weekly_stocks(1, days=5)
+        self.client.get('/stocks/weekly/latest/')  # 스냅샷 생성
+        REGISTRY.reset()
+        self.client.get('/stocks/weekly/latest/')
+        self.client.get('/stocks/no-such-path/')
+
+        self.assertEqual(REQUEST_DURATION.get(url_name='latest_weekly_stocks', method='GET', status=200)[0], 1)
+        # 스냅샷 한 건 조회
+        self.assertEqual(REQUEST_DB_QUERIES.get(url_name='latest_weekly_stocks'), (1, 1))
+        self.assertEqual(REQUEST_DURATION.get(url_name='unmatched', method='GET', status=404)[0], 1)
+
+    async def test_async_view_queries_are_counted(self):
+        await sync_to_async(create_weekly_stocks)(1, days=5)
+        stock = await Stock.objects.afirst()
+        await self.async_client.get(f'/stocks/async/weekly/latest/predict/{stock.isin_code}')
+
+        # 응답 캐시 키 (최신 주차) + 종목 + 예측 결과
+        self.assertEqual(REQUEST_DB_QUERIES.get(url_name='async_latest_weekly_stocks_predict_data'), (1, 3))
+
+    def test_outbound_requests_and_jobs(self):
+        with FlakyStubServer(failures=1) as stub:
+            HttpClient(max_retries=1, backoff_factor=0).get(stub.url)
+            host = stub.url.split('//')[1]
+        with mock.patch('stocks.views.StockAIPredictView.predict_and_save_weekly_stocks', return_value={}):
+            run_job(enqueue_job('stock_ai_predict'))
+
+        self.assertEqual(OUTBOUND_DURATION.get(host=host, outcome='error')[0], 1)
+        self.assertEqual(OUTBOUND_DURATION.get(host=host, outcome='ok')[0], 1)
+        self.assertEqual(JOB_DURATION.get(kind='stock_ai_predict', status=Job.STATUS_SUCCEEDED)[0], 1)
+
+    def test_metrics_endpoint_text_format(self):
+        self.client.get('/stocks/search/', {'q': '삼성'})
+        response = self.client.get('/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('# TYPE stopickr_http_request_duration_seconds histogram', body)
+        self.assertIn('stopickr_http_request_duration_seconds_count{url_name="stock_search",method="GET",status="200"} 1',
+                      body)
+        self.assertIn('stopickr_http_request_db_queries_bucket{url_name="stock_search",le="+Inf"} 1', body)
+
+        with self.settings(METRICS_TOKEN='secret'):
+            self.assertEqual(self.client.get('/metrics').status_code, 403)
+            self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret').status_code, 200)
+
+
+@modify_settings(MIDDLEWARE={'prepend': 'stocks.middleware.ProfilingMiddleware'})
+class ProfilingTest(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.report_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.report_dir)
+
+    def test_fingerprint_replaces_literals(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t" WHERE "id" = 12 AND "d" IN (\'2024-01-02\', \'2024-01-03\')'),
+            'SELECT * FROM "t" WHERE "id" = ? AND "d" IN (?)')
+
+    def test_header_profiles_request_and_report_ranks_endpoints(self):
+        create_weekly_stocks(2, days=5)
+        with self.settings(PROFILING_TOKEN='secret', PROFILING_REPORT_DIR=self.report_dir):
+            self.assertNotIn('X-Profile-Queries', self.client.get('/stocks/weekly/latest/'))
+            for stock in Stock.objects.all():
+                response = self.client.get(f'/stocks/weekly/latest/test/{stock.isin_code}', HTTP_X_PROFILE='secret')
+
+        self.assertEqual(response['X-Profile-Queries'], '4')
+        reports = load_reports(self.report_dir)
+        self.assertEqual(len(reports), 2)
+        self.assertEqual(reports[0]['url_name'], 'latest_weekly_stocks_test_data')
+        self.assertEqual(reports[0]['query_count'], 4)
+        self.assertIn('cumulative', reports[0]['profile'])
+
+        out = io.StringIO()
+        call_command('profile_report', dir=self.report_dir, stdout=out)
+        self.assertIn('latest_weekly_stocks_test_data', out.getvalue())
+
+    def test_sampling_setting_profiles_without_header(self):
+        with self.settings(PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=1.0, PROFILING_REPORT_DIR=self.report_dir):
+            response = self.client.get('/stocks/search/', {'q': '삼성'})
+
+        self.assertIn('X-Profile-Report', response)
+        self.assertEqual(load_reports(self.report_dir)[0]['url_name'], 'stock_search')
+
+
+class QueryBudgetTest(QueryBudgetTestMixin, TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def test_read_views_stay_within_query_budget(self):
+        create_weekly_stocks(3, days=5)
+        stock = Stock.objects.first()
+        WeeklyRecommendationStockTestResult.objects.create(
+            stock=stock, weekly_recommendation=WeeklyRecommendation.objects.first(), profit=1.0)
+        WeeklyRecommendationStockPredictResult.objects.create(
+            stock=stock, weekly_recommendation=WeeklyRecommendation.objects.first(), action='BUY',
+            target_date=date.today())
+        self.client.get('/stocks/weekly/latest/')  # 스냅샷 생성
+        self.client.get('/stocks/search/', {'q': '종목'})  # 검색 인덱스 생성
+
+        self.assertWithinQueryBudget('/stocks/weekly/latest/')
+        self.assertWithinQueryBudget('/stocks/search/', {'q': '종목'})
+        self.assertWithinQueryBudget(f'/stocks/weekly/latest/test/{stock.isin_code}')
+        self.assertWithinQueryBudget(f'/stocks/weekly/latest/predict/{stock.isin_code}')
+        self.assertWithinQueryBudget(f'/stocks/jobs/{enqueue_job("stock_ai_predict").pk}/')
+
+    def test_over_budget_lists_repeated_queries(self):
+        create_weekly_stocks(3, days=5)
+
+        with self.assertRaisesMessage(AssertionError, 'query budget 0'):
+            self.assertWithinQueryBudget('/stocks/weekly/latest/', budget=0)
+
+
+class ResponseCacheTest(TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def test_second_request_is_served_from_cache(self):
+        create_weekly_stocks(3)
+        first = self.client.get('/stocks/weekly/latest/')
+
+        with self.assertNumQueries(1):
+            second = self.client.get('/stocks/weekly/latest/')
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_conditional_request_returns_304(self):
+        create_weekly_stocks(1)
+        first = self.client.get('/stocks/weekly/latest/')
+
+        response = self.client.get('/stocks/weekly/latest/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get('/stocks/weekly/latest/', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    @override_settings(STOCKS_CACHE_SHARED=True)
+    def test_writing_daily_stock_data_invalidates_cache(self):
+        create_weekly_stocks(1, days=5)
+        first = self.client.get('/stocks/weekly/latest/')
+
+        stock = Stock.objects.get()
+        rows = build_daily_stock_data_rows(stock, make_stock_price_items(1, start_ordinal=(date.today() - timedelta(days=10)).toordinal()))
+        bulk_upsert_daily_stock_data(rows)
+
+        second = self.client.get('/stocks/weekly/latest/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(len(second.json()[0]['daily_stock_data']), 6)
+
+    def test_result_views_send_last_modified_only_with_shared_cache(self):
+        create_weekly_stocks(1, days=1)
+        stock = Stock.objects.get()
+        WeeklyRecommendationStockPredictResult.objects.create(
+            stock=stock, weekly_recommendation=WeeklyRecommendation.objects.get(), action='BUY',
+            target_date=date.today())
+        url = f'/stocks/weekly/latest/predict/{stock.isin_code}'
+
+        # local memory 캐시: 다른 프로세스의 저장을 알 수 없으므로 If-Modified-Since 로 304 를 주지 않는다
+        first = self.client.get(url)
+        self.assertNotIn('Last-Modified', first)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE='Fri, 31 Dec 9999 23:59:59 GMT')
+        self.assertEqual(response.status_code, 200)
+
+        with self.settings(STOCKS_CACHE_SHARED=True):
+            get_cache().clear()
+            self.assertIn('Last-Modified', self.client.get(url))
+
+    def test_local_cache_does_not_rebuild_snapshot_on_version_mismatch(self):
+        create_weekly_stocks(1, days=5)
+        self.client.get('/stocks/weekly/latest/')
+        # 다른 프로세스 (작업 worker) 의 버전으로 만든 스냅샷
+        WeeklyRecommendationSnapshot.objects.update(data_version=12345)
+
+        with self.assertNumQueries(1):
+            self.client.get('/stocks/weekly/latest/')
+
+    def test_local_cache_serves_new_week_and_stock_changes(self):
+        create_weekly_stocks(1, days=5)
+        self.assertEqual(len(self.client.get('/stocks/weekly/latest/').json()), 1)
+
+        # 작업을 거치지 않고 (admin) 새 주차와 추천 종목을 추가
+        start_date = date.today() + timedelta(days=7)
+        weekly_recommendation = WeeklyRecommendation.objects.create(
+            start_date=start_date, end_date=start_date + timedelta(days=6))
+        for stock in Stock.objects.all():
+            WeeklyRecommendationStock.objects.create(weekly_recommendation=weekly_recommendation, stock=stock)
+        WeeklyRecommendationStock.objects.create(
+            weekly_recommendation=weekly_recommendation,
+            stock=Stock.objects.create(isin_code='KR7000000002', srtn_code='000002', itms_name='새 종목'))
+        self.assertEqual(len(self.client.get('/stocks/weekly/latest/').json()), 2)
+        self.assertEqual(WeeklyRecommendationSnapshot.objects.latest('start_date').weekly_recommendation_id,
+                         weekly_recommendation.id)
+
+        WeeklyRecommendationStock.objects.filter(stock__isin_code='KR7000000002').get().delete()
+        self.assertEqual(len(self.client.get('/stocks/weekly/latest/').json()), 1)
+
+
+class DailyStockDataSerializationTest(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        create_weekly_stocks(2, days=5)
+
+    def test_fast_rows_match_drf_serializer(self):
+        rows = DailyStockData.objects.order_by('id')
+        expected = DailyStockDataSerializer(rows, many=True).data
+
+        self.assertEqual(serialize_daily_stock_data_rows(rows.values_list(*DAILY_STOCK_DATA_FIELDS)), expected)
+
+    def test_row_format_is_default(self):
+        response = self.client.get('/stocks/weekly/latest/')
+
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(len(response.json()[0]['daily_stock_data']), 5)
+        self.assertEqual(response.json()[0]['daily_stock_data'][0]['vs'], '5.00')
+
+    def test_columnar_format_by_query_param_and_accept_header(self):
+        by_query = self.client.get('/stocks/weekly/latest/?format=columnar')
+        by_accept = self.client.get('/stocks/weekly/latest/', HTTP_ACCEPT=ColumnarJSONRenderer.media_type)
+
+        for response in (by_query, by_accept):
+            daily_stock_data = json.loads(response.content)[0]['daily_stock_data']
+            self.assertEqual(list(daily_stock_data), list(DAILY_STOCK_DATA_FIELDS))
+            self.assertEqual(len(daily_stock_data['bas_dt']), 5)
+            self.assertEqual(daily_stock_data['flt_rt'], ['1.50'] * 5)
+
+
+@override_settings(PUBLIC_DATA_SECRET_KEY='test-key')
+class DailyStockDataDeltaSyncTest(TestCase):
+    def setUp(self):
+        self.weekly_recommendation = create_weekly_stocks(1, days=0)
+        self.stock = Stock.objects.get()
+        start_ordinal = (date.today() - timedelta(days=400)).toordinal()
+        self.items = make_stock_price_items(401, isin_code=self.stock.isin_code, start_ordinal=start_ordinal)
+
+    def sync(self, mode=SYNC_MODE_INCREMENTAL):
+        with PublicDataStubServer(self.items) as stub, override_settings(PUBLIC_DATA_STOCK_PRICE_URL=stub.url):
+            saved = FetchWeeklyStockDailyDataView().fetch_and_save_weekly_stocks_data(mode=mode)
+        return saved, stub.requested_params
+
+    def test_first_sync_backfills_then_only_new_days_are_requested(self):
+        saved, params = self.sync()
+        self.assertEqual(saved, 366)
+        self.assertEqual(params[0]['beginBasDt'], (date.today() - timedelta(days=365)).strftime('%Y%m%d'))
+        self.assertEqual(self.stock.sync_state.last_bas_dt, date.today())
+
+        # 다음 날 데이터가 추가되면 그 날만 요청한다
+        self.stock.sync_state.last_bas_dt = date.today() - timedelta(days=1)
+        self.stock.sync_state.save()
+        saved, params = self.sync()
+        self.assertEqual(saved, 1)
+        self.assertEqual(params[0]['beginBasDt'], date.today().strftime('%Y%m%d'))
+
+    def test_up_to_date_stock_makes_no_request(self):
+        self.sync()
+        saved, params = self.sync()
+
+        self.assertEqual(saved, 0)
+        self.assertEqual(params, [])
+
+    def test_backfill_mode_refetches_window(self):
+        self.sync()
+        saved, params = self.sync(mode=SYNC_MODE_BACKFILL)
+
+        self.assertEqual(saved, 366)
+        self.assertEqual(DailyStockData.objects.count(), 366)
+
+
+@override_settings(PUBLIC_DATA_SECRET_KEY='test-key')
+class MarketDailyStockDataIngestionTest(TransactionTestCase):
+    def test_range_ingestion_writes_every_stock_per_trading_day(self):
+        monday = date(2024, 1, 1)
+        items = []
+        for i in range(30):
+            items += make_stock_price_items(7, isin_code=f'KR7{i:09d}', start_ordinal=monday.toordinal())
+        Stock.objects.create(isin_code='KR7000000000', srtn_code='000000', itms_name='기존 종목')
+
+        with PublicDataStubServer(items) as stub, override_settings(PUBLIC_DATA_STOCK_PRICE_URL=stub.url):
+            saved = ingest_market_daily_stock_data_range(monday, monday + timedelta(days=6), max_workers=3)
+
+        # 주말은 요청하지 않고, 새 종목은 종목 마스터에 추가된다
+        self.assertEqual(len(saved), 5)
+        self.assertTrue(all(row_count == 30 for row_count in saved.values()))
+        self.assertEqual({params['basDt'] for params in stub.requested_params}, {bas_dt.replace('-', '') for bas_dt in saved})
+        self.assertEqual(Stock.objects.count(), 30)
+        self.assertEqual(DailyStockData.objects.count(), 150)
+        # 기존 종목의 종목 명은 과거 날짜 item 으로 덮어쓰지 않는다
+        self.assertEqual(Stock.objects.get(isin_code='KR7000000000').itms_name, '기존 종목')
+
+
+class ExportDailyStockDataViewTest(TestCase):
+    def setUp(self):
+        create_weekly_stocks(2, days=5)
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_superuser('admin@example.com', 'password'))
+        self.start_date = (date.today() - timedelta(days=10)).isoformat()
+
+    def export(self, **params):
+        return self.client.get('/stocks/daily-data/export/', {'start_date': self.start_date, **params})
+
+    @override_settings(EXPORT_CHUNK_SIZE=3)
+    def test_ndjson_streams_every_row(self):
+        response = self.export(format='ndjson')
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], NDJSONRenderer.media_type)
+        records = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(len(records), 10)
+        self.assertEqual(records[0]['isin_code'], 'KR0000000000')
+        self.assertEqual(records[0]['flt_rt'], '1.50')
+
+    def test_keyset_pages_without_server_side_cursors(self):
+        expected = [row for chunk in exports.iter_daily_stock_data_chunks(self.start_date, date.today()) for row in chunk]
+        with mock.patch.dict(connection.settings_dict, {'DISABLE_SERVER_SIDE_CURSORS': True}), \
+                CaptureQueriesContext(connection) as queries:
+            chunks = list(exports.iter_daily_stock_data_chunks(self.start_date, date.today(), chunk_size=3))
+
+        self.assertEqual([row for chunk in chunks for row in chunk], expected)
+        # Stock 조회 1번 + 3건씩 4페이지
+        self.assertEqual(len(queries), 5)
+
+    def test_csv_filters_by_isin_codes(self):
+        response = self.export(format='csv', isin_codes='KR0000000001')
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(','), ['isin_code'] + list(DAILY_STOCK_DATA_FIELDS))
+        self.assertEqual(len(lines), 6)
+        self.assertTrue(all(line.startswith('KR0000000001,') for line in lines[1:]))
+
+    @skipUnless(exports.pyarrow, "pyarrow 가 필요합니다.")
+    @override_settings(EXPORT_CHUNK_SIZE=3)
+    def test_parquet_is_readable(self):
+        import pyarrow.parquet
+
+        response = self.export(format='parquet')
+
+        table = pyarrow.parquet.read_table(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(table.num_rows, 10)
+        self.assertEqual(table.column('flt_rt').to_pylist(), [1.5] * 10)
+
+    def test_invalid_params_return_json_error(self):
+        response = self.export(format='csv', isin_codes='KR9999999999')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+    def test_admin_only(self):
+        self.client.force_authenticate(None)
+        self.assertIn(self.export(format='ndjson').status_code, (401, 403))
+
+
+class TimeSeriesStoreTest(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.store = TimeSeriesStore(self.root)
+        self.stock = Stock.objects.create(isin_code='KR7000000001', srtn_code='000001', itms_name='종목')
+        self.monday = date(2024, 1, 1)
+        self.save_items(self.monday, 5)
+
+    def save_items(self, start, count):
+        bulk_upsert_daily_stock_data(build_daily_stock_data_rows(
+            self.stock, make_stock_price_items(count, isin_code=self.stock.isin_code, start_ordinal=start.toordinal())))
+
+    def test_window_is_zero_copy_slice(self):
+        self.store.update()
+
+        window = self.store.window(self.stock.isin_code, date(2024, 1, 2), date(2024, 1, 4), ['bas_dt', 'clpr'])
+
+        self.assertEqual(np.datetime_as_string(window.columns['bas_dt']).tolist(), ['2024-01-02', '2024-01-03', '2024-01-04'])
+        self.assertIsInstance(window.columns['clpr'].base, np.memmap)
+
+    def test_incremental_update_appends_new_rows_only(self):
+        self.assertEqual(self.store.update(), {self.stock.isin_code: 5})
+        self.assertEqual(self.store.update(), {})
+
+        self.save_items(self.monday + timedelta(days=5), 2)
+        self.assertEqual(self.store.update(), {self.stock.isin_code: 2})
+
+        # 이전 구간이 채워지면 (백필) 전체를 다시 만든다
+        self.save_items(self.monday - timedelta(days=3), 3)
+        self.assertEqual(self.store.update(), {self.stock.isin_code: 10})
+        self.assertEqual(len(self.store.load(self.stock.isin_code)['bas_dt']), 10)
+
+
+class LocalBacktestEngineTest(TestCase):
+    def prices(self, close, test_start_index=0):
+        close = np.asarray(close, dtype='float64')
+        return BacktestPrices(None, close, close, close, test_start_index)
+
+    def test_rising_prices_are_profitable_without_drawdown(self):
+        profit, max_drawdown = simulate_moving_average_strategy(
+            self.prices(np.arange(100, 140)), 1000, runs=5, window=3, fee_rate=0)
+
+        self.assertEqual(profit.shape, (5,))
+        self.assertTrue((profit > 0).all())
+        self.assertTrue((max_drawdown == 0).all())
+
+    def test_runs_spread_with_intraday_range(self):
+        close = np.r_[np.arange(100, 120), np.arange(120, 100, -1)].astype('float64')
+        prices = BacktestPrices(None, close * 1.05, close * 0.95, close, 5)
+
+        profit, max_drawdown = simulate_moving_average_strategy(prices, 1000, runs=200, window=3, seed=1)
+
+        self.assertGreater(profit.std(), 0)
+        self.assertTrue((max_drawdown > 0).all())
+
+    def test_run_local_backtests_reads_prices_from_db(self):
+        weekly_recommendation = create_weekly_stocks(2, days=60)
+        stocks = [weekly_stock.stock for weekly_stock in weekly_recommendation.weeklyrecommendationstock_set.all()]
+        calendar = get_trading_calendar()
+        end_date = calendar.on_or_before(date.today())
+        window = BacktestWindow(None, calendar.trading_days_before(end_date, 20), end_date)
+
+        results = run_local_backtests([(stock, 1000) for stock in stocks], window, 5, runs=10, seed=0)
+
+        self.assertEqual(set(results), {stock.id for stock in stocks})
+        self.assertTrue(all(result.runs == 10 for result in results.values()))
+
+
+class DailyIndicatorTest(TestCase):
+    def setUp(self):
+        self.stock = Stock.objects.create(isin_code='KR7000000001', srtn_code='000001', itms_name='종목')
+        self.monday = date(2024, 1, 1)
+
+    def save_items(self, start_ordinal, count):
+        bulk_upsert_daily_stock_data(build_daily_stock_data_rows(
+            self.stock, make_stock_price_items(count, isin_code=self.stock.isin_code, start_ordinal=start_ordinal)))
+        invalidate_trading_calendar()
+
+    def test_rolling_windows(self):
+        indicators = compute_indicators(np.arange(1, 81, dtype='float64'))
+
+        self.assertTrue(np.isnan(indicators['ma5'][3]))
+        self.assertEqual(indicators['ma5'][4], 3.0)
+        self.assertEqual(indicators['ma60'][79], 50.5)
+        # 계속 오르기만 하면 RSI 100
+        self.assertTrue(np.isnan(indicators['rsi14'][13]))
+        self.assertEqual(indicators['rsi14'][14], 100.0)
+        self.assertTrue(np.isnan(indicators['volatility20'][19]))
+        self.assertGreater(indicators['volatility20'][20], 0)
+
+    def test_incremental_update_matches_full_recompute(self):
+        self.save_items(self.monday.toordinal(), 100)
+        self.assertEqual(update_daily_indicators(), {self.stock.id: 100})
+        self.assertEqual(update_daily_indicators(), {})
+
+        self.save_items(self.monday.toordinal() + 100, 3)
+        self.assertEqual(update_daily_indicators(), {self.stock.id: 3})
+
+        incremental = list(DailyIndicator.objects.order_by('bas_dt').values_list(*INDICATOR_FIELDS))
+        update_daily_indicators(full=True)
+        self.assertEqual(list(DailyIndicator.objects.order_by('bas_dt').values_list(*INDICATOR_FIELDS)), incremental)
+
+    def test_latest_weekly_includes_indicators_on_request(self):
+        get_cache().clear()
+        create_weekly_stocks(1, days=30)
+        update_daily_indicators()
+
+        plain = self.client.get('/stocks/weekly/latest/').json()[0]
+        included = self.client.get('/stocks/weekly/latest/?include=indicators').json()[0]
+
+        self.assertNotIn('indicators', plain)
+        self.assertEqual(len(included['indicators']), 30)
+        self.assertEqual(included['indicators'][-1]['ma5'], '100.00')
+
+
+class TradingCalendarTest(SimpleTestCase):
+    def setUp(self):
+        # 2024-01-01(월) ~ 2024-01-12(금), 2024-01-03 휴장
+        holidays = {date(2024, 1, 3)}
+        self.calendar = TradingCalendar(TradingCalendar.weekdays(date(2024, 1, 1), date(2024, 1, 12), holidays))
+
+    def test_weekends_and_holidays_are_not_trading_days(self):
+        self.assertTrue(self.calendar.is_trading_day(date(2024, 1, 2)))
+        self.assertFalse(self.calendar.is_trading_day(date(2024, 1, 3)))
+        self.assertFalse(self.calendar.is_trading_day(date(2024, 1, 6)))
+
+    def test_trading_days_before_and_after(self):
+        self.assertEqual(self.calendar.trading_days_before(date(2024, 1, 8), 3), date(2024, 1, 2))
+        # 주말이면 직전 거래일 기준
+        self.assertEqual(self.calendar.trading_days_before(date(2024, 1, 7), 1), date(2024, 1, 4))
+        self.assertEqual(self.calendar.trading_days_after(date(2024, 1, 2), 1), date(2024, 1, 4))
+
+    def test_count_and_split(self):
+        self.assertEqual(self.calendar.count_between(date(2024, 1, 1), date(2024, 1, 12)), 9)
+        # 마지막 30% (2 거래일)
+        self.assertEqual(self.calendar.split(date(2024, 1, 1), date(2024, 1, 12), 0.3), date(2024, 1, 11))
+
+    def test_concurrent_requests_rebuild_calendar_once(self):
+        def slow_build():
+            time.sleep(0.05)
+            return self.calendar
+
+        invalidate_trading_calendar()
+        self.addCleanup(invalidate_trading_calendar)
+        with mock.patch.object(TradingCalendar, 'build', side_effect=slow_build) as build:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                calendars = list(executor.map(lambda _: get_trading_calendar(), range(8)))
+
+        self.assertEqual(build.call_count, 1)
+        self.assertTrue(all(calendar is self.calendar for calendar in calendars))
@@ -0,0 +1,168 @@
+"""
+종목별 일자별 데이터 columnar 저장소
+종목마다 DailyStockData 를 필드별 연속 NumPy 배열로 만들어 <TIMESERIES_STORE_DIR>/<isin_code>/<필드>.npy 로 저장한다.
+조회는 memory-map 으로 열어 기준일자 구간을 복사 없이 slice 로 반환하고,
+데이터 수집이 끝나면 마지막 저장 기준일자 이후의 row 만 읽어 이어 붙인다.
+"""
+import logging
+import os
+import threading
+from collections import namedtuple
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Count, Max
+
+from stocks.exceptions import TimeSeriesStoreDisabledException
+from stocks.models import DailyStockData, Stock
+from stocks.serializers import DAILY_STOCK_DATA_DECIMAL_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# 저장하는 필드와 dtype (Decimal 은 float64, 기준일자는 datetime64[D])
+TIMESERIES_FIELDS = ('bas_dt', 'clpr', 'hipr', 'lopr', 'mkp', 'vs', 'flt_rt', 'trqu', 'tr_prc', 'lstg_st_cnt',
+                     'mrkt_tot_amt')
+TIMESERIES_DTYPES = {
+    field: 'datetime64[D]' if field == 'bas_dt' else 'float64' if field in DAILY_STOCK_DATA_DECIMAL_FIELDS else 'int64'
+    for field in TIMESERIES_FIELDS
+}
+
+TimeSeriesWindow = namedtuple('TimeSeriesWindow', ['isin_code', 'columns'])
+
+
+class TimeSeriesStore:
+    def __init__(self, root):
+        self.root = str(root)
+
+    def stock_dir(self, isin_code):
+        return os.path.join(self.root, isin_code)
+
+    def load(self, isin_code, fields=None):
+        """
+        {필드: 읽기 전용 memmap} 반환 (저장된 데이터가 없으면 None)
+        """
+        columns = {}
+        for field in fields or TIMESERIES_FIELDS:
+            path = os.path.join(self.stock_dir(isin_code), f'{field}.npy')
+            if not os.path.exists(path):
+                return None
+            columns[field] = np.load(path, mmap_mode='r')
+        return columns
+
+    def window(self, isin_code, start_date, end_date, fields=None):
+        """
+        start_date ~ end_date 구간의 필드별 배열 (memmap 의 slice 이므로 복사하지 않는다)
+        """
+        fields = list(fields or TIMESERIES_FIELDS)
+        columns = self.load(isin_code, set(fields) | {'bas_dt'})
+        if columns is None:
+            return None
+
+        bas_dt = columns['bas_dt']
+        start = np.searchsorted(bas_dt, np.datetime64(start_date, 'D'), side='left')
+        end = np.searchsorted(bas_dt, np.datetime64(end_date, 'D'), side='right')
+        return TimeSeriesWindow(isin_code, {field: columns[field][start:end] for field in fields})
+
+    def update_stock(self, stock, full=False):
+        """
+        종목 하나의 배열을 갱신하고 새로 읽은 row 수를 반환
+        마지막 저장 기준일자 이후 row 만 이어 붙이며, 그 이전 구간이 바뀐 경우(백필 등)에는 전체를 다시 만든다.
+        """
+        existing = None if full else self.load(stock.isin_code)
+        if existing is not None and len({len(column) for column in existing.values()}) != 1:
+            # 필드 파일 길이가 다르면 (쓰는 도중 중단) 전체를 다시 만든다
+            existing = None
+
+        queryset = DailyStockData.objects.filter(stock_id=stock.id)
+        if existing is not None and len(existing['bas_dt']):
+            last_bas_dt = existing['bas_dt'][-1].item()
+            stored_count = len(existing['bas_dt'])
+            new_rows = list(queryset.filter(bas_dt__gt=last_bas_dt).order_by('bas_dt').values_list(*TIMESERIES_FIELDS))
+            if stored_count + len(new_rows) == queryset.count():
+                if new_rows:
+                    new_columns = self.to_columns(new_rows)
+                    self.write(stock.isin_code, {
+                        field: np.concatenate([existing[field], new_columns[field]]) for field in TIMESERIES_FIELDS
+                    })
+                return len(new_rows)
+
+        rows = list(queryset.order_by('bas_dt').values_list(*TIMESERIES_FIELDS))
+        self.write(stock.isin_code, self.to_columns(rows))
+        return len(rows)
+
+    def update(self, stocks=None, full=False):
+        """
+        종목별 배열을 갱신하고 {isin_code: 새로 읽은 row 수} 를 반환 (stocks 를 주지 않으면 데이터가 있는 전체 종목)
+        DB 의 (row 수, 마지막 기준일자) 가 저장된 배열과 같은 종목은 건너뛴다.
+        """
+        summaries = DailyStockData.objects.values('stock_id').annotate(count=Count('id'), last_bas_dt=Max('bas_dt'))
+        if stocks is not None:
+            summaries = summaries.filter(stock_id__in=[stock.id for stock in stocks])
+        summary_by_stock_id = {summary['stock_id']: summary for summary in summaries}
+        stocks = Stock.objects.filter(id__in=summary_by_stock_id)
+
+        updated = {}
+        for stock in stocks:
+            summary = summary_by_stock_id[stock.id]
+            if not full and self.is_up_to_date(stock.isin_code, summary['count'], summary['last_bas_dt']):
+                continue
+            updated[stock.isin_code] = self.update_stock(stock, full=full)
+        return updated
+
+    def is_up_to_date(self, isin_code, count, last_bas_dt):
+        columns = self.load(isin_code, ['bas_dt'])
+        if columns is None or len(columns['bas_dt']) != count:
+            return False
+        return count == 0 or columns['bas_dt'][-1].item() == last_bas_dt
+
+    def to_columns(self, rows):
+        values = list(zip(*rows)) if rows else [()] * len(TIMESERIES_FIELDS)
+        return {
+            field: np.array(column, dtype=TIMESERIES_DTYPES[field])
+            for field, column in zip(TIMESERIES_FIELDS, values)
+        }
+
+    def write(self, isin_code, columns):
+        """
+        필드별로 임시 파일에 쓴 뒤 rename (이미 memmap 으로 열어 둔 reader 는 이전 파일을 계속 읽는다)
+        기준일자 파일을 마지막에 바꿔 길이 검사로 중단된 쓰기를 알아챌 수 있게 한다.
+        """
+        directory = self.stock_dir(isin_code)
+        os.makedirs(directory, exist_ok=True)
+        for field in sorted(TIMESERIES_FIELDS, key=lambda name: name == 'bas_dt'):
+            path = os.path.join(directory, f'{field}.npy')
+            temp_path = f'{path}.tmp'
+            with open(temp_path, 'wb') as f:
+                np.save(f, np.ascontiguousarray(columns[field], dtype=TIMESERIES_DTYPES[field]))
+            os.replace(temp_path, path)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_timeseries_store():
+    """
+    settings.TIMESERIES_STORE_DIR 에 저장하는 프로세스 공용 저장소 (설정하지 않으면 TimeSeriesStoreDisabledException)
+    """
+    global _store
+    root = getattr(settings, 'TIMESERIES_STORE_DIR', None)
+    if not root:
+        raise TimeSeriesStoreDisabledException()
+    with _store_lock:
+        if _store is None or _store.root != str(root):
+            _store = TimeSeriesStore(root)
+        return _store
+
+
+def update_timeseries_store(stocks=None):
+    """
+    저장소가 설정된 경우에만 증분 갱신 (데이터 수집 작업이 끝난 뒤 호출)
+    """
+    try:
+        store = get_timeseries_store()
+    except TimeSeriesStoreDisabledException:
+        return {}
+    updated = store.update(stocks)
+    logger.info(f"시계열 저장소 {len(updated)}종목, {sum(updated.values())}건 갱신")
+    return updated
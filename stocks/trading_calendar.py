@@ -0,0 +1,150 @@
+"""
+KRX 거래일 달력
+DailyStockData 에 저장된 기준일자(실제 거래일)와 MarketHoliday 로 정렬된 거래일 배열을 만들고,
+"X 의 N 거래일 전" 같은 질의를 bisect 로 O(log n) 에 답한다.
+저장된 데이터가 없는 구간은 평일 중 휴장일을 뺀 날을 거래일로 간주한다.
+달력은 프로세스 단위로 캐시되며, 일별 데이터나 휴장일이 바뀌면 invalidate_trading_calendar() 로 다시 만든다.
+"""
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import date, timedelta
+
+from stocks.cache import get_cache
+from stocks.models import DailyStockData, MarketHoliday
+
+CALENDAR_VERSION_KEY = 'stocks:trading_calendar_version'
+CALENDAR_MAX_AGE = 60 * 60  # 초, 버전 키가 없는 경우에도 이 시간이 지나면 다시 만든다
+CALENDAR_PADDING_DAYS = 365 * 20  # 저장된 데이터 앞뒤로 평일 기준 거래일을 채우는 범위
+
+# 조회/테스트/예측 구간 정의 (거래일 기준)
+DISPLAY_WINDOW_TRADING_DAYS = 250  # 약 1년
+BACKTEST_HISTORY_TRADING_DAYS = 250 * 5  # 약 5년
+BACKTEST_TRIM_TRADING_DAYS = 35  # 구간 앞뒤 제외 (약 50일)
+BACKTEST_TEST_RATIO = 0.2  # 남은 구간 중 테스트 구간 비율
+MODEL_WINDOW_TRADING_DAYS = 10  # 테스트/예측 API 의 window_size
+
+BacktestWindow = namedtuple('BacktestWindow', ['data_start_date', 'test_start_date', 'test_end_date'])
+
+
+class TradingCalendar:
+    def __init__(self, trading_days):
+        self.trading_days = trading_days  # 정렬된 date 리스트
+
+    @classmethod
+    def build(cls, today=None):
+        today = today or date.today()
+        data_days = list(DailyStockData.objects.order_by('bas_dt').values_list('bas_dt', flat=True).distinct())
+        holidays = set(MarketHoliday.objects.values_list('date', flat=True))
+
+        first_data_day = data_days[0] if data_days else today
+        last_data_day = data_days[-1] if data_days else today - timedelta(days=1)
+        before = cls.weekdays(first_data_day - timedelta(days=CALENDAR_PADDING_DAYS), first_data_day - timedelta(days=1), holidays)
+        after = cls.weekdays(last_data_day + timedelta(days=1), max(today, last_data_day) + timedelta(days=CALENDAR_PADDING_DAYS), holidays)
+        return cls(before + data_days + after)
+
+    @staticmethod
+    def weekdays(start, end, holidays):
+        days = []
+        current = start
+        while current <= end:
+            if current.weekday() < 5 and current not in holidays:
+                days.append(current)
+            current += timedelta(days=1)
+        return days
+
+    def is_trading_day(self, day):
+        index = bisect_left(self.trading_days, day)
+        return index < len(self.trading_days) and self.trading_days[index] == day
+
+    def on_or_before(self, day):
+        """
+        day 가 거래일이면 day, 아니면 직전 거래일
+        """
+        index = bisect_right(self.trading_days, day) - 1
+        return self.trading_days[self.clamp(index)]
+
+    def trading_days_before(self, day, count):
+        """
+        day 기준 count 거래일 전 (day 가 거래일이 아니면 직전 거래일을 기준으로 함)
+        """
+        index = bisect_right(self.trading_days, day) - 1 - count
+        return self.trading_days[self.clamp(index)]
+
+    def trading_days_after(self, day, count):
+        """
+        day 기준 count 거래일 후 (day 가 거래일이 아니면 다음 거래일을 기준으로 함)
+        """
+        index = bisect_left(self.trading_days, day) + count
+        return self.trading_days[self.clamp(index)]
+
+    def count_between(self, start, end):
+        """
+        start ~ end (양 끝 포함) 의 거래일 수
+        """
+        return max(0, bisect_right(self.trading_days, end) - bisect_left(self.trading_days, start))
+
+    def split(self, start, end, ratio):
+        """
+        start ~ end 구간의 마지막 ratio 비율을 테스트 구간으로 나누고 테스트 구간 시작 거래일을 반환
+        """
+        count = self.count_between(start, end)
+        return self.trading_days_before(end, max(0, int(count * ratio) - 1))
+
+    def clamp(self, index):
+        return min(max(index, 0), len(self.trading_days) - 1)
+
+    """
+    조회/테스트/예측 경로가 함께 쓰는 구간 정의
+    """
+
+    def display_window(self, today=None):
+        """
+        최근 주차 데이터 조회 구간 (시작일, 종료일)
+        """
+        end_date = self.on_or_before(today or date.today())
+        return self.trading_days_before(end_date, DISPLAY_WINDOW_TRADING_DAYS - 1), end_date
+
+    def backtest_window(self, anchor_date, today=None):
+        """
+        추천 주차 시작일(anchor_date) 기준 5년 데이터에서 앞뒤를 제외하고, 남은 구간의 마지막 20% 를 테스트 구간으로 정함
+        """
+        data_start_date = self.trading_days_before(anchor_date, BACKTEST_HISTORY_TRADING_DAYS)
+        adjusted_start_date = self.trading_days_after(data_start_date, BACKTEST_TRIM_TRADING_DAYS)
+        adjusted_end_date = self.trading_days_before(today or date.today(), BACKTEST_TRIM_TRADING_DAYS)
+        test_start_date = self.split(adjusted_start_date, adjusted_end_date, BACKTEST_TEST_RATIO)
+        return BacktestWindow(data_start_date, test_start_date, adjusted_end_date)
+
+
+_calendar = None
+_calendar_version = None
+_calendar_built_at = 0.0
+_calendar_lock = threading.Lock()
+
+
+def get_trading_calendar():
+    """
+    프로세스 단위로 캐시된 TradingCalendar
+    """
+    global _calendar, _calendar_version, _calendar_built_at
+    version = get_cache().get(CALENDAR_VERSION_KEY)
+    if _calendar_is_stale(version):
+        with _calendar_lock:
+            # 기다리는 동안 다른 스레드가 이미 다시 만들었으면 그대로 사용
+            if _calendar_is_stale(version):
+                _calendar = TradingCalendar.build()
+                _calendar_version = version
+                _calendar_built_at = time.monotonic()
+    return _calendar
+
+
+def _calendar_is_stale(version):
+    return _calendar is None or version != _calendar_version or time.monotonic() - _calendar_built_at > CALENDAR_MAX_AGE
+
+
+def invalidate_trading_calendar():
+    """
+    일별 데이터(새 거래일)나 휴장일이 바뀌었을 때 호출해 모든 프로세스의 달력을 다시 만들게 함
+    """
+    get_cache().set(CALENDAR_VERSION_KEY, time.time(), timeout=None)
@@ -2,7 +2,10 @@ from django.urls import path
 
 from stocks.views import FetchAllStocksInfoView, \
     FetchWeeklyStockDailyDataView, LatestWeeklyStocksDataView, StockAITestView, StockAIPredictView, \
-    StockAITestResultView, StockAIPredictResultView
+    StockAITestResultView, StockAIPredictResultView, JobStatusView, FetchMarketDailyDataView, \
+    ExportDailyStockDataView, StockTimeSeriesView, StockSearchView
+from stocks.async_views import AsyncStockAITestView, AsyncStockAIPredictView, AsyncLatestWeeklyStocksDataView, \
+    AsyncStockAITestResultView, AsyncStockAIPredictResultView
 
 urlpatterns = [
 
@@ -14,16 +17,31 @@ urlpatterns = [
     # 전체 주식 정보 가져오기 (POST)
     path('weekly/daily-data/', FetchWeeklyStockDailyDataView.as_view(), name='stock_info'),
 
+    # 날짜별 전체 시장 데이터 가져오기 (POST)
+    path('daily-data/market/', FetchMarketDailyDataView.as_view(), name='fetch_market_daily_data'),
+
     # 최신 주차별 주식 데이터 test(Post)
     path('weekly/latest/test/', StockAITestView.as_view(), name='latest_weekly_stocks_test'),
 
     # 최신 주차별 주식 데이터 predict(Post)
     path('weekly/latest/predict/', StockAIPredictView.as_view(), name='latest_weekly_stocks_predict'),
 
+    # 일자별 데이터 대량 내보내기 (GET, NDJSON / CSV / Parquet)
+    path('daily-data/export/', ExportDailyStockDataView.as_view(), name='export_daily_stock_data'),
+
+    # 시계열 저장소 종목별 구간 조회 (GET)
+    path('timeseries/<str:isin_code>/', StockTimeSeriesView.as_view(), name='stock_timeseries'),
+
+    # 작업 상태 조회 (GET)
+    path('jobs/<int:job_id>/', JobStatusView.as_view(), name='job_status'),
+
 
 
     # 일반 api urls
 
+    # 종목 검색 / 자동완성 (GET)
+    path('search/', StockSearchView.as_view(), name='stock_search'),
+
     # 최신 주차별 주식 데이터 (GET)
     path('weekly/latest/', LatestWeeklyStocksDataView.as_view(), name='latest_weekly_stocks'),
 
@@ -32,4 +50,14 @@ urlpatterns = [
 
     # 최신 주차별 주식 데이터 predict(Get)
     path('weekly/latest/predict/<str:isin_code>', StockAIPredictResultView.as_view(), name='latest_weekly_stocks_predict_data'),
-]
\ No newline at end of file
+
+
+    # async (ASGI) 버전: 같은 응답을 async view 로 제공 (ASGI 서버로 배포한 경우 사용)
+    path('async/weekly/latest/test/', AsyncStockAITestView.as_view(), name='async_latest_weekly_stocks_test'),
+    path('async/weekly/latest/predict/', AsyncStockAIPredictView.as_view(), name='async_latest_weekly_stocks_predict'),
+    path('async/weekly/latest/', AsyncLatestWeeklyStocksDataView.as_view(), name='async_latest_weekly_stocks'),
+    path('async/weekly/latest/test/<str:isin_code>', AsyncStockAITestResultView.as_view(),
+         name='async_latest_weekly_stocks_test_data'),
+    path('async/weekly/latest/predict/<str:isin_code>', AsyncStockAIPredictResultView.as_view(),
+         name='async_latest_weekly_stocks_predict_data'),
+]
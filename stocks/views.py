@@ -1,170 +1,214 @@
+import asyncio
+import gzip
+import json
 import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from urllib.parse import urlencode
+import numpy as np
 import requests
 from django.core.exceptions import ObjectDoesNotExist
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, quote_etag
 from rest_framework.authentication import TokenAuthentication
-from rest_framework.exceptions import APIException, PermissionDenied
+from rest_framework.exceptions import PermissionDenied
 
 from rest_framework.generics import GenericAPIView
 from rest_framework.permissions import IsAdminUser, AllowAny
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from rest_framework import status
 
+from stocks import exports
+from stocks.cache import CachedResponseMixin, bump_data_version, is_not_modified
+from stocks.clients import get_http_client, get_async_http_client, httpx
 from stocks.exceptions import (
     ApiRequestFailureException,
     ApiResponseParseFailureException,
     HttpStatusCodeFailureException,
-    DatabaseSaveFailureException, StockSearchFailureException, StockNotFoundException,
+    DatabaseSaveFailureException, DataValidationFailureException, StockSearchFailureException, StockNotFoundException,
     WeeklyRecommendationNotFoundException, WeeklyRecommendationStockSaveException,
     WeeklyRecommendationStockDeleteException,
 )
+from stocks.jobs import enqueue_job
+from stocks.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, render_metrics
 from stocks.models import Stock, WeeklyRecommendation, WeeklyRecommendationStock, DailyStockData, \
-    WeeklyRecommendationStockTestResult, WeeklyRecommendationStockPredictResult
-from stocks.serializers import StockSerializer, DailyStockDataSerializer, DailyStockDataWithStockSerializer
+    WeeklyRecommendationStockTestResult, WeeklyRecommendationStockPredictResult, Job
+from stocks.services import RunningStats, build_daily_stock_data_rows, bulk_upsert_daily_stock_data, sync_stocks, \
+    fetch_stock_price_items, get_sync_begin_date, record_stock_sync, SYNC_MODE_INCREMENTAL, SYNC_MODES, \
+    BacktestResult, run_local_backtests, BACKTEST_BACKEND_LOCAL, BACKTEST_BACKEND_REMOTE, BACKTEST_BACKENDS
+from stocks.search import SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT, get_stock_search_index
+from stocks.snapshots import SNAPSHOT_PAYLOAD_FIELDS, get_latest_weekly_recommendation_snapshot
+from stocks.timeseries import TIMESERIES_FIELDS, get_timeseries_store
+from stocks.trading_calendar import get_trading_calendar, MODEL_WINDOW_TRADING_DAYS
+from stocks.renderers import ORJSONRenderer, ColumnarJSONRenderer, NDJSONRenderer, CSVRenderer, ParquetRenderer
+from stocks.serializers import StockSerializer, DailyStockDataWithStockSerializer, JobSerializer
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+ACCEPTS_GZIP_RE = re.compile(r'\bgzip\b')
+
+
+class JobEnqueueMixin:
+    """
+    POST 요청 시 작업을 큐에 등록하고 202 와 job id 를 반환하는 mixin
+    Idempotency-Key 헤더가 있으면 같은 키로 등록된 작업을 그대로 반환한다.
+    """
+    job_kind = None
+
+    def get_job_payload(self, request):
+        return {}
+
+    def enqueue_job_response(self, request, message):
+        job = enqueue_job(self.job_kind, payload=self.get_job_payload(request),
+                          idempotency_key=request.headers.get('Idempotency-Key'))
+        return Response({
+            "message": message,
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": reverse('job_status', args=[job.id]),
+        }, status=status.HTTP_202_ACCEPTED)
+
 
 """
 admin 용 api view
 """
 # 공공 데이터 포탈에서 한국 주식 정보 받아오기 (admin 용)
-class FetchAllStocksInfoView(GenericAPIView):
+class FetchAllStocksInfoView(JobEnqueueMixin, GenericAPIView):
     serializer_class = StockSerializer
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAdminUser]
+    job_kind = 'fetch_all_stocks_info'
 
     def post(self, request):
         if not request.user.is_staff:  # 추가로 관리자 권한 확인
             raise PermissionDenied("관리자만 이 작업을 수행할 수 있습니다.")
-        try:
-            self.fetch_and_save_all_stocks_info()
-            return Response({"message": "모든 주식 기본 정보가 저장됐습니다."}, status=status.HTTP_200_OK)
-        except APIException as e:
-            logger.error(f"error : {str(e)}")
-            raise e
+        return self.enqueue_job_response(request, "주식 기본 정보 저장 작업이 등록됐습니다.")
 
     def fetch_and_save_all_stocks_info(self):
         today = datetime.now() - timedelta(days=1)
         yesterday = today - timedelta(days=2)
         formatted_today = today.strftime("%Y%m%d")
         formatted_yesterday = yesterday.strftime("%Y%m%d")
-        page_no = 1
-        num_of_rows = 100
-
-        while True:
-            service_key = settings.PUBLIC_DATA_SECRET_KEY
-            params = {
-                "serviceKey": service_key,
-                "resultType": "json",
-                "beginBasDt": formatted_yesterday,
-                "endBasDt": formatted_today,
-                "pageNo": page_no,
-                "numOfRows": num_of_rows
-            }
-            query_string = urlencode(params, safe='=')
-            url = f"http://apis.data.go.kr/1160100/service/GetStockSecuritiesInfoService/getStockPriceInfo?{query_string}"
-
-            try:
-                response = requests.get(url, verify=False)
-                if response.status_code != 200:
-                    raise HttpStatusCodeFailureException()
-            except requests.exceptions.RequestException as e:
-                raise ApiRequestFailureException(f"API 요청 실패: {str(e)}")
+        items = fetch_stock_price_items({
+            "beginBasDt": formatted_yesterday,
+            "endBasDt": formatted_today,
+        })
 
-            try:
-                data = response.json()
-                items = data.get('response', {}).get('body', {}).get('items', {}).get('item', [])
-
-                if not items:
-                    break  # 더 이상 데이터가 없으면 루프 종료
+        # 여러 기준일자에 걸친 같은 종목은 마지막 값만 남김
+        items_by_isin_code = {item.get('isinCd'): item for item in items}
 
-                self.save_stocks_from_api(items)
-                page_no += 1
-            except Exception:
-                raise ApiResponseParseFailureException()
+        # 모든 페이지를 모은 뒤 한 번에 동기화 (종목 수와 무관하게 고정된 쿼리 수)
+        return self.save_stocks_from_api(list(items_by_isin_code.values()))
 
     def save_stocks_from_api(self, items):
-        for item in items:
-            isin_code = item.get('isinCd')
-            srtn_code = item.get('srtnCd')
-            itms_name = item.get('itmsNm')
-            mrkt_cls = item.get('mrktCtg', "Unknown")
-
-            if not Stock.objects.filter(isin_code=isin_code).exists():
-                try:
-                    Stock.objects.create(
-                        isin_code=isin_code,
-                        srtn_code=srtn_code,
-                        itms_name=itms_name,
-                        mrkt_cls=mrkt_cls
-                    )
-                except Exception:
-                    raise DatabaseSaveFailureException()
+        try:
+            created, updated = sync_stocks(items)
+        except Exception as e:
+            logger.error(f"데이터베이스 저장 실패: {str(e)}")
+            raise DatabaseSaveFailureException()
+
+        logger.info(f"주식 기본 정보 동기화 완료 (신규 {created}건, 변경 {updated}건)")
+        return created, updated
 
 
 # ai test (admin 용)
-class StockAITestView(GenericAPIView):
+class StockAITestView(JobEnqueueMixin, GenericAPIView):
     # authentication_classes = [TokenAuthentication]
     # permission_classes = [IsAdminUser]
     permission_classes = [AllowAny]
+    job_kind = 'stock_ai_test'
 
     def post(self, request):
-        # 주식 테스트 실행
-        self.test_and_save_weekly_stocks()
-        return Response({"message": "주식 테스트 및 예측이 완료되었습니다."}, status=status.HTTP_200_OK)
+        # 주식 테스트 작업 등록
+        return self.enqueue_job_response(request, "주식 테스트 작업이 등록되었습니다.")
 
     def start_testing(self, stock_name, stock_srtn_code, test_runs, window_size, test_starting_cash):
         """
         Django에서 외부 API로 테스트 요청을 보냄
         """
-        print(f"Sending test request with test_runs={test_runs} for stock {stock_srtn_code}")
+        logger.debug(f"Sending test request with test_runs={test_runs} for stock {stock_srtn_code}")
 
         # 외부 API에 테스트 요청을 보냄
-        # url = f"https://sqxle43k4j.execute-api.ap-northeast-2.amazonaws.com/default/api/test/?stock={stock_name}&start_date={stock_srtn_code}&test_runs={test_runs}&window_size={window_size}&test_starting_cash={test_starting_cash}"
-        url = f"http://127.0.0.1:8080/api/test/?stock={stock_name}&start_date={stock_srtn_code}&test_runs={test_runs}&window_size={window_size}&test_starting_cash={test_starting_cash}"
-        response = requests.get(url)
+        url = self.get_test_url(stock_name, stock_srtn_code, test_runs, window_size, test_starting_cash)
+        response = get_http_client().get(url)
         return response
 
+    def get_test_url(self, stock_name, stock_srtn_code, test_runs, window_size, test_starting_cash):
+        # return f"https://sqxle43k4j.execute-api.ap-northeast-2.amazonaws.com/default/api/test/?stock={stock_name}&start_date={stock_srtn_code}&test_runs={test_runs}&window_size={window_size}&test_starting_cash={test_starting_cash}"
+        return f"http://127.0.0.1:8080/api/test/?stock={stock_name}&start_date={stock_srtn_code}&test_runs={test_runs}&window_size={window_size}&test_starting_cash={test_starting_cash}"
+
     def test_and_save_weekly_stocks(self):
         try:
             latest_weekly_recommendation = WeeklyRecommendation.objects.latest('start_date')
         except ObjectDoesNotExist:
             return {"error": "No weekly stock recommendations found"}
 
-        start_date = latest_weekly_recommendation.start_date
-        five_years_before_start_date = start_date - timedelta(days=365 * 5)
-        end_date = datetime.now().date()
-
-        # 앞뒤 50일 제외
-        adjusted_start_date = five_years_before_start_date + timedelta(days=50)
-        adjusted_end_date = end_date - timedelta(days=50)
-
-        # 남은 구간의 20%를 테스트 기간으로 설정
-        adjusted_days = (adjusted_end_date - adjusted_start_date).days
-        test_period_days = int(adjusted_days * 0.2)
-        test_start_date = adjusted_end_date - timedelta(days=test_period_days)
-        test_end_date = adjusted_end_date
-
-        test_formatted_date = five_years_before_start_date.strftime('%Y-%m-%d')
-        test_formatted_start_date = test_start_date.strftime('%Y-%m-%d')
-        test_formatted_end_date = test_end_date.strftime('%Y-%m-%d')
+        # 추천 주차 시작일 기준 5년 데이터 중 앞뒤를 제외한 구간의 마지막 20% 를 테스트 기간으로 설정 (거래일 기준)
+        backtest_window = get_trading_calendar().backtest_window(latest_weekly_recommendation.start_date)
+
+        test_formatted_date = backtest_window.data_start_date.strftime('%Y-%m-%d')
+        test_formatted_start_date = backtest_window.test_start_date.strftime('%Y-%m-%d')
+        test_formatted_end_date = backtest_window.test_end_date.strftime('%Y-%m-%d')
+
+        weekly_recommendation_stocks = WeeklyRecommendationStock.objects.filter(
+            weekly_recommendation=latest_weekly_recommendation).select_related('stock')
+
+        # 최근 일자의 시가를 가져옴
+        stocks_with_cash = [
+            (weekly_recommendation_stock.stock, self.get_test_starting_cash(weekly_recommendation_stock.stock))
+            for weekly_recommendation_stock in weekly_recommendation_stocks
+        ]
+
+        # BACKTEST_BACKEND 에 따라 로컬 엔진 또는 외부 테스트 API 로 주식별 profit 평균/표준편차 계산
+        backend = getattr(settings, 'BACKTEST_BACKEND', BACKTEST_BACKEND_REMOTE)
+        backtest_results = self.run_backtests(backend, stocks_with_cash, backtest_window, test_formatted_date)
+
+        test_results = []
+        for stock, test_starting_cash in stocks_with_cash:
+            result = backtest_results.get(stock.id)
+            if result is None or not result.runs:
+                continue
+            test_results.append(WeeklyRecommendationStockTestResult(
+                profit=round(result.profit_mean, 2),  # 테스트들의 평균 profit 저장
+                profit_std=round(result.profit_std, 2),
+                test_runs=result.runs,
+                max_drawdown=None if result.max_drawdown is None else round(result.max_drawdown * 100, 2),
+                backend=backend,
+                test_start_date=test_formatted_start_date,
+                test_end_date=test_formatted_end_date,
+                test_starting_cash=test_starting_cash,
+                stock=stock,
+                weekly_recommendation=latest_weekly_recommendation,
+            ))
+        self.save_test_results_to_db(test_results)
 
-        for weekly_recommendation_stock in WeeklyRecommendationStock.objects.filter(
-                weekly_recommendation=latest_weekly_recommendation):
-            stock = weekly_recommendation_stock.stock
-            stock_srtn_code = stock.srtn_code
+        return {"message": "Weekly stocks tested and saved successfully"}
 
-            # 최근 일자의 시가를 가져옴
-            test_starting_cash = self.get_test_starting_cash(stock)
+    def run_backtests(self, backend, stocks_with_cash, backtest_window, test_formatted_date):
+        """
+        주식별 BacktestResult 를 반환
+        local: 로컬 NumPy 엔진 (Monte-Carlo 실행을 한 번의 배열 연산으로 처리)
+        remote: 외부 테스트 API 를 AI_TEST_RUNS 번씩 호출 (결과 비교 / 벤치마크용으로 유지)
+        """
+        if backend not in BACKTEST_BACKENDS:
+            raise DataValidationFailureException(f"BACKTEST_BACKEND 는 {', '.join(BACKTEST_BACKENDS)} 중 하나여야 합니다.")
 
-            # 각 주식에 대해 testruns를 1로 하여 10번 요청 실행하고 평균 저장
-            self.calculate_and_save_average_profit(stock, stock_srtn_code, test_formatted_date, test_formatted_start_date, test_formatted_end_date,
-                                                   latest_weekly_recommendation, test_starting_cash)
+        if backend == BACKTEST_BACKEND_LOCAL:
+            return run_local_backtests(stocks_with_cash, backtest_window, MODEL_WINDOW_TRADING_DAYS)
 
-        return {"message": "Weekly stocks tested and saved successfully"}
+        if getattr(settings, 'AI_HTTP_ASYNC', False) and httpx is not None:
+            profit_stats = asyncio.run(self.acalculate_profit_stats(stocks_with_cash, test_formatted_date))
+        else:
+            profit_stats = self.calculate_profit_stats(stocks_with_cash, test_formatted_date)
+        return {
+            stock_id: BacktestResult(runs=stats.count, profit_mean=stats.mean, profit_std=stats.std, max_drawdown=None)
+            for stock_id, stats in profit_stats.items()
+        }
 
     def get_test_starting_cash(self, stock):
         # DailyStockData에서 해당 주식의 가장 최근 일자의 시가를 가져옴
@@ -173,62 +217,132 @@ class StockAITestView(GenericAPIView):
             return latest_data.mkp * 500  # 시가의 500배를 반환
         return 0  # 시가 정보가 없을 경우 0 반환
 
-    def calculate_and_save_average_profit(self, stock, stock_srtn_code, test_formatted_date, test_formatted_start_date, test_formatted_end_date,
-                                          latest_weekly_recommendation, test_starting_cash):
+    def calculate_profit_stats(self, stocks_with_cash, test_formatted_date):
         """
-        10번의 테스트를 실행하고, 평균 profit 값을 저장하는 함수
+        모든 주식의 테스트 요청을 스레드 풀에서 동시에 실행하고, 결과를 주식별 RunningStats 에 누적하는 함수
+        전체 동시 요청 수는 AI_TEST_MAX_WORKERS, 주식당 동시 요청 수는 AI_TEST_MAX_WORKERS_PER_STOCK 으로 제한한다.
         """
-        profits = []  # profit 값을 저장할 리스트
+        test_runs = getattr(settings, 'AI_TEST_RUNS', 10)
+        max_workers = getattr(settings, 'AI_TEST_MAX_WORKERS', 16)
+        max_workers_per_stock = getattr(settings, 'AI_TEST_MAX_WORKERS_PER_STOCK', 4)
+
+        profit_stats = {stock.id: RunningStats() for stock, _ in stocks_with_cash}
+        stock_semaphores = {stock.id: threading.BoundedSemaphore(max_workers_per_stock) for stock, _ in stocks_with_cash}
+
+        def run_test(stock, test_starting_cash):
+            with stock_semaphores[stock.id]:
+                return self.request_test_profit(stock, test_formatted_date, test_starting_cash)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # 주식별 요청을 번갈아 제출해 한 주식이 풀을 독점하지 않도록 함
+            futures = {
+                executor.submit(run_test, stock, test_starting_cash): stock.id
+                for _ in range(test_runs)
+                for stock, test_starting_cash in stocks_with_cash
+            }
+            for future in as_completed(futures):
+                profit = future.result()
+                if profit is not None:
+                    profit_stats[futures[future]].add(profit)
+
+        return profit_stats
 
-        for _ in range(10):
-            response = self.start_testing(stock.srtn_code, test_formatted_date, 1, 10, test_starting_cash)
-            if response.status_code == 200:
-                test_result_data = response.json()
-                profit = test_result_data.get('average_profit')
+    async def acalculate_profit_stats(self, stocks_with_cash, test_formatted_date):
+        """
+        calculate_profit_stats 의 async 버전 (AI_HTTP_ASYNC)
+        스레드 대신 하나의 event loop 에서 AsyncHttpClient 로 요청하며, 동시 요청 수 제한은 asyncio.Semaphore 로 같다.
+        """
+        test_runs = getattr(settings, 'AI_TEST_RUNS', 10)
+        max_workers = getattr(settings, 'AI_TEST_MAX_WORKERS', 16)
+        max_workers_per_stock = getattr(settings, 'AI_TEST_MAX_WORKERS_PER_STOCK', 4)
+
+        profit_stats = {stock.id: RunningStats() for stock, _ in stocks_with_cash}
+        semaphore = asyncio.Semaphore(max_workers)
+        stock_semaphores = {stock.id: asyncio.Semaphore(max_workers_per_stock) for stock, _ in stocks_with_cash}
+
+        async with get_async_http_client() as client:
+            async def run_test(stock, test_starting_cash):
+                async with stock_semaphores[stock.id], semaphore:
+                    profit = await self.arequest_test_profit(client, stock, test_formatted_date, test_starting_cash)
                 if profit is not None:
-                    profits.append(float(profit))
+                    profit_stats[stock.id].add(profit)
 
-        # profit 리스트에 값이 있는 경우 평균을 계산하여 저장
-        if profits:
-            average_profit = sum(profits) / len(profits)  # 평균 계산
+            await asyncio.gather(*[
+                run_test(stock, test_starting_cash)
+                for _ in range(test_runs)
+                for stock, test_starting_cash in stocks_with_cash
+            ])
 
-            # 평균 profit 값을 데이터베이스에 저장
-            self.save_test_result_to_db(stock, average_profit, latest_weekly_recommendation, test_formatted_start_date, test_formatted_end_date, test_starting_cash)
+        return profit_stats
 
-    def save_test_result_to_db(self, stock, average_profit, latest_weekly_recommendation, test_formatted_start_date, test_formatted_end_date, test_starting_cash):
+    def request_test_profit(self, stock, test_formatted_date, test_starting_cash):
         """
-        평균 profit 값을 데이터베이스에 저장하는 함수
+        테스트 1회를 요청하고 profit 을 반환하는 함수 (실패 시 None)
         """
-        WeeklyRecommendationStockTestResult.objects.create(
-            profit=average_profit,  # 10번 테스트의 평균 profit 저장
-            test_start_date=test_formatted_start_date,
-            test_end_date=test_formatted_end_date,
-            test_starting_cash=test_starting_cash,
-            stock=stock,
-            weekly_recommendation=latest_weekly_recommendation,
-        )
+        try:
+            response = self.start_testing(stock.srtn_code, test_formatted_date, 1, MODEL_WINDOW_TRADING_DAYS, test_starting_cash)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"테스트 요청 실패 ({stock.srtn_code}): {str(e)}")
+            return None
+        return self.parse_test_profit(stock, response)
+
+    async def arequest_test_profit(self, client, stock, test_formatted_date, test_starting_cash):
+        url = self.get_test_url(stock.srtn_code, test_formatted_date, 1, MODEL_WINDOW_TRADING_DAYS, test_starting_cash)
+        try:
+            response = await client.get(url)
+        except httpx.HTTPError as e:
+            logger.error(f"테스트 요청 실패 ({stock.srtn_code}): {str(e)}")
+            return None
+        return self.parse_test_profit(stock, response)
+
+    def parse_test_profit(self, stock, response):
+        if response.status_code != 200:
+            return None
+
+        try:
+            profit = response.json().get('average_profit')
+            return float(profit) if profit is not None else None
+        except (ValueError, TypeError):
+            logger.error(f"테스트 응답 처리 실패 ({stock.srtn_code})")
+            return None
+
+    def save_test_results_to_db(self, test_results):
+        """
+        주차의 테스트 결과를 한 번에 데이터베이스에 저장하는 함수
+        """
+        try:
+            WeeklyRecommendationStockTestResult.objects.bulk_create(test_results)
+        except Exception as e:
+            logger.error(f"테스트 결과 저장 실패: {str(e)}")
+            raise DatabaseSaveFailureException()
+        bump_data_version()
 
 
 # ai predict (admin 용)
-class StockAIPredictView(GenericAPIView):
+class StockAIPredictView(JobEnqueueMixin, GenericAPIView):
     # authentication_classes = [TokenAuthentication]
     # permission_classes = [IsAdminUser]
     permission_classes = [AllowAny]
+    job_kind = 'stock_ai_predict'
 
     def post(self, request):
-        # 주식 예측 실행
-        self.predict_and_save_weekly_stocks()
-        return Response({"message": "주식 테스트 및 예측이 완료되었습니다."}, status=200)
+        # 주식 예측 작업 등록
+        return self.enqueue_job_response(request, "주식 예측 작업이 등록되었습니다.")
 
     def start_prediction(self, stock_name, days_ago, window_size):
         """
         Django에서 외부 API로 예측 요청을 보냄
         """
-        url = f"https://sqxle43k4j.execute-api.ap-northeast-2.amazonaws.com/default/api/predict/?stock={stock_name}&days_ago={days_ago}&window_size={window_size}"
-        # url = f"http://127.0.0.1:8080/api/predict/?stock={stock_name}&days_ago={days_ago}&window_size={window_size}"
-        response = requests.get(url)
+        response = get_http_client().get(self.get_predict_url(stock_name, days_ago, window_size))
         return response
 
+    def get_predict_url(self, stock_name, days_ago, window_size):
+        # AI_PREDICT_URL 예) http://127.0.0.1:8080/api/predict/
+        return f"{settings.AI_PREDICT_URL}?stock={stock_name}&days_ago={days_ago}&window_size={window_size}"
+
+    def get_batch_predict_url(self, stock_names, days_ago, window_size):
+        return f"{settings.AI_PREDICT_URL}?stocks={','.join(stock_names)}&days_ago={days_ago}&window_size={window_size}"
+
     def predict_and_save_weekly_stocks(self):
         """
         주차별 추천 주식에 대해 예측하고 결과를 저장하는 함수
@@ -238,6 +352,21 @@ class StockAIPredictView(GenericAPIView):
         except ObjectDoesNotExist:
             return {"error": "No weekly stock recommendations found"}
 
+        batch_size = getattr(settings, 'AI_PREDICT_BATCH_SIZE', 0)
+        if batch_size or (getattr(settings, 'AI_HTTP_ASYNC', False) and httpx is not None):
+            stocks = [
+                weekly_stock.stock
+                for weekly_stock in WeeklyRecommendationStock.objects.filter(
+                    weekly_recommendation=latest_weekly_recommendation).select_related('stock')
+            ]
+            # 예측 요청은 동시에 보내고, 저장은 응답을 모아 한 번에 한다
+            if batch_size:
+                prediction_results = self.request_batch_predictions(stocks, batch_size)
+            else:
+                prediction_results = asyncio.run(self.arequest_predictions(stocks))
+            self.save_prediction_results_to_db(prediction_results, latest_weekly_recommendation)
+            return {"message": "Weekly stocks predicted and saved successfully"}
+
         for weekly_stock in WeeklyRecommendationStock.objects.filter(
                 weekly_recommendation=latest_weekly_recommendation):
             stock = weekly_stock.stock
@@ -253,51 +382,160 @@ class StockAIPredictView(GenericAPIView):
         외부 API를 호출하여 예측 후 결과를 저장하는 함수
         """
         # 동기 방식으로 예측 요청
-        response = self.start_prediction(stock_name, 0, 10)
+        try:
+            response = self.start_prediction(stock_name, 0, MODEL_WINDOW_TRADING_DAYS)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"예측 요청 실패 ({stock_name}): {str(e)}")
+            return
         if response.status_code == 200:
             prediction_result_data = response.json()
             self.save_prediction_result_to_db(stock, prediction_result_data, latest_weekly_recommendation)
 
+    async def arequest_predictions(self, stocks):
+        """
+        AsyncHttpClient 로 종목별 예측을 동시에 요청하고 성공한 [(stock, 응답 데이터)] 반환
+        동시 요청 수는 AI_TEST_MAX_WORKERS 로 제한한다.
+        """
+        semaphore = asyncio.Semaphore(getattr(settings, 'AI_TEST_MAX_WORKERS', 16))
+
+        async with get_async_http_client() as client:
+            async def predict(stock):
+                async with semaphore:
+                    try:
+                        response = await client.get(self.get_predict_url(stock.srtn_code, 0, MODEL_WINDOW_TRADING_DAYS))
+                    except httpx.HTTPError as e:
+                        logger.error(f"예측 요청 실패 ({stock.srtn_code}): {str(e)}")
+                        return None
+                return (stock, response.json()) if response.status_code == 200 else None
+
+            results = await asyncio.gather(*[predict(stock) for stock in stocks])
+        return [result for result in results if result is not None]
+
+    def request_batch_predictions(self, stocks, batch_size):
+        """
+        종목 코드를 batch_size 개씩 묶어 한 요청으로 예측하고 성공한 [(stock, 응답 데이터)] 반환
+        묶음 요청은 AI_TEST_MAX_WORKERS 개까지 동시에 보낸다.
+        응답: {"results": [{"stock": 단축 코드, "action": ..., "target_date": ...}, ...]}
+        """
+        chunks = [stocks[i:i + batch_size] for i in range(0, len(stocks), batch_size)]
+        if not chunks:
+            return []
+
+        results = []
+        max_workers = min(len(chunks), getattr(settings, 'AI_TEST_MAX_WORKERS', 16))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for chunk_results in executor.map(self.request_prediction_chunk, chunks):
+                results.extend(chunk_results)
+        return results
+
+    def request_prediction_chunk(self, stocks):
+        stock_names = [stock.srtn_code for stock in stocks]
+        try:
+            response = get_http_client().get(
+                self.get_batch_predict_url(stock_names, 0, MODEL_WINDOW_TRADING_DAYS))
+        except requests.exceptions.RequestException as e:
+            logger.error(f"예측 묶음 요청 실패 ({','.join(stock_names)}): {str(e)}")
+            return []
+        if response.status_code != 200:
+            logger.error(f"예측 묶음 요청 실패 ({','.join(stock_names)}): 응답 코드 {response.status_code}")
+            return []
+
+        stocks_by_name = {stock.srtn_code: stock for stock in stocks}
+        try:
+            items = response.json().get('results', [])
+        except (ValueError, AttributeError):
+            logger.error(f"예측 묶음 응답 처리 실패 ({','.join(stock_names)})")
+            return []
+        # 요청하지 않은 종목의 결과는 무시한다
+        return [(stocks_by_name[item.get('stock')], item) for item in items if item.get('stock') in stocks_by_name]
+
+    def save_prediction_results_to_db(self, prediction_results, latest_weekly_recommendation):
+        """
+        [(stock, 응답 데이터)] 를 한 번의 bulk_create 로 저장
+        (stock, weekly_recommendation, target_date) 가 같은 결과는 마지막 것만 남기고, 이미 저장된 결과는 action 을 갱신한다.
+        """
+        predict_results = {}
+        for stock, prediction_result_data in prediction_results:
+            target_date = prediction_result_data.get('target_date')
+            predict_results[(stock.id, target_date)] = WeeklyRecommendationStockPredictResult(
+                stock=stock,
+                weekly_recommendation=latest_weekly_recommendation,
+                action=prediction_result_data.get('action'),
+                target_date=target_date,
+            )
+        if not predict_results:
+            return
+
+        try:
+            WeeklyRecommendationStockPredictResult.objects.bulk_create(
+                list(predict_results.values()),
+                update_conflicts=True,
+                unique_fields=['stock', 'weekly_recommendation', 'target_date'],
+                update_fields=['action'],
+            )
+        except Exception as e:
+            logger.error(f"예측 결과 저장 실패: {str(e)}")
+            raise DatabaseSaveFailureException()
+        bump_data_version()
+
     def save_prediction_result_to_db(self, stock, prediction_result_data, latest_weekly_recommendation):
         """
         예측 결과를 데이터베이스에 저장
         """
-        # 예측 결과를 데이터베이스에 저장
-        WeeklyRecommendationStockPredictResult.objects.create(
+        # (stock, weekly_recommendation, target_date) 유니크 제약: 같은 주차를 다시 예측하면 action 을 갱신
+        WeeklyRecommendationStockPredictResult.objects.update_or_create(
             stock=stock,
             weekly_recommendation=latest_weekly_recommendation,
-            action=prediction_result_data.get('action'),
-            target_date=prediction_result_data.get('target_date')
+            target_date=prediction_result_data.get('target_date'),
+            defaults={'action': prediction_result_data.get('action')},
         )
 
 
 # 주차별 주식 Daily Data Fetch (admin 용)
-class FetchWeeklyStockDailyDataView(GenericAPIView):
+class FetchWeeklyStockDailyDataView(JobEnqueueMixin, GenericAPIView):
     # authentication_classes = [TokenAuthentication]
     # permission_classes = [IsAdminUser]
     permission_classes = [AllowAny]
+    job_kind = 'fetch_weekly_stock_daily_data'
 
     def post(self, request):
+        # 주식 데이터 저장 작업 등록
+        return self.enqueue_job_response(request, "주식 데이터 저장 작업이 등록되었습니다.")
+
+    def get_job_payload(self, request):
+        # mode: incremental(기본, 마지막 저장일 이후만) / backfill(1년 전체)
+        mode = request.data.get('mode', SYNC_MODE_INCREMENTAL)
+        if mode not in SYNC_MODES:
+            raise DataValidationFailureException(f"mode 는 {', '.join(SYNC_MODES)} 중 하나여야 합니다.")
+        return {"mode": mode}
+
+    def fetch_and_save_weekly_stocks_data(self, mode=SYNC_MODE_INCREMENTAL, progress=None):
+        """
+        최신 주차의 추천 주식들의 데이터를 가져와 저장하고 저장된 row 수를 반환하는 함수
+        progress 가 주어지면 주식 하나를 처리할 때마다 progress(완료 수, 전체 수) 로 진행 상황을 알린다.
+        """
         # 최신 주차의 주식 추천 리스트 가져오기
         latest_weekly_recommendation = self.get_latest_weekly_recommendation()
-        weekly_stocks = WeeklyRecommendationStock.objects.filter(
+        weekly_stocks = list(WeeklyRecommendationStock.objects.filter(
             weekly_recommendation=latest_weekly_recommendation
-        ).select_related('stock')
+        ).select_related('stock'))
 
         logger.info(latest_weekly_recommendation)
 
+        saved = 0
         try:
-            for weekly_stock in weekly_stocks:
+            for done, weekly_stock in enumerate(weekly_stocks, start=1):
                 isin_cd = weekly_stock.stock.isin_code
 
                 # 주식 데이터를 가져와 저장하는 함수 호출
-                self.fetch_and_save_stock_data_by_code_and_date(isin_cd)
-
-            return Response({"message": "주식 데이터가 성공적으로 저장되었습니다."}, status=status.HTTP_200_OK)
-
+                saved += self.fetch_and_save_stock_data_by_code_and_date(isin_cd, mode)
+                if progress:
+                    progress(done, len(weekly_stocks), isin_cd)
         except (ApiRequestFailureException, ApiResponseParseFailureException, DatabaseSaveFailureException) as e:
             logger.error(f"주식 데이터를 저장하는 중 오류 발생: {str(e)}")
-            return Response({"error": "주식 데이터를 저장하는 중 오류가 발생했습니다."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            raise
+
+        return saved
 
     def get_latest_weekly_recommendation(self):
         """
@@ -310,91 +548,182 @@ class FetchWeeklyStockDailyDataView(GenericAPIView):
             logger.info("주식 추천 목록이 없습니다")
             raise StockNotFoundException("추천 주식 목록이 없습니다.")
 
-    def fetch_and_save_stock_data_by_code_and_date(self, isin_cd):
+    def fetch_and_save_stock_data_by_code_and_date(self, isin_cd, mode=SYNC_MODE_INCREMENTAL):
         """
         공공 데이터 포털 API에서 주식 데이터를 가져와 저장하는 로직
+        마지막으로 저장된 기준일자(high-water) 다음 날부터만 요청하고, 처음 추천된 종목은 1년 전체를 백필한다.
         """
-        url_template = "http://apis.data.go.kr/1160100/service/GetStockSecuritiesInfoService/getStockPriceInfo"
+        try:
+            stock = Stock.objects.select_related('sync_state').get(isin_code=isin_cd)
+        except Stock.DoesNotExist:
+            raise StockNotFoundException(f"ISIN 코드 {isin_cd}에 해당하는 주식을 찾을 수 없습니다.")
+        sync_state = getattr(stock, 'sync_state', None)  # 동기화 이력이 없으면 None
 
-        # 종료 날짜는 현재 날짜로, 시작 날짜는 현재 날짜로부터 1년 전으로 설정
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=365)
+        # 종료 날짜는 현재 날짜로, 조회 구간 시작은 현재 날짜로부터 1년 전으로 설정
+        end_date = datetime.now().date()
+        window_start_date = end_date - timedelta(days=365)
+        start_date, backfill = get_sync_begin_date(sync_state, window_start_date, mode)
 
-        formatted_start_date = start_date.strftime("%Y%m%d")  # 1년 전 날짜
-        formatted_end_date = end_date.strftime("%Y%m%d")  # 현재 날짜
+        if start_date > end_date:
+            logger.info(f"ISIN 코드 {isin_cd}의 주식 데이터가 이미 최신입니다.")
+            return 0
 
-        page_no = 1
-        num_of_rows = 100
+        items = fetch_stock_price_items({
+            "beginBasDt": start_date.strftime("%Y%m%d"),
+            "endBasDt": end_date.strftime("%Y%m%d"),
+            "isinCd": isin_cd,
+        })
 
-        while True:
-            params = {
-                "serviceKey": settings.PUBLIC_DATA_SECRET_KEY,
-                "resultType": "json",
-                "beginBasDt": formatted_start_date,
-                "endBasDt": formatted_end_date,
-                "isinCd": isin_cd,
-                "pageNo": page_no,
-                "numOfRows": num_of_rows
-            }
-            response = requests.get(url_template, params=params)
+        # 주식 데이터 저장 로직
+        saved = self.save_stock_data(isin_cd, items, stock=stock)
 
-            if response.status_code != 200:
-                raise HttpStatusCodeFailureException()
+        last_bas_dt = max((datetime.strptime(item['basDt'], '%Y%m%d').date() for item in items), default=None)
+        record_stock_sync(stock, last_bas_dt=last_bas_dt, backfilled_from=window_start_date if backfill else None)
+        return saved
 
-            data = response.json()
-            items = data.get('response', {}).get('body', {}).get('items', {}).get('item', [])
+    def save_stock_data(self, isin_cd, items, stock=None):
+        """
+        API로 가져온 데이터를 한 번의 bulk upsert 로 저장하는 로직
+        """
+        if stock is None:
+            try:
+                stock = Stock.objects.get(isin_code=isin_cd)
+            except Stock.DoesNotExist:
+                raise StockNotFoundException(f"ISIN 코드 {isin_cd}에 해당하는 주식을 찾을 수 없습니다.")
 
-            if not items:
-                break  # 데이터가 더 이상 없을 때 루프 종료
+        rows = build_daily_stock_data_rows(stock, items)
+        if not rows:
+            return 0
 
-            # 주식 데이터 저장 로직
-            self.save_stock_data(isin_cd, items)
-            page_no += 1
+        try:
+            bulk_upsert_daily_stock_data(rows)
+        except Exception as e:
+            logger.error(f"데이터베이스 저장 실패: {str(e)}")
+            raise DatabaseSaveFailureException()
 
-    def save_stock_data(self, isin_cd, items):
-        """
-        API로 가져온 데이터를 데이터베이스에 저장하는 로직
-        """
+        logger.info(f"ISIN 코드 {isin_cd}의 주식 데이터 {len(rows)}건이 저장되었습니다.")
+        return len(rows)
+
+
+# 전체 시장 일별 데이터 Fetch (admin 용)
+class FetchMarketDailyDataView(JobEnqueueMixin, GenericAPIView):
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAdminUser]
+    job_kind = 'fetch_market_daily_data'
+
+    def post(self, request):
+        # 날짜별 전체 시장 데이터 저장 작업 등록
+        return self.enqueue_job_response(request, "전체 시장 데이터 저장 작업이 등록되었습니다.")
+
+    def get_job_payload(self, request):
+        # start_date / end_date (YYYY-MM-DD), 생략하면 오늘 하루
+        today = datetime.now().date()
         try:
-            stock = Stock.objects.get(isin_code=isin_cd)
-        except Stock.DoesNotExist:
-            raise StockNotFoundException(f"ISIN 코드 {isin_cd}에 해당하는 주식을 찾을 수 없습니다.")
+            start_date = datetime.strptime(request.data.get('start_date', today.isoformat()), '%Y-%m-%d').date()
+            end_date = datetime.strptime(request.data.get('end_date', start_date.isoformat()), '%Y-%m-%d').date()
+        except (TypeError, ValueError):
+            raise DataValidationFailureException("start_date, end_date 는 YYYY-MM-DD 형식이어야 합니다.")
+        if start_date > end_date:
+            raise DataValidationFailureException("start_date 는 end_date 보다 늦을 수 없습니다.")
+        return {"start_date": start_date.isoformat(), "end_date": end_date.isoformat()}
+
+
+# DailyStockData 대량 내보내기 (연구 노트북 / 백테스트용)
+class ExportDailyStockDataView(GenericAPIView):
+    """
+    GET ?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD&isin_codes=A,B&format=ndjson|csv|parquet
+    서버 사이드 커서에서 chunk 단위로 읽어 StreamingHttpResponse 로 내보낸다.
+    """
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAdminUser]
+    # pyarrow 가 설치된 경우에만 Parquet 제공
+    renderer_classes = [NDJSONRenderer, CSVRenderer] + ([ParquetRenderer] if exports.pyarrow is not None else [])
+    streams = {
+        NDJSONRenderer.format: exports.stream_ndjson,
+        CSVRenderer.format: exports.stream_csv,
+        ParquetRenderer.format: exports.stream_parquet,
+    }
 
-        for item in items:
-            bas_dt = datetime.strptime(item.get('basDt'), '%Y%m%d').date()  # 기준일자
-            clpr = item.get('clpr')  # 종가
-            hipr = item.get('hipr')  # 고가
-            lopr = item.get('lopr')  # 저가
-            mkp = item.get('mkp')  # 시가
-            vs = item.get('vs')  # 대비
-            flt_rt = item.get('fltRt')  # 등락률
-            trqu = item.get('trqu')  # 거래량
-            tr_prc = item.get('trPrc')  # 거래대금
-            lstg_st_cnt = item.get('lstgStCnt')  # 상장주식수
-            mrkt_tot_amt = item.get('mrktTotAmt')  # 시가총액
-
-            # 기존 데이터 중복 삽입 방지
-            if not DailyStockData.objects.filter(stock=stock, bas_dt=bas_dt).exists():
-                # 데이터 저장
-                try:
-                    DailyStockData.objects.create(
-                        stock=stock,
-                        bas_dt=bas_dt,
-                        clpr=clpr,
-                        hipr=hipr,
-                        lopr=lopr,
-                        mkp=mkp,
-                        vs=vs,
-                        flt_rt=flt_rt,
-                        trqu=trqu,
-                        tr_prc=tr_prc,
-                        lstg_st_cnt=lstg_st_cnt,
-                        mrkt_tot_amt=mrkt_tot_amt
-                    )
-                    logger.info(f"ISIN 코드 {isin_cd}의 주식 데이터가 {bas_dt}일자로 저장되었습니다.")
-                except Exception as e:
-                    logger.error(f"데이터베이스 저장 실패: {str(e)}")
-                    raise DatabaseSaveFailureException()
+    def get(self, request):
+        start_date, end_date = self.get_date_range(request)
+        stock_ids_by_isin_code = self.get_stock_ids(request)
+
+        renderer = request.accepted_renderer
+        chunks = exports.iter_daily_stock_data_chunks(start_date, end_date, stock_ids_by_isin_code)
+        content_type = renderer.media_type if renderer.charset is None \
+            else f"{renderer.media_type}; charset={renderer.charset}"
+        response = StreamingHttpResponse(self.streams[renderer.format](chunks), content_type=content_type)
+        response['Content-Disposition'] = \
+            f'attachment; filename="daily_stock_data_{start_date:%Y%m%d}_{end_date:%Y%m%d}.{renderer.file_extension}"'
+        # 프록시가 응답 전체를 버퍼링하지 않도록
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def get_date_range(self, request):
+        # start_date 는 필수, end_date 를 생략하면 오늘
+        try:
+            start_date = datetime.strptime(request.query_params['start_date'], '%Y-%m-%d').date()
+            end_date = datetime.strptime(
+                request.query_params.get('end_date', datetime.now().date().isoformat()), '%Y-%m-%d').date()
+        except (KeyError, ValueError):
+            raise DataValidationFailureException("start_date(필수), end_date 는 YYYY-MM-DD 형식이어야 합니다.")
+        if start_date > end_date:
+            raise DataValidationFailureException("start_date 는 end_date 보다 늦을 수 없습니다.")
+        return start_date, end_date
+
+    def get_stock_ids(self, request):
+        # isin_codes 를 생략하면 전체 종목 (None)
+        isin_codes = [code.strip() for code in request.query_params.get('isin_codes', '').split(',') if code.strip()]
+        if not isin_codes:
+            return None
+        stock_ids_by_isin_code = dict(Stock.objects.filter(isin_code__in=isin_codes).values_list('isin_code', 'id'))
+        missing = [code for code in isin_codes if code not in stock_ids_by_isin_code]
+        if missing:
+            raise DataValidationFailureException(f"존재하지 않는 종목입니다: {', '.join(missing)}")
+        return stock_ids_by_isin_code
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # 오류 응답(Response)은 내보내기 포맷 대신 JSON 으로 렌더링
+        if isinstance(response, Response):
+            request.accepted_renderer = ORJSONRenderer()
+            request.accepted_media_type = ORJSONRenderer.media_type
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+# 시계열 저장소의 종목별 구간 조회 (백테스트용, ORM 을 거치지 않음)
+class StockTimeSeriesView(GenericAPIView):
+    """
+    GET ?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD&fields=bas_dt,clpr
+    필드별 배열로 응답한다. (Decimal 필드는 float)
+    """
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAdminUser]
+    renderer_classes = [ORJSONRenderer]
+
+    def get(self, request, isin_code):
+        try:
+            start_date = datetime.strptime(request.query_params['start_date'], '%Y-%m-%d').date()
+            end_date = datetime.strptime(
+                request.query_params.get('end_date', datetime.now().date().isoformat()), '%Y-%m-%d').date()
+        except (KeyError, ValueError):
+            raise DataValidationFailureException("start_date(필수), end_date 는 YYYY-MM-DD 형식이어야 합니다.")
+
+        fields = [field for field in request.query_params.get('fields', '').split(',') if field] or TIMESERIES_FIELDS
+        unknown = [field for field in fields if field not in TIMESERIES_FIELDS]
+        if unknown:
+            raise DataValidationFailureException(f"지원하지 않는 필드입니다: {', '.join(unknown)}")
+
+        window = get_timeseries_store().window(isin_code, start_date, end_date, fields)
+        if window is None:
+            return Response({'error': 'No time series found for the given stock.'}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({
+            'isin_code': isin_code,
+            'columns': {
+                field: np.datetime_as_string(column).tolist() if field == 'bas_dt' else column.tolist()
+                for field, column in window.columns.items()
+            },
+        }, status=status.HTTP_200_OK)
 
 
 """
@@ -403,82 +732,97 @@ class FetchWeeklyStockDailyDataView(GenericAPIView):
 
 
 class LatestWeeklyStocksDataView(GenericAPIView):
+    """
+    최신 주차 추천 종목과 최근 1년 일자별 데이터, 테스트/예측 결과 (?include=indicators 면 기술적 지표 포함)
+    미리 만들어 둔 WeeklyRecommendationSnapshot 한 건을 읽어 gzip 본문을 그대로 응답한다.
+    """
     serializer_class = DailyStockDataWithStockSerializer
     permission_classes = [AllowAny]
+    # 기본은 row 객체 배열, ?format=columnar 또는 Accept 헤더로 필드별 배열 포맷 선택
+    renderer_classes = [ORJSONRenderer, ColumnarJSONRenderer, BrowsableAPIRenderer]
+    # 요청당 최대 쿼리 수 (스냅샷이 만들어진 뒤 기준, stocks.testing.QueryBudgetTestMixin 으로 검사)
+    query_budget = 1
 
     def get(self, request):
+        renderer = request.accepted_renderer
+        columnar = renderer.format == ColumnarJSONRenderer.format
+        # ?include=indicators 면 종목별 기술적 지표(DailyIndicator)를 함께 응답
+        include_indicators = 'indicators' in request.query_params.get('include', '').split(',')
+        payload_field = SNAPSHOT_PAYLOAD_FIELDS[(columnar, include_indicators)]
+
         try:
-            response_data = self.get_latest_weekly_stocks_data()
-            if not response_data:
-                return Response({"message": "No content"}, status=status.HTTP_204_NO_CONTENT)
-            return Response(response_data, status=status.HTTP_200_OK)
+            snapshot = get_latest_weekly_recommendation_snapshot(payload_field)
         except Exception as e:
             logger.error(f"Error retrieving weekly stocks: {str(e)}")
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    def get_latest_weekly_stocks_data(self):
-        # Step 1: 최근 주차 추천 불러오기
-        latest_weekly_stocks = self.get_latest_weekly_recommendation()
-        if latest_weekly_stocks is None:
-            return []
-
-        # Step 2: Define the date range (one year from now)
-        end_date = datetime.now().date()
-        start_date = end_date - timedelta(days=365)
-
-        # Step 3: Get the stocks from WeeklyRecommendationStock
-        stock_data_list = []
-        for weekly_stock in latest_weekly_stocks:
-            stock = weekly_stock.stock
-
-            # Step 4: Get stock data for the date range
-            daily_stock_data = self.get_stock_data_by_date_range(stock, start_date, end_date)
+        if not snapshot.stock_count:
+            return Response({"message": "No content"}, status=status.HTTP_204_NO_CONTENT)
+
+        etag = quote_etag('-'.join([snapshot.etag, payload_field]))
+        last_modified = int(snapshot.built_at.timestamp())
+        content = bytes(getattr(snapshot, payload_field))
+
+        if is_not_modified(request, etag, last_modified):
+            response = HttpResponseNotModified()
+        elif not isinstance(renderer, ORJSONRenderer):
+            # Browsable API 는 DRF 렌더링을 거친다
+            response = Response(json.loads(gzip.decompress(content)), status=status.HTTP_200_OK)
+        elif ACCEPTS_GZIP_RE.search(request.headers.get('Accept-Encoding', '')):
+            response = HttpResponse(content, content_type=renderer.media_type)
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(gzip.decompress(content), content_type=renderer.media_type)
 
-            # Step 5: Append the stock with data to the response list
-            stock_data_list.append({
-                'isin_code': stock.isin_code,
-                'itms_name': stock.itms_name,
-                'daily_stock_data': daily_stock_data
-            })
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ['Accept', 'Accept-Encoding'])
+        return response
 
-        return stock_data_list
 
-    def get_latest_weekly_recommendation(self):
-        try:
-            # Step 1: Get the latest WeeklyRecommendation
-            latest_weekly_recommendation = WeeklyRecommendation.objects.latest('start_date')
+# 종목 검색 / 자동완성 뷰
+class StockSearchView(GenericAPIView):
+    """
+    ?q= 로 종목 명 (접두어 / 부분 일치), 단축 코드 / ISIN 코드 (접두어) 검색
+    프로세스 메모리의 정렬 배열 인덱스에서 찾으므로 키 입력마다 호출해도 DB 를 조회하지 않는다.
+    """
+    serializer_class = StockSerializer
+    permission_classes = [AllowAny]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    query_budget = 0  # 인덱스가 만들어진 뒤 기준
 
-            # Step 2: Get related WeeklyRecommendationStock entries
-            return WeeklyRecommendationStock.objects.filter(weekly_recommendation=latest_weekly_recommendation)
-        except WeeklyRecommendation.DoesNotExist:
-            raise WeeklyRecommendationNotFoundException("No weekly recommendation data found.")
-        except Exception as e:
-            logger.error(f"Error retrieving weekly recommendations: {str(e)}")
-            raise WeeklyRecommendationNotFoundException("Error retrieving weekly recommendations.")
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise DataValidationFailureException("q 는 필수입니다.")
+        limit = request.query_params.get('limit', str(SEARCH_DEFAULT_LIMIT))
+        if not limit.isdigit() or not 1 <= int(limit) <= SEARCH_MAX_LIMIT:
+            raise DataValidationFailureException(f"limit 은 1 ~ {SEARCH_MAX_LIMIT} 사이의 정수여야 합니다.")
 
-    def get_stock_data_by_date_range(self, stock, start_date, end_date):
         try:
-            # Step 1: Get DailyStockData for the given stock and date range
-            daily_stock_data = DailyStockData.objects.filter(stock=stock, bas_dt__range=[start_date, end_date])
-
-            # Step 2: Serialize the DailyStockData using the StockDataResponseDto serializer
-            serializer = DailyStockDataSerializer(daily_stock_data, many=True)
-
-            return serializer.data
-        except DailyStockData.DoesNotExist:
-            raise StockNotFoundException(f"Daily stock data for ISIN code {stock.isin_code} not found.")
+            results = get_stock_search_index().search(query, int(limit))
         except Exception as e:
-            logger.error(f"Error querying daily stock data for {stock.isin_code}: {str(e)}")
-            raise StockNotFoundException(f"Error retrieving stock data for ISIN code {stock.isin_code}.")
+            logger.error(f"종목 검색 실패 ({query}): {str(e)}")
+            raise StockSearchFailureException()
+        return Response(self.get_serializer([entry for entry, _ in results], many=True).data, status=status.HTTP_200_OK)
 
 
 # TestResult 조회 뷰
-class StockAITestResultView(GenericAPIView):
+class StockAITestResultView(CachedResponseMixin, GenericAPIView):
     permission_classes = [AllowAny]
+    cache_scope = 'latest_weekly_stocks_test_data'
+    query_budget = 4  # 캐시되지 않은 응답 기준 (최신 주차, 종목, 주차 추천, 테스트 결과)
 
     def get(self, request, isin_code):
+        cached_response = self.get_cached_response(request)
+        if cached_response is not None:
+            return cached_response
+
         # ISIN 코드로 Stock 엔티티 조회
-        stock = Stock.objects.get(isin_code=isin_code)
+        try:
+            stock = Stock.objects.get(isin_code=isin_code)
+        except Stock.DoesNotExist:
+            return Response({'error': 'No stock found for the given isin code.'}, status=status.HTTP_404_NOT_FOUND)
 
         # Stock과 관련된 WeeklyRecommendation 중 가장 최신의 주차 추천을 가져옴
         latest_weekly_recommendation = WeeklyRecommendation.objects.filter(
@@ -497,6 +841,10 @@ class StockAITestResultView(GenericAPIView):
                     'stock': stock.isin_code,
                     'weekly_recommendation': f"{latest_weekly_recommendation.start_date} - {latest_weekly_recommendation.end_date}",
                     'average_profit': latest_test_result.profit,
+                    'profit_std': latest_test_result.profit_std,
+                    'test_runs': latest_test_result.test_runs,
+                    'max_drawdown': latest_test_result.max_drawdown,
+                    'backend': latest_test_result.backend,
                     'test_start_date': latest_test_result.test_start_date,
                     'test_end_date': latest_test_result.test_end_date,
                     'test_starting_cash': latest_test_result.test_starting_cash,
@@ -510,12 +858,21 @@ class StockAITestResultView(GenericAPIView):
 
 
 # PredictResult 조회 뷰
-class StockAIPredictResultView(GenericAPIView):
+class StockAIPredictResultView(CachedResponseMixin, GenericAPIView):
     permission_classes = [AllowAny]
+    cache_scope = 'latest_weekly_stocks_predict_data'
+    query_budget = 3  # 캐시되지 않은 응답 기준 (최신 주차, 종목, 예측 결과)
 
     def get(self, request, isin_code):
+        cached_response = self.get_cached_response(request)
+        if cached_response is not None:
+            return cached_response
+
         # ISIN 코드로 Stock 엔티티 조회
-        stock = Stock.objects.get(isin_code=isin_code)
+        try:
+            stock = Stock.objects.get(isin_code=isin_code)
+        except Stock.DoesNotExist:
+            return Response({'error': 'No stock found for the given isin code.'}, status=status.HTTP_404_NOT_FOUND)
 
         # 해당 Stock과 관련된 PredictionResult 중 가장 최근 target_date가 있는 결과 조회
         latest_predict_result = WeeklyRecommendationStockPredictResult.objects.filter(
@@ -530,3 +887,33 @@ class StockAIPredictResultView(GenericAPIView):
         else:
             return Response({'error': 'No prediction result found for the given stock.'},
                             status=status.HTTP_404_NOT_FOUND)
+
+
+# 작업 상태 조회 뷰
+class JobStatusView(GenericAPIView):
+    serializer_class = JobSerializer
+    permission_classes = [AllowAny]
+    query_budget = 1
+
+    def get(self, request, job_id):
+        try:
+            job = Job.objects.get(pk=job_id)
+        except Job.DoesNotExist:
+            return Response({'error': 'No job found for the given id.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(self.get_serializer(job).data, status=status.HTTP_200_OK)
+
+
+# Prometheus 지표 뷰
+class MetricsView(GenericAPIView):
+    """
+    stocks.metrics 의 지표를 text exposition 포맷으로 반환
+    settings.METRICS_TOKEN 이 설정되어 있으면 Authorization: Bearer <token> 헤더가 필요하다.
+    """
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request):
+        token = getattr(settings, 'METRICS_TOKEN', None)
+        if token and request.headers.get('Authorization') != f'Bearer {token}':
+            raise PermissionDenied()
+        return HttpResponse(render_metrics(), content_type=METRICS_CONTENT_TYPE)
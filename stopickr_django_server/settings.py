@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 from pathlib import Path
 import os
 import json
+import django
 from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,10 +45,53 @@ DATABASE_USER = get_secret("DATABASE_USER")
 DATABASE_PASSWORD = get_secret("DATABASE_PASSWORD")
 DATABASE_HOST = get_secret("DATABASE_HOST")
 DATABASE_PORT = get_secret("DATABASE_PORT")
+# 커넥션 재사용: 요청마다 새 TLS 연결 / 인증을 하지 않도록 커넥션을 CONN_MAX_AGE 초 동안 유지 (0 이면 요청마다 닫음, null 이면 무제한)
+DATABASE_CONN_MAX_AGE = secrets.get("DATABASE_CONN_MAX_AGE", 60)
+# 재사용하기 전에 커넥션이 살아있는지 확인 (DB 재시작 / idle timeout 으로 끊긴 커넥션을 버림)
+DATABASE_CONN_HEALTH_CHECKS = secrets.get("DATABASE_CONN_HEALTH_CHECKS", True)
+# pgbouncer (transaction pooling) 를 거치는 경우 true: 트랜잭션 밖에서 유지되는 서버 사이드 커서를 사용하지 않음
+DATABASE_PGBOUNCER = secrets.get("DATABASE_PGBOUNCER", False)
+# psycopg 3 커넥션 풀 옵션 (예: {"min_size": 2, "max_size": 10}), Django 5.1 이상에서만 지원
+DATABASE_POOL = secrets.get("DATABASE_POOL")
 
 # AWS Lambda 를 위한 Settings
 AWS_LAMBDA_URL = get_secret("AWS_LAMBDA_URL")
 
+# 외부 API 호출 (공공 데이터 포털, AI 서버) 을 위한 Settings
+HTTP_CLIENT_TIMEOUT = (3.05, 30)  # (connect, read) 초
+HTTP_CLIENT_MAX_RETRIES = 3
+HTTP_CLIENT_BACKOFF_FACTOR = 0.5
+HTTP_CLIENT_POOL_MAXSIZE = 16
+
+# AI 테스트 (backtest) 동시 실행 Settings
+AI_TEST_RUNS = 10  # 주식당 테스트 횟수
+AI_TEST_MAX_WORKERS = 16  # 전체 동시 요청 수
+AI_TEST_MAX_WORKERS_PER_STOCK = 4  # 주식당 동시 요청 수
+AI_HTTP_ASYNC = False  # True 면 AI 서버 요청을 스레드 풀 대신 AsyncHttpClient (httpx) 로 동시에 보냄
+AI_PREDICT_URL = secrets.get(
+    "AI_PREDICT_URL", "https://sqxle43k4j.execute-api.ap-northeast-2.amazonaws.com/default/api/predict/")
+# 0 보다 크면 예측을 종목별 요청 대신 ?stocks=<코드,...> 묶음 요청 (묶음당 종목 수) 으로 보냄
+AI_PREDICT_BATCH_SIZE = secrets.get("AI_PREDICT_BATCH_SIZE", 0)
+
+# 주식 테스트 backend: remote (외부 AI 테스트 API 를 AI_TEST_RUNS 번 호출) / local (NumPy 이동평균 전략 백테스트 엔진)
+# local 은 AI 모델을 재현하지 않아 저장되는 profit 의 의미가 달라지므로 명시적으로 설정한 경우에만 사용한다
+BACKTEST_BACKEND = secrets.get("BACKTEST_BACKEND", "remote")
+BACKTEST_RUNS = 1000  # 로컬 엔진 Monte-Carlo 실행 수
+BACKTEST_PROCESSES = os.cpu_count() or 1  # 로컬 엔진 주식별 실행 프로세스 수
+
+# 작업 worker: 실행 중 상태로 JOB_STALE_TIMEOUT 초가 지난 작업은 다시 대기 (JOB_MAX_ATTEMPTS 번 실행 후에는 실패 처리)
+JOB_STALE_TIMEOUT = 6 * 60 * 60
+JOB_MAX_ATTEMPTS = 3
+
+# /metrics 접근 토큰 (설정하면 Authorization: Bearer <token> 필요)
+METRICS_TOKEN = secrets.get("METRICS_TOKEN")
+
+# 요청 프로파일링 (stocks.middleware.ProfilingMiddleware, 리포트는 profile_report 명령으로 집계)
+PROFILING_ENABLED = secrets.get("PROFILING_ENABLED", False)  # True 면 PROFILING_SAMPLE_RATE 비율로 표본 프로파일링
+PROFILING_SAMPLE_RATE = secrets.get("PROFILING_SAMPLE_RATE", 0.01)
+PROFILING_TOKEN = secrets.get("PROFILING_TOKEN")  # 설정하면 X-Profile: <token> 헤더 요청은 항상 프로파일링
+PROFILING_REPORT_DIR = secrets.get("PROFILING_REPORT_DIR", os.path.join(BASE_DIR, 'profiles'))
+
 # AWS admin css 를 위한 Setting
 AWS_REGION = 'ap-northeast-2'
 AWS_STORAGE_BUCKET_NAME = get_secret("AWS_STORAGE_BUCKET_NAME")
@@ -103,6 +147,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # 종목 검색 trigram 인덱스 (pg_trgm)
     # 사용자 정의 apps
     "users",
     'stocks',
@@ -112,6 +157,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'stocks.middleware.MetricsMiddleware',  # 가장 바깥에서 전체 처리 시간을 측정
+    'stocks.middleware.ProfilingMiddleware',  # PROFILING_ENABLED 또는 X-Profile 헤더인 요청만 프로파일링
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -160,9 +207,45 @@ DATABASES = {
         'PASSWORD': DATABASE_PASSWORD,
         'HOST': DATABASE_HOST,
         'PORT': DATABASE_PORT,
+        'CONN_MAX_AGE': DATABASE_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': DATABASE_CONN_HEALTH_CHECKS,
+        'DISABLE_SERVER_SIDE_CURSORS': DATABASE_PGBOUNCER,
     }
 }
 
+if DATABASE_POOL:
+    if django.VERSION < (5, 1):
+        raise ImproperlyConfigured("DATABASE_POOL (psycopg 커넥션 풀) 은 Django 5.1 이상에서만 사용할 수 있습니다.")
+    # 풀이 커넥션을 관리하므로 Django 의 persistent connection 은 끈다
+    DATABASES['default']['OPTIONS'] = {'pool': DATABASE_POOL if isinstance(DATABASE_POOL, dict) else True}
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# secrets.json 에 REDIS_URL 이 있으면 Redis, 없으면 프로세스별 local memory 캐시를 사용
+# (local memory 캐시는 worker 프로세스의 데이터 버전 변경을 웹 프로세스가 알 수 없으므로 응답 캐시 만료 시간을 짧게 유지)
+REDIS_URL = secrets.get("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+    STOCKS_RESPONSE_CACHE_TIMEOUT = 60 * 60 * 24
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'stopickr',
+        }
+    }
+    STOCKS_RESPONSE_CACHE_TIMEOUT = 60
+
+# 종목별 일자별 데이터 columnar 저장소 (.npy) 경로, 설정하지 않으면 저장소를 사용하지 않음
+TIMESERIES_STORE_DIR = secrets.get("TIMESERIES_STORE_DIR")
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
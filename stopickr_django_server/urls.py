@@ -17,7 +17,10 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from stocks.views import MetricsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('stocks/', include('stocks.urls')),
+    path('metrics', MetricsView.as_view(), name='metrics'),
 ]